@@ -0,0 +1,282 @@
+"""Byte-budgeted in-memory caches with frequency-aware eviction.
+
+``Cache`` follows W-TinyLFU. New entries land in a small LRU window. When the
+window overflows, its least recent entry competes with the least recent
+entries of the main segment, and whichever a count-min sketch says was
+requested more often stays. One-off pages therefore cannot flush popular
+ones. Lookups, inserts and removals are O(1) amortised.
+
+``get`` counts as a use of the entry; ``peek`` reads it without affecting
+admission or eviction. Entries expire lazily: a lookup drops an entry once it is past its
+``expires_at`` plus the retention window, and inserts pop such entries from a
+deadline heap. Inside the retention window an expired entry is still returned
+so callers can revalidate it.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from itertools import chain
+from time import monotonic
+from typing import Generic, Protocol, TypeVar
+
+
+class _Expiring(Protocol):
+    expires_at: float
+
+
+V = TypeVar("V", bound=_Expiring)
+
+
+class _FrequencySketch:
+    """Count-min sketch of recent key frequencies that halves as it ages."""
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B1, 0x85EBCA77, 0xC2B2AE3D, 0x27D4EB2F)
+
+    def __init__(self, width: int) -> None:
+        size = 64
+
+        while size < width:
+            size *= 2
+
+        self._mask = size - 1
+        self._rows = [bytearray(size) for _ in range(self.DEPTH)]
+        self._additions = 0
+        self._sample_size = 10 * size
+
+    def _slots(self, key: str) -> Iterator[tuple[bytearray, int]]:
+        value = hash(key)
+
+        for row, seed in zip(self._rows, self._SEEDS):
+            yield row, ((value ^ seed) * seed >> 16) & self._mask
+
+    def increment(self, key: str) -> None:
+        for row, index in self._slots(key):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self._additions += 1
+
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: str) -> int:
+        return min(row[index] for row, index in self._slots(key))
+
+    def _age(self) -> None:
+        """Halve every counter so old popularity fades."""
+        for row in self._rows:
+            row[:] = bytes(count >> 1 for count in row)
+
+        self._additions //= 2
+
+
+class Cache(Generic[V]):
+    """String-keyed W-TinyLFU cache bounded by the estimated size of values."""
+
+    # Share of the byte budget that holds entries on probation.
+    WINDOW_SHARE = 0.01
+    SKETCH_WIDTH = 4096
+
+    def __init__(
+        self,
+        max_bytes: int,
+        *,
+        weigh: Callable[[V], int],
+        retention: float = 0.0,
+    ) -> None:
+        self.max_bytes = max(1, max_bytes)
+        self.retention = retention
+        self._weigh = weigh
+        self._window_budget = max(1, int(self.max_bytes * self.WINDOW_SHARE))
+        self._main_budget = max(1, self.max_bytes - self._window_budget)
+
+        self._window: OrderedDict[str, V] = OrderedDict()
+        self._main: OrderedDict[str, V] = OrderedDict()
+        self._weights: dict[str, int] = {}
+        self._window_bytes = 0
+        self._main_bytes = 0
+
+        self._sketch = _FrequencySketch(self.SKETCH_WIDTH)
+        # Deadline currently scheduled per key; heap items that disagree are
+        # stale and skipped when popped.
+        self._deadlines: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._main)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(chain(self._window, self._main)))
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._window or key in self._main
+
+    def __getitem__(self, key: str) -> V:
+        value = self.get(key)
+
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def __setitem__(self, key: str, value: V) -> None:
+        admitted = key in self._main
+        self._remove(key)
+        weight = self._weigh(value)
+
+        if weight > self._main_budget:
+            return
+
+        self._weights[key] = weight
+        self._schedule(key, value)
+
+        if admitted:
+            # Updating an admitted entry keeps it in the main segment.
+            self._main[key] = value
+            self._main_bytes += weight
+
+            while self._main_bytes > self._main_budget:
+                self._remove(next(iter(self._main)))
+        else:
+            self._window[key] = value
+            self._window_bytes += weight
+
+        self._expire()
+        self._evict()
+
+    @property
+    def weight(self) -> int:
+        """Return the estimated size of all cached values in bytes."""
+        return self._window_bytes + self._main_bytes
+
+    def get(self, key: str, default: V | None = None) -> V | None:
+        """Return a live entry and mark it as recently and frequently used."""
+        self._sketch.increment(key)
+
+        segment = self._window if key in self._window else self._main
+        value = segment.get(key)
+
+        if value is None:
+            return default
+
+        if value.expires_at + self.retention <= monotonic():
+            self._remove(key)
+            return default
+
+        segment.move_to_end(key)
+        return value
+
+    def peek(self, key: str, default: V | None = None) -> V | None:
+        """Return a live entry without counting the lookup as a use.
+
+        Bookkeeping reads, such as the crawler checking what expires soon,
+        must not make entries look popular to admission and eviction.
+        """
+        value = self._window.get(key)
+
+        if value is None:
+            value = self._main.get(key)
+
+        if value is None or value.expires_at + self.retention <= monotonic():
+            return default
+
+        return value
+
+    def pop(self, key: str, default: V | None = None) -> V | None:
+        value = self._remove(key)
+        return default if value is None else value
+
+    def setdefault(self, key: str, value: V) -> V:
+        """Return the live entry for ``key``, storing ``value`` if there is none."""
+        current = self.get(key)
+
+        if current is not None:
+            return current
+
+        self[key] = value
+        return value
+
+    def _remove(self, key: str) -> V | None:
+        self._deadlines.pop(key, None)
+
+        if key in self._window:
+            value = self._window.pop(key)
+            self._window_bytes -= self._weights.pop(key)
+            return value
+
+        if key in self._main:
+            value = self._main.pop(key)
+            self._main_bytes -= self._weights.pop(key)
+            return value
+
+        return None
+
+    def _schedule(self, key: str, value: V) -> None:
+        deadline = value.expires_at + self.retention
+        self._deadlines[key] = deadline
+        heapq.heappush(self._heap, (deadline, key))
+
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [(when, item) for item, when in self._deadlines.items()]
+            heapq.heapify(self._heap)
+
+    def _expire(self) -> None:
+        """Drop entries whose retention window has passed."""
+        now = monotonic()
+
+        while self._heap and self._heap[0][0] <= now:
+            deadline, key = heapq.heappop(self._heap)
+
+            if self._deadlines.get(key) != deadline:
+                continue
+
+            value = self._window.get(key) or self._main.get(key)
+
+            if value is not None and value.expires_at + self.retention > now:
+                # The entry was extended in place after a revalidation.
+                self._schedule(key, value)
+            else:
+                self._remove(key)
+
+    def _evict(self) -> None:
+        """Move window overflow into the main segment if it earns its place."""
+        while self._window_bytes > self._window_budget and self._window:
+            key, value = self._window.popitem(last=False)
+            weight = self._weights[key]
+            self._window_bytes -= weight
+
+            victims = self._victims(key, weight)
+
+            if victims is None:
+                self._weights.pop(key)
+                self._deadlines.pop(key, None)
+                continue
+
+            for victim in victims:
+                self._remove(victim)
+
+            self._main[key] = value
+            self._main_bytes += weight
+
+    def _victims(self, key: str, weight: int) -> list[str] | None:
+        """Return main entries to evict for ``key``, or ``None`` to reject it."""
+        victims: list[str] = []
+        freed = 0
+        frequency = self._sketch.estimate(key)
+
+        for victim in self._main:
+            if self._main_bytes - freed + weight <= self._main_budget:
+                break
+
+            if self._sketch.estimate(victim) >= frequency:
+                return None
+
+            victims.append(victim)
+            freed += self._weights[victim]
+
+        return victims
@@ -0,0 +1,140 @@
+"""Circuit breaker that stops sending requests to an unhealthy upstream.
+
+The breaker watches the outcomes of the most recent requests. While it is
+closed every request goes through. When at least ``MIN_CALLS`` of the last
+``WINDOW`` requests were recorded and ``FAILURE_RATIO`` of them failed, it
+opens and rejects requests for ``OPEN_SECONDS``. After that it is half-open:
+a single probe request is let through, and its outcome either closes the
+breaker or opens it again.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from dataclasses import dataclass
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitStats:
+    """A snapshot of the breaker for logs and diagnostics."""
+
+    state: str
+    recent_calls: int
+    recent_failures: int
+    rejected: int
+    retry_after: float
+
+
+class CircuitBreaker:
+    """Closed, open and half-open states driven by the recent failure rate."""
+
+    WINDOW = 20
+    MIN_CALLS = 10
+    FAILURE_RATIO = 0.5
+    OPEN_SECONDS = 30.0
+
+    def __init__(self) -> None:
+        self._outcomes: deque[bool] = deque(maxlen=self.WINDOW)
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+
+        if monotonic() - self._opened_at < self.OPEN_SECONDS:
+            return OPEN
+
+        return HALF_OPEN
+
+    def retry_after(self) -> float:
+        """Return the seconds until the next probe may be sent."""
+        if self._opened_at is None:
+            return 0.0
+
+        return max(0.0, self._opened_at + self.OPEN_SECONDS - monotonic())
+
+    def stats(self) -> CircuitStats:
+        return CircuitStats(
+            state=self.state,
+            recent_calls=len(self._outcomes),
+            recent_failures=self._failures,
+            rejected=self._rejected,
+            retry_after=round(self.retry_after(), 1),
+        )
+
+    def allow(self) -> bool:
+        """Return whether a request may be sent now.
+
+        In the half-open state the first caller becomes the probe; it must
+        report with ``record`` or ``abandon``.
+        """
+        state = self.state
+
+        if state == CLOSED:
+            return True
+
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            logger.info("wiki_circuit state=half-open probe=true")
+            return True
+
+        self._rejected += 1
+        return False
+
+    def record(self, healthy: bool) -> None:
+        """Record the outcome of an allowed request."""
+        if self._opened_at is not None:
+            if not self._probing:
+                # A request sent before the breaker opened finished late.
+                return
+
+            self._probing = False
+
+            if healthy:
+                self._close()
+            else:
+                self._open()
+
+            return
+
+        if len(self._outcomes) == self._outcomes.maxlen and not self._outcomes[0]:
+            self._failures -= 1
+
+        self._outcomes.append(healthy)
+        self._failures += not healthy
+
+        if (
+            len(self._outcomes) >= self.MIN_CALLS
+            and self._failures >= self.FAILURE_RATIO * len(self._outcomes)
+        ):
+            self._open()
+
+    def abandon(self) -> None:
+        """Release the probe slot of a request that ended without an outcome."""
+        self._probing = False
+
+    def _open(self) -> None:
+        self._opened_at = monotonic()
+        logger.warning(
+            "wiki_circuit state=open failures=%s calls=%s",
+            self._failures,
+            len(self._outcomes),
+        )
+
+    def _close(self) -> None:
+        self._opened_at = None
+        self._outcomes.clear()
+        self._failures = 0
+        logger.info("wiki_circuit state=closed")
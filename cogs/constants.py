@@ -26,6 +26,18 @@ FOOTER_TEXT = "Содержимое распространяется по лиц
 _MIN_CONCURRENCY = 1
 _MAX_CONCURRENCY = 10
 _DEFAULT_CONCURRENCY = 4
+_DEFAULT_CRAWL_INTERVAL = 1.0
+_DEFAULT_STALE_WHILE_REVALIDATE = 60.0
+_DEFAULT_STALE_IF_ERROR = 3600.0
+_MAX_STALE_WINDOW = 86400.0
+_MIN_CACHE_MEMORY_BYTES = 1024 * 1024
+_DEFAULT_CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+_MAX_PARSE_WORKERS = 8
+_DEFAULT_PARSE_WORKERS = 2
+_PARSE_MODES = frozenset({"process", "thread"})
+_PARSER_BACKENDS = frozenset({"bs4", "lxml"})
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+_FALSE_VALUES = frozenset({"", "0", "false", "no", "off"})
 
 
 class ConfigurationError(ValueError):
@@ -39,6 +51,22 @@ class WikiConfig:
     base_url: str
     user_agent: str
     max_concurrent_requests: int
+    # The adaptive request limit moves between these bounds.
+    min_concurrent_requests: int = _MIN_CONCURRENCY
+    crawl_interval: float = _DEFAULT_CRAWL_INTERVAL
+    cache_path: str | None = None
+    service_socket: str | None = None
+    # Zero parse workers parses inline on the event loop.
+    parse_mode: str = "process"
+    parse_workers: int = 0
+    parser_backend: str = "bs4"
+    stream_articles: bool = False
+    # Shared by the in-memory page, article and search caches.
+    cache_memory_bytes: int = _DEFAULT_CACHE_MEMORY_BYTES
+    # Seconds after expiry that cached data is served while it is refreshed
+    # in the background, or when upstream is unavailable. Zero disables each.
+    stale_while_revalidate: float = 0.0
+    stale_if_error: float = 0.0
 
     @property
     def all_pages_url(self) -> str:
@@ -98,6 +126,171 @@ def _load_concurrency() -> int:
     return value
 
 
+def _load_min_concurrency(maximum: int) -> int:
+    """Read the lower bound of the adaptive request limit."""
+    raw_value = os.getenv(
+        "WIKI_MIN_CONCURRENCY",
+        str(_MIN_CONCURRENCY),
+    ).strip()
+
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ConfigurationError(
+            "WIKI_MIN_CONCURRENCY must be an integer"
+        ) from exc
+
+    if not _MIN_CONCURRENCY <= value <= maximum:
+        raise ConfigurationError(
+            "WIKI_MIN_CONCURRENCY must be between "
+            f"{_MIN_CONCURRENCY} and WIKI_MAX_CONCURRENCY ({maximum})"
+        )
+
+    return value
+
+
+def _load_crawl_interval() -> float:
+    """Read the delay in seconds between background crawl requests."""
+    raw_value = os.getenv(
+        "WIKI_CRAWL_INTERVAL",
+        str(_DEFAULT_CRAWL_INTERVAL),
+    ).strip()
+
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ConfigurationError(
+            "WIKI_CRAWL_INTERVAL must be a number of seconds"
+        ) from exc
+
+    if not 0 <= value <= 3600:
+        raise ConfigurationError(
+            "WIKI_CRAWL_INTERVAL must be between 0 and 3600 seconds; "
+            "0 disables the background crawler"
+        )
+
+    return value
+
+
+def _load_cache_path() -> str | None:
+    """Read the optional SQLite cache file path; empty disables the disk tier."""
+    value = os.getenv("WIKI_CACHE_PATH", "").strip()
+    return value or None
+
+
+def _load_stale_window(name: str, default: float) -> float:
+    """Read how many seconds past expiry cached data may still be served."""
+    raw_value = os.getenv(name, str(default)).strip()
+
+    try:
+        value = float(raw_value)
+    except ValueError as exc:
+        raise ConfigurationError(
+            f"{name} must be a number of seconds"
+        ) from exc
+
+    if not 0 <= value <= _MAX_STALE_WINDOW:
+        raise ConfigurationError(
+            f"{name} must be between 0 and {_MAX_STALE_WINDOW:g} seconds; "
+            "0 disables it"
+        )
+
+    return value
+
+
+def _load_cache_memory() -> int:
+    """Read the byte budget of the in-memory caches."""
+    raw_value = os.getenv(
+        "WIKI_CACHE_MEMORY_BYTES",
+        str(_DEFAULT_CACHE_MEMORY_BYTES),
+    ).strip()
+
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ConfigurationError(
+            "WIKI_CACHE_MEMORY_BYTES must be an integer"
+        ) from exc
+
+    if value < _MIN_CACHE_MEMORY_BYTES:
+        raise ConfigurationError(
+            "WIKI_CACHE_MEMORY_BYTES must be at least "
+            f"{_MIN_CACHE_MEMORY_BYTES}"
+        )
+
+    return value
+
+
+def _load_service_socket() -> str | None:
+    """Read the optional Unix socket path of the shared wiki cache service."""
+    value = os.getenv("WIKI_SERVICE_SOCKET", "").strip()
+    return value or None
+
+
+def _load_parse_mode() -> str:
+    """Read whether HTML is parsed in worker processes or threads."""
+    value = os.getenv("WIKI_PARSE_MODE", "process").strip().casefold()
+
+    if value not in _PARSE_MODES:
+        raise ConfigurationError(
+            "WIKI_PARSE_MODE must be one of: "
+            + ", ".join(sorted(_PARSE_MODES))
+        )
+
+    return value
+
+
+def _load_parse_workers() -> int:
+    """Read the size of the HTML parsing pool."""
+    raw_value = os.getenv(
+        "WIKI_PARSE_WORKERS",
+        str(_DEFAULT_PARSE_WORKERS),
+    ).strip()
+
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ConfigurationError(
+            "WIKI_PARSE_WORKERS must be an integer"
+        ) from exc
+
+    if not 0 <= value <= _MAX_PARSE_WORKERS:
+        raise ConfigurationError(
+            "WIKI_PARSE_WORKERS must be between 0 and "
+            f"{_MAX_PARSE_WORKERS}; 0 parses on the event loop"
+        )
+
+    return value
+
+
+def _load_parser_backend() -> str:
+    """Read which HTML extraction backend parses wiki pages."""
+    value = os.getenv("WIKI_PARSER_BACKEND", "bs4").strip().casefold()
+
+    if value not in _PARSER_BACKENDS:
+        raise ConfigurationError(
+            "WIKI_PARSER_BACKEND must be one of: "
+            + ", ".join(sorted(_PARSER_BACKENDS))
+        )
+
+    return value
+
+
+def _load_flag(name: str) -> bool:
+    """Read an on/off environment switch that defaults to off."""
+    value = os.getenv(name, "").strip().casefold()
+
+    if value in _TRUE_VALUES:
+        return True
+
+    if value in _FALSE_VALUES:
+        return False
+
+    raise ConfigurationError(
+        f"{name} must be one of: 1, 0, true, false, yes, no, on, off"
+    )
+
+
 def _load_user_agent() -> str:
     """Read and validate the HTTP User-Agent used for public requests."""
     value = os.getenv(
@@ -113,8 +306,27 @@ def _load_user_agent() -> str:
 
 def load_wiki_config() -> WikiConfig:
     """Load, validate and return the public wiki configuration."""
+    max_concurrent_requests = _load_concurrency()
+
     return WikiConfig(
         base_url=_load_https_base_url(),
         user_agent=_load_user_agent(),
-        max_concurrent_requests=_load_concurrency(),
+        max_concurrent_requests=max_concurrent_requests,
+        min_concurrent_requests=_load_min_concurrency(max_concurrent_requests),
+        crawl_interval=_load_crawl_interval(),
+        cache_path=_load_cache_path(),
+        service_socket=_load_service_socket(),
+        parse_mode=_load_parse_mode(),
+        parse_workers=_load_parse_workers(),
+        parser_backend=_load_parser_backend(),
+        stream_articles=_load_flag("WIKI_STREAM_ARTICLES"),
+        cache_memory_bytes=_load_cache_memory(),
+        stale_while_revalidate=_load_stale_window(
+            "WIKI_STALE_WHILE_REVALIDATE",
+            _DEFAULT_STALE_WHILE_REVALIDATE,
+        ),
+        stale_if_error=_load_stale_window(
+            "WIKI_STALE_IF_ERROR",
+            _DEFAULT_STALE_IF_ERROR,
+        ),
     )
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""Background crawl scheduler that keeps the wiki caches warm."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import timedelta
+from typing import TYPE_CHECKING
+
+from .limiter import Priority, request_priority
+
+if TYPE_CHECKING:
+    from .page_parsing import WikiClient
+
+logger = logging.getLogger(__name__)
+
+
+class WikiCrawler:
+    """Refresh expiring articles one at a time at a fixed, bounded rate."""
+
+    REFRESH_MARGIN = timedelta(minutes=2)
+    IDLE_DELAY = 30.0
+
+    def __init__(self, client: WikiClient, *, interval: float) -> None:
+        self._client = client
+        self._interval = interval
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._interval > 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the crawl loop unless it is disabled or already running."""
+        if not self.enabled or self.running:
+            return
+
+        # Crawl requests yield to user commands and bulk searches.
+        with request_priority(Priority.BACKGROUND):
+            self._task = asyncio.create_task(
+                self._run(),
+                name="castopia-wiki-crawler",
+            )
+
+    async def stop(self) -> None:
+        """Cancel the crawl loop and wait for it to finish."""
+        task, self._task = self._task, None
+
+        if task is None or task.done():
+            return
+
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def crawl_once(self) -> int:
+        """Refresh every public article that is missing or about to expire."""
+        targets = await self._client.crawl_targets(
+            self.REFRESH_MARGIN.total_seconds()
+        )
+        refreshed = 0
+
+        for title, url in targets:
+            try:
+                await self._client.get_article(title, url, refresh=True)
+                refreshed += 1
+            except Exception as error:
+                # A single broken page must not stop the rest of the pass.
+                logger.debug(
+                    "wiki_crawl_item_failed error=%s",
+                    type(error).__name__,
+                )
+
+            await asyncio.sleep(self._interval)
+
+        return refreshed
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                refreshed = await self.crawl_once()
+            except Exception as error:
+                refreshed = 0
+                logger.warning(
+                    "wiki_crawl_pass_failed error=%s",
+                    type(error).__name__,
+                )
+            else:
+                retries = self._client.retry_stats()
+                logger.info(
+                    "wiki_crawl_pass refreshed=%s retries=%s "
+                    "denied_retries=%s amplification=%.2f",
+                    refreshed,
+                    retries.retries,
+                    retries.denied_retries,
+                    retries.amplification,
+                )
+
+            await asyncio.sleep(
+                self._interval if refreshed else self.IDLE_DELAY
+            )
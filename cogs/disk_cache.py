@@ -0,0 +1,199 @@
+"""Optional SQLite tier that keeps wiki pages and articles across restarts."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from time import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    html TEXT NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS articles (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    text TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS links (
+    url TEXT PRIMARY KEY,
+    links TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class StoredPage:
+    html: str
+    etag: str | None
+    last_modified: str | None
+    expires_at: float
+
+
+@dataclass(frozen=True, slots=True)
+class StoredArticle:
+    title: str
+    url: str
+    text: str
+    tags: frozenset[str]
+    expires_at: float
+
+
+class DiskCache:
+    """Blocking SQLite store keyed by normalised URL.
+
+    Expiry times are wall-clock timestamps because monotonic clocks do not
+    survive a restart. Methods block, so async callers run them in a thread.
+    """
+
+    # Rows expired longer than this are deleted when the store is opened.
+    RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        connection = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+
+        cutoff = time() - self.RETENTION_SECONDS
+        for table in ("pages", "articles", "links"):
+            connection.execute(
+                f"DELETE FROM {table} WHERE expires_at < ?",
+                (cutoff,),
+            )
+
+        self._connection = connection
+        return connection
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def load_page(self, url: str) -> StoredPage | None:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT html, etag, last_modified, expires_at "
+                "FROM pages WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+        return StoredPage(*row) if row else None
+
+    def save_page(
+        self,
+        url: str,
+        html: str,
+        etag: str | None,
+        last_modified: str | None,
+        expires_at: float,
+    ) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO pages "
+                "(url, html, etag, last_modified, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, html, etag, last_modified, expires_at),
+            )
+
+    def touch(self, url: str, expires_at: float) -> None:
+        """Extend a revalidated page and its article without rewriting them."""
+        with self._lock:
+            connection = self._connect()
+            for table in ("pages", "articles"):
+                connection.execute(
+                    f"UPDATE {table} SET expires_at = ? WHERE url = ?",
+                    (expires_at, url),
+                )
+
+    def load_articles(self) -> list[StoredArticle]:
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT title, url, text, tags, expires_at FROM articles"
+            ).fetchall()
+
+        return [
+            StoredArticle(
+                title=title,
+                url=url,
+                text=text,
+                tags=frozenset(json.loads(tags)),
+                expires_at=expires_at,
+            )
+            for title, url, text, tags, expires_at in rows
+        ]
+
+    def save_article(
+        self,
+        title: str,
+        url: str,
+        text: str,
+        tags: frozenset[str],
+        expires_at: float,
+    ) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO articles "
+                "(url, title, text, tags, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    url,
+                    title,
+                    text,
+                    json.dumps(sorted(tags), ensure_ascii=False),
+                    expires_at,
+                ),
+            )
+
+    def load_links(
+        self,
+        url: str,
+    ) -> tuple[list[tuple[str, str]], float] | None:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT links, expires_at FROM links WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        links, expires_at = row
+        return [tuple(item) for item in json.loads(links)], expires_at
+
+    def save_links(
+        self,
+        url: str,
+        links: list[tuple[str, str]],
+        expires_at: float,
+    ) -> None:
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO links (url, links, expires_at) "
+                "VALUES (?, ?, ?)",
+                (url, json.dumps(links, ensure_ascii=False), expires_at),
+            )
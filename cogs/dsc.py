@@ -14,16 +14,18 @@ from discord import app_commands
 from discord.ext import commands
 
 from .constants import FOOTER_TEXT, load_wiki_config
+from .limiter import requester
 from .page_parsing import (
     Article,
+    TagFacet,
     UpstreamAccessError,
     UpstreamContentError,
     UpstreamNotFoundError,
     UpstreamUnavailableError,
-    WikiClient,
     WikiError,
 )
 from .txt_processing import escape_discord, excerpt
+from .wiki_service import WikiBackend, create_wiki_client
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +89,11 @@ def _article_embed(article: Article, query: str = "") -> discord.Embed:
     return embed
 
 
+def _tag_choice_name(chosen: list[str], facet: TagFacet) -> str:
+    """Label an autocomplete choice with the full tag list and article count."""
+    return f"{' '.join([*chosen, facet.identifier])} ({facet.count})"
+
+
 class SearchResultsView(discord.ui.View):
     """Owner-only pagination for full-text search results."""
 
@@ -186,7 +193,7 @@ class SearchResultsView(discord.ui.View):
 
 
 class DscCog(commands.Cog):
-    """Prefix and slash commands backed by one shared WikiClient."""
+    """Prefix and slash commands backed by one shared wiki client."""
 
     RATE_LIMITS = {
         "search": _RateLimit(3, 20),
@@ -195,16 +202,23 @@ class DscCog(commands.Cog):
         "fullsearch": _RateLimit(1, 30),
     }
 
-    def __init__(self, bot: commands.Bot) -> None:
+    def __init__(
+        self,
+        bot: commands.Bot,
+        wiki: WikiBackend | None = None,
+    ) -> None:
         self.bot = bot
-        self.wiki = WikiClient(load_wiki_config())
+        # An injected client is shared with other adapters and closed by its owner.
+        self._owns_wiki = wiki is None
+        self.wiki = wiki or create_wiki_client(load_wiki_config())
         self.rate_limiter = _RateLimiter(self.RATE_LIMITS)
 
     async def cog_load(self) -> None:
         await self.wiki.start()
 
     async def cog_unload(self) -> None:
-        await self.wiki.close()
+        if self._owns_wiki:
+            await self.wiki.close()
 
     @staticmethod
     def _error_text(error: Exception) -> str:
@@ -310,11 +324,12 @@ class DscCog(commands.Cog):
         started_at = monotonic()
 
         try:
-            if ctx.interaction is None:
-                async with ctx.typing():
+            with requester(f"discord:{ctx.author.id}"):
+                if ctx.interaction is None:
+                    async with ctx.typing():
+                        result = await operation()
+                else:
                     result = await operation()
-            else:
-                result = await operation()
         except Exception as error:
             await self._send_error(ctx, error)
             return False, None
@@ -547,6 +562,49 @@ class DscCog(commands.Cog):
         embed.set_footer(text=FOOTER_TEXT)
         await self._send_command_result(ctx, embed=embed)
 
+    @search_tags.autocomplete("tags")
+    async def search_tags_autocomplete(
+        self,
+        _: discord.Interaction,
+        current: str,
+    ) -> list[app_commands.Choice[str]]:
+        """Complete the last tag in the list from the tag catalogue."""
+        chosen = current.split()
+        partial = "" if not chosen or current.endswith(" ") else chosen.pop()
+
+        if len(chosen) >= MAX_TAGS:
+            return []
+
+        try:
+            suggestions = await asyncio.wait_for(
+                self.wiki.tag_suggestions(partial, limit=25 + len(chosen)),
+                timeout=AUTOCOMPLETE_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            logger.debug(
+                "discord_tag_autocomplete_timeout query_length=%s",
+                len(partial),
+            )
+            return []
+        except WikiError as error:
+            logger.debug(
+                "discord_tag_autocomplete_wiki_error error=%s",
+                type(error).__name__,
+            )
+            return []
+        except Exception:
+            logger.exception("discord_tag_autocomplete_failed")
+            return []
+
+        return [
+            app_commands.Choice(
+                name=_tag_choice_name(chosen, facet)[:100],
+                value=" ".join([*chosen, facet.identifier])[:100],
+            )
+            for facet in cast(list[TagFacet], suggestions)
+            if facet.identifier not in chosen
+        ][:25]
+
     @commands.hybrid_command(
         name="fullsearch",
         description="Искать текст во всех статьях",
@@ -638,5 +696,5 @@ class DscCog(commands.Cog):
 
 
 async def setup(bot: commands.Bot) -> None:
-    """Register the Discord command cog."""
-    await bot.add_cog(DscCog(bot))
\ No newline at end of file
+    """Register the Discord command cog, reusing the bot's wiki client if set."""
+    await bot.add_cog(DscCog(bot, getattr(bot, "wiki", None)))
\ No newline at end of file
@@ -0,0 +1,304 @@
+"""Adaptive concurrency limit for upstream wiki requests.
+
+``AdaptiveLimiter`` works like TCP congestion control (AIMD). Every healthy
+response that used the whole window raises the limit by ``1 / limit``, so the
+limit grows by about one per window of requests. A 429, 5xx or timeout halves
+it, but only once per window: requests started before the last cut do not cut
+again. The limit always stays within the configured bounds.
+
+Waiting requests are served by priority class. Within a class, each
+requester (a Discord user or Telegram chat) gets one slot per round, so a
+burst of fan-out fetches from one user cannot starve another. Class and
+requester come from context variables, set with ``request_priority`` and
+``requester``, so tasks started for the work inherit them. Lower classes
+never take the last free slot, which keeps one slot open for interactive
+commands.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from time import monotonic
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request classes, most urgent first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "castopia_request_priority",
+    default=Priority.INTERACTIVE,
+)
+
+
+_requester: ContextVar[str] = ContextVar("castopia_requester", default="")
+
+
+def current_requester() -> str:
+    """Return who the running task's upstream requests are for."""
+    return _requester.get()
+
+
+@contextlib.contextmanager
+def requester(owner: str | None) -> Iterator[None]:
+    """Attribute upstream requests made in the block to ``owner``.
+
+    Work without a requester, such as crawling, shares one queue.
+    """
+    token = _requester.set(owner or "")
+
+    try:
+        yield
+    finally:
+        _requester.reset(token)
+
+
+def current_priority() -> Priority:
+    """Return the request class of the running task."""
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Run the block, and tasks started in it, at ``priority`` or lower.
+
+    Nested blocks never raise the class, so bulk work started by a
+    background job stays in the background.
+    """
+    token = _priority.set(max(priority, _priority.get()))
+
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass(frozen=True, slots=True)
+class LimiterStats:
+    """A snapshot of the limiter for logs and diagnostics."""
+
+    limit: float
+    minimum: int
+    maximum: int
+    in_flight: int
+    waiting: int
+    successes: int
+    overloads: int
+
+
+class Permit:
+    """One acquired request slot; report how the request went before exit.
+
+    Only the first report counts, so report success only once the response
+    body has been read.
+    """
+
+    __slots__ = ("_limiter", "started_at", "saturated", "outcome")
+
+    def __init__(self, limiter: AdaptiveLimiter, saturated: bool) -> None:
+        self._limiter = limiter
+        self.started_at = monotonic()
+        self.saturated = saturated
+        self.outcome: bool | None = None
+
+    def succeeded(self) -> None:
+        """Record a response read in full; slow ones do not raise the limit."""
+        if self.outcome is None:
+            self.outcome = True
+            self._limiter._on_success(self)
+
+    def overloaded(self) -> None:
+        """Record a 429, 5xx, timeout or broken response body."""
+        if self.outcome is None:
+            self.outcome = False
+            self._limiter._on_overload(self)
+
+
+class _FairQueue:
+    """Waiters grouped by requester and served round-robin.
+
+    This is deficit round robin with one request as the unit cost and equal
+    quanta: every requester with queued work gets one slot per round, however
+    many requests it has queued.
+    """
+
+    def __init__(self) -> None:
+        self._queues: OrderedDict[str, deque[asyncio.Future[None]]] = OrderedDict()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, owner: str, waiter: asyncio.Future[None]) -> None:
+        self._queues.setdefault(owner, deque()).append(waiter)
+        self._size += 1
+
+    def popleft(self) -> asyncio.Future[None]:
+        """Return the oldest waiter of the requester whose turn it is."""
+        owner, queue = next(iter(self._queues.items()))
+        waiter = queue.popleft()
+        self._size -= 1
+
+        if queue:
+            self._queues.move_to_end(owner)
+        else:
+            del self._queues[owner]
+
+        return waiter
+
+    def remove(self, owner: str, waiter: asyncio.Future[None]) -> None:
+        queue = self._queues[owner]
+        queue.remove(waiter)
+        self._size -= 1
+
+        if not queue:
+            del self._queues[owner]
+
+
+class AdaptiveLimiter:
+    """Bound concurrent requests with an AIMD-adjusted limit."""
+
+    BACKOFF = 0.5
+    # Responses slower than this count as healthy but do not raise the limit.
+    LATENCY_TARGET = 2.0
+
+    def __init__(self, minimum: int, maximum: int, initial: int) -> None:
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self._limit = float(min(max(initial, self.minimum), self.maximum))
+        self._in_flight = 0
+        self._waiters: dict[Priority, _FairQueue] = {
+            priority: _FairQueue() for priority in Priority
+        }
+        self._last_cut = 0.0
+        self._successes = 0
+        self._overloads = 0
+
+    @property
+    def limit(self) -> int:
+        """Return how many requests may run at once right now."""
+        return int(self._limit)
+
+    def stats(self) -> LimiterStats:
+        return LimiterStats(
+            limit=round(self._limit, 2),
+            minimum=self.minimum,
+            maximum=self.maximum,
+            in_flight=self._in_flight,
+            waiting=sum(len(waiters) for waiters in self._waiters.values()),
+            successes=self._successes,
+            overloads=self._overloads,
+        )
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self,
+        priority: Priority | None = None,
+        owner: str | None = None,
+    ) -> AsyncIterator[Permit]:
+        """Wait for a free slot and hold it for the duration of the block.
+
+        ``priority`` and ``owner`` default to the values set by
+        ``request_priority`` and ``requester``.
+        """
+        if priority is None:
+            priority = current_priority()
+
+        await self._acquire(
+            priority,
+            current_requester() if owner is None else owner,
+        )
+        permit = Permit(self, self._in_flight >= self._capacity(priority))
+
+        try:
+            yield permit
+        finally:
+            self._in_flight -= 1
+            self._wake()
+
+    def _capacity(self, priority: Priority) -> int:
+        """Return how many slots requests of ``priority`` may fill."""
+        if priority is Priority.INTERACTIVE or self.limit == 1:
+            return self.limit
+
+        return self.limit - 1
+
+    async def _acquire(self, priority: Priority, owner: str) -> None:
+        if self._in_flight < self._capacity(priority) and not any(
+            self._waiters[level] for level in Priority if level <= priority
+        ):
+            self._in_flight += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(owner, waiter)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation.
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._waiters[priority].remove(owner, waiter)
+            raise
+
+    def _wake(self) -> None:
+        """Hand free slots to the most urgent waiters, oldest first."""
+        for priority in Priority:
+            waiters = self._waiters[priority]
+
+            while waiters and self._in_flight < self._capacity(priority):
+                waiter = waiters.popleft()
+
+                if not waiter.done():
+                    self._in_flight += 1
+                    waiter.set_result(None)
+
+            if waiters:
+                # Lower classes wait until this one is served.
+                return
+
+    def _on_success(self, permit: Permit) -> None:
+        self._successes += 1
+
+        if (
+            not permit.saturated
+            or monotonic() - permit.started_at > self.LATENCY_TARGET
+            or self._limit >= self.maximum
+        ):
+            return
+
+        previous = self.limit
+        self._limit = min(self.maximum, self._limit + 1 / self._limit)
+
+        if self.limit != previous:
+            logger.info("wiki_concurrency_limit limit=%s reason=healthy", self.limit)
+            self._wake()
+
+    def _on_overload(self, permit: Permit) -> None:
+        self._overloads += 1
+
+        if permit.started_at < self._last_cut:
+            return
+
+        self._last_cut = monotonic()
+        previous = self.limit
+        self._limit = max(self.minimum, self._limit * self.BACKOFF)
+
+        if self.limit != previous:
+            logger.info("wiki_concurrency_limit limit=%s reason=overload", self.limit)
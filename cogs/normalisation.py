@@ -0,0 +1,169 @@
+"""Text normalisation shared by the search index and query handling.
+
+Castopia is a Russian-language wiki, so word forms such as "объект",
+"объекта" and "объектами" must meet at one index term. Text is NFKC-folded,
+casefolded, ``ё`` is spelled ``е`` and every word is reduced with the
+Snowball Russian stemmer. Indexing and queries go through the same
+``analyse`` function, so their terms always agree.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_VOWELS = frozenset("аеиоуыэюя")
+
+# Snowball Russian suffix groups. Group 1 endings only count after "а" or "я".
+_PERFECTIVE_GERUND_1 = ("вшись", "вши", "в")
+_PERFECTIVE_GERUND_2 = ("ившись", "ывшись", "ивши", "ывши", "ив", "ыв")
+_ADJECTIVE = (
+    "ими", "ыми", "его", "ого", "ему", "ому",
+    "ее", "ие", "ые", "ое", "ей", "ий", "ый", "ой", "ем", "им", "ым",
+    "ом", "их", "ых", "ую", "юю", "ая", "яя", "ою", "ею",
+)
+_PARTICIPLE_1 = ("ем", "нн", "вш", "ющ", "щ")
+_PARTICIPLE_2 = ("ивш", "ывш", "ующ")
+_REFLEXIVE = ("ся", "сь")
+_VERB_1 = (
+    "ешь", "нно", "ете", "йте", "ла", "на", "ли", "ем", "ло", "но", "ет",
+    "ют", "ны", "ть", "й", "л", "н",
+)
+_VERB_2 = (
+    "уйте", "ейте", "ила", "ыла", "ена", "ите", "или", "ыли", "ило", "ыло",
+    "ено", "ует", "уют", "ены", "ить", "ыть", "ишь", "ей", "уй", "ил", "ыл",
+    "им", "ым", "ен", "ят", "ит", "ыт", "ую", "ю",
+)
+_NOUN = (
+    "иями", "ями", "ами", "ией", "иям", "ием", "иях",
+    "ев", "ов", "ие", "ье", "еи", "ии", "ей", "ой", "ий", "ям", "ем",
+    "ам", "ом", "ах", "ях", "ию", "ью", "ия", "ья",
+    "а", "е", "и", "й", "о", "у", "ы", "ь", "ю", "я",
+)
+_DERIVATIONAL = ("ость", "ост")
+_SUPERLATIVE = ("ейше", "ейш")
+
+
+def normalise(text: str) -> str:
+    """Apply NFKC, casefold and spell ``ё`` as ``е``."""
+    return unicodedata.normalize("NFKC", text).casefold().replace("ё", "е")
+
+
+def analyse(text: str) -> list[str]:
+    """Split text into normalised, stemmed index terms."""
+    return [stem(word) for word in _TOKEN_RE.findall(normalise(text))]
+
+
+@lru_cache(maxsize=65536)
+def stem(word: str) -> str:
+    """Return the Snowball Russian stem of a normalised word.
+
+    Words without Cyrillic vowels, such as Latin words and numbers, are
+    returned unchanged.
+    """
+    rv = _region_after_vowel(word)
+
+    if rv >= len(word):
+        return word
+
+    r2 = _region_r1(word, _region_r1(word, 0))
+
+    # Step 1: perfective gerund, or reflexive then adjectival, verb or noun.
+    ending = _match(word, rv, _PERFECTIVE_GERUND_1, _PERFECTIVE_GERUND_2)
+
+    if ending:
+        word = word[:-ending]
+    else:
+        ending = _match(word, rv, (), _REFLEXIVE)
+        if ending:
+            word = word[:-ending]
+
+        ending = _match(word, rv, (), _ADJECTIVE)
+
+        if ending:
+            word = word[:-ending]
+            ending = _match(word, rv, _PARTICIPLE_1, _PARTICIPLE_2)
+            if ending:
+                word = word[:-ending]
+        else:
+            ending = _match(word, rv, _VERB_1, _VERB_2) or _match(
+                word, rv, (), _NOUN
+            )
+            if ending:
+                word = word[:-ending]
+
+    # Step 2.
+    if word.endswith("и") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    # Step 3: derivational endings in R2.
+    ending = _match(word, r2, (), _DERIVATIONAL)
+    if ending:
+        word = word[:-ending]
+
+    # Step 4: superlative, doubled "н" and soft sign.
+    ending = _match(word, rv, (), _SUPERLATIVE)
+    if ending:
+        word = word[:-ending]
+
+    if word.endswith("нн") and len(word) - 2 >= rv:
+        word = word[:-1]
+    elif not ending and word.endswith("ь") and len(word) - 1 >= rv:
+        word = word[:-1]
+
+    return word
+
+
+def _region_after_vowel(word: str) -> int:
+    """Return where RV starts: after the first vowel, or the word's end."""
+    for index, char in enumerate(word):
+        if char in _VOWELS:
+            return index + 1
+
+    return len(word)
+
+
+def _region_r1(word: str, start: int) -> int:
+    """Return the start of the region after the first vowel-consonant pair."""
+    for index in range(start + 1, len(word)):
+        if word[index - 1] in _VOWELS and word[index] not in _VOWELS:
+            return index + 1
+
+    return len(word)
+
+
+def _match(
+    word: str,
+    region: int,
+    after_a: tuple[str, ...],
+    plain: tuple[str, ...],
+) -> int:
+    """Return the length of the longest suffix in ``region`` that may be removed.
+
+    As in Snowball, only the longest suffix is considered; when it is an
+    ``after_a`` ending not preceded by "а" or "я", nothing is removed.
+    """
+    best = ""
+    needs_a = False
+    room = len(word) - region
+
+    for suffix in after_a:
+        if len(best) < len(suffix) <= room and word.endswith(suffix):
+            best, needs_a = suffix, True
+
+    for suffix in plain:
+        if len(best) < len(suffix) <= room and word.endswith(suffix):
+            best, needs_a = suffix, False
+
+    if not best:
+        return 0
+
+    start = len(word) - len(best)
+
+    if needs_a and (start - 1 < region or word[start - 1] not in "ая"):
+        return 0
+
+    return len(best)
@@ -8,21 +8,45 @@ site owner's permission.
 from __future__ import annotations
 
 import asyncio
+import codecs
+import contextlib
 import logging
 import random
 import re
+import sqlite3
+import sys
 from collections import deque
-from collections.abc import Awaitable, Callable, Iterable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Iterator
 from dataclasses import dataclass
 from datetime import timedelta
-from time import monotonic
-from typing import Generic, TypeVar
+from time import monotonic, time
+from typing import Any, Generic, TypeVar
 from urllib.parse import unquote, urljoin, urlsplit
 
 import aiohttp
-from bs4 import BeautifulSoup
+import lxml.html
+from bs4 import BeautifulSoup, Tag
+from lxml import etree
 
+from .cache import Cache
+from .circuit_breaker import HALF_OPEN, CircuitBreaker, CircuitStats
 from .constants import SYSTEM_TAGS, WikiConfig
+from .crawler import WikiCrawler
+from .disk_cache import DiskCache
+from .limiter import (
+    AdaptiveLimiter,
+    LimiterStats,
+    Permit,
+    Priority,
+    request_priority,
+)
+from .normalisation import analyse, normalise
+from .parse_executor import ParseExecutor
+from .random_pool import RandomPool
+from .retry_budget import RetryBudget, RetryStats
+from .search_index import SearchIndex
+from .tag_index import TagIndex
+from .title_index import TitleIndex
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +66,10 @@ class UpstreamUnavailableError(WikiError):
     """The source could not be reached reliably."""
 
 
+class UpstreamCircuitOpenError(UpstreamUnavailableError):
+    """Requests are paused after repeated upstream failures."""
+
+
 class UpstreamNotFoundError(WikiError):
     """A page listed by the source no longer exists."""
 
@@ -58,13 +86,54 @@ class Article:
     tags: frozenset[str]
 
 
+@dataclass(frozen=True, slots=True)
+class TagFacet:
+    """One Wikidot ``category:value`` tag and how many articles carry it."""
+
+    identifier: str
+    category: str
+    name: str
+    count: int
+
+
 @dataclass(slots=True)
 class _CacheEntry(Generic[T]):
     value: T
     expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
 
-    def is_fresh(self) -> bool:
-        return monotonic() < self.expires_at
+    def is_fresh(self, grace: float = 0.0) -> bool:
+        """Return whether the entry expires more than ``grace`` seconds from now."""
+        return monotonic() < self.expires_at + grace
+
+    def validators(self) -> dict[str, str]:
+        """Return conditional request headers for revalidating this entry."""
+        headers: dict[str, str] = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+
+@dataclass(frozen=True, slots=True)
+class _PageResponse(Generic[T]):
+    """An upstream page body, or ``None`` when a conditional GET returned 304.
+
+    The body is the decoded HTML unless the request used a custom reader.
+    """
+
+    body: T | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        return self.body is None
 
 
 @dataclass(frozen=True, slots=True)
@@ -74,11 +143,697 @@ class _TagReference:
 
 
 @dataclass(slots=True)
-class _UrlLockEntry:
+class _KeyedLockEntry:
     lock: asyncio.Lock
     users: int = 0
 
 
+@contextlib.asynccontextmanager
+async def _keyed_lock(
+    locks: dict[str, _KeyedLockEntry],
+    key: str,
+) -> AsyncIterator[None]:
+    """Hold the lock for ``key`` and drop it from ``locks`` once unused."""
+    lock_entry = locks.get(key)
+
+    if lock_entry is None:
+        lock_entry = _KeyedLockEntry(asyncio.Lock())
+        locks[key] = lock_entry
+
+    lock_entry.users += 1
+
+    try:
+        async with lock_entry.lock:
+            yield
+    finally:
+        lock_entry.users -= 1
+
+        if lock_entry.users == 0:
+            locks.pop(key, None)
+
+
+def _article_size(article: Article) -> int:
+    """Estimate the memory held by an article's strings in bytes."""
+    return (
+        sys.getsizeof(article)
+        + sys.getsizeof(article.title)
+        + sys.getsizeof(article.url)
+        + sys.getsizeof(article.text)
+        + sum(sys.getsizeof(tag) for tag in article.tags)
+    )
+
+
+_EDIT_LABELS = frozenset({"edit", "редактировать"})
+
+
+def _same_origin_url(base_url: str, url: str) -> str:
+    """Return an absolute URL and reject URLs outside the base URL's origin."""
+    absolute = urljoin(f"{base_url}/", url)
+    parsed = urlsplit(absolute)
+    base = urlsplit(base_url)
+
+    if (parsed.scheme, parsed.netloc) != (base.scheme, base.netloc):
+        raise ValueError(
+            "Refusing to request a URL outside the configured wiki origin"
+        )
+
+    return absolute
+
+
+def _is_edit_link(title: str, href: str) -> bool:
+    """Return whether a link points to an edit control rather than an article."""
+    path = urlsplit(href).path.casefold().rstrip("/")
+
+    return (
+        title.casefold() in _EDIT_LABELS
+        or "/edit/" in path
+        or path.endswith("/edit")
+    )
+
+
+def _tag_identifier(anchor: object) -> str:
+    """Read Wikidot's full category:value tag from a tag-link href."""
+    href = getattr(anchor, "get", lambda *_: None)("href")
+    if not href:
+        return ""
+
+    path = urlsplit(href).path
+    marker = "/tag/"
+
+    if marker not in path:
+        return ""
+
+    return unquote(path.split(marker, 1)[1]).casefold().strip()
+
+
+# The parsers below are module-level and return plain picklable data so the
+# ParseExecutor can run them in worker processes.
+
+
+def _parse_article_html(html: str, title: str, url: str) -> Article:
+    """Extract cleaned article text and tags from an article page."""
+    soup = BeautifulSoup(html, "lxml")
+    content = soup.find("div", id="page-content")
+
+    if content is None:
+        raise UpstreamContentError(
+            "Источник вернул страницу без блока #page-content. "
+            "Структура сайта могла измениться."
+        )
+
+    for element in content.select(
+        "script, style, noscript, .no-style, "
+        ".footnoteref, #side-bar"
+    ):
+        element.decompose()
+
+    text = re.sub(
+        r"\s+",
+        " ",
+        content.get_text(" ", strip=True),
+    ).strip()
+
+    if not text:
+        raise UpstreamContentError(
+            f"Страница '{title}' не содержит доступного текста. "
+            "Возможно, это служебная страница."
+        )
+
+    tags = frozenset(
+        _tag_identifier(item)
+        or item.get_text(" ", strip=True).casefold()
+        for item in soup.select("div.page-tags a")
+        if item.get_text(strip=True)
+    )
+
+    return Article(
+        title=title,
+        url=url,
+        text=text,
+        tags=tags,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _ListingPage:
+    """Everything extracted from one all-pages listing page in one parse."""
+
+    links: list[tuple[str, str]]
+    total_pages: int
+
+
+def _extract_total_pages(soup: BeautifulSoup) -> int:
+    pager = soup.find("span", class_="pager-no")
+
+    if not pager:
+        return 1
+
+    match = re.search(
+        r"(\d+)\s*$",
+        pager.get_text(" ", strip=True),
+    )
+
+    return max(1, int(match.group(1))) if match else 1
+
+
+def _extract_list_links(
+    boxes: Iterable[Tag],
+    base_url: str,
+) -> list[tuple[str, str]]:
+    links: list[tuple[str, str]] = []
+
+    for box in boxes:
+        for anchor in box.find_all("a", href=True):
+            title = anchor.get_text(" ", strip=True)
+            href = anchor["href"]
+
+            if not title or _is_edit_link(title, href):
+                continue
+
+            try:
+                links.append(
+                    (
+                        title,
+                        _same_origin_url(base_url, href),
+                    )
+                )
+            except ValueError:
+                logger.debug(
+                    "wiki_link_skipped reason=off_origin"
+                )
+
+    return links
+
+
+def _parse_listing_html(
+    html: str,
+    base_url: str,
+    validate: bool = False,
+) -> _ListingPage:
+    """Parse a listing page once for its links and pager.
+
+    ``validate`` raises when the page lacks the expected listing structure;
+    it is used for the first page, which decides whether the rest is fetched.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    page_content = soup.select_one("#page-content")
+
+    if validate and page_content is None:
+        raise UpstreamContentError(
+            "Источник вернул страницу списка без блока #page-content. "
+            "Структура сайта могла измениться."
+        )
+
+    boxes = (page_content or soup).select("div.list-pages-box")
+
+    if validate and not boxes:
+        raise UpstreamContentError(
+            "Источник вернул страницу списка без блоков "
+            ".list-pages-box. Структура сайта могла измениться."
+        )
+
+    return _ListingPage(
+        links=_extract_list_links(boxes, base_url),
+        total_pages=_extract_total_pages(soup),
+    )
+
+
+def _parse_tag_catalog_html(
+    html: str,
+    base_url: str,
+) -> dict[str, list[_TagReference]]:
+    """Map tag display names and identifiers to their tag pages."""
+    soup = BeautifulSoup(html, "lxml")
+    catalog: dict[str, list[_TagReference]] = {}
+
+    for anchor in soup.select("a.tag[href]"):
+        display_name = anchor.get_text(
+            " ",
+            strip=True,
+        ).casefold()
+
+        identifier = _tag_identifier(anchor)
+
+        if not display_name or not identifier:
+            continue
+
+        reference = _TagReference(
+            identifier,
+            _same_origin_url(base_url, anchor["href"]),
+        )
+
+        for key in {display_name, identifier}:
+            catalog.setdefault(key, []).append(reference)
+
+    return catalog
+
+
+def _parse_tagged_pages_html(
+    html: str,
+    base_url: str,
+) -> list[tuple[str, str]]:
+    """Parse the article links listed on one tag page."""
+    soup = BeautifulSoup(html, "lxml")
+    scope = soup.select_one("#tagged-pages-list")
+
+    if scope is None:
+        raise UpstreamContentError(
+            "Источник не вернул список страниц для выбранного "
+            "тега. Структура сайта может измениться."
+        )
+
+    candidates: list[tuple[str, str]] = []
+
+    for anchor in scope.select("a[href]"):
+        title = anchor.get_text(" ", strip=True)
+        href = anchor["href"]
+
+        if not title or _is_edit_link(title, href):
+            continue
+
+        try:
+            candidates.append(
+                (
+                    title,
+                    _same_origin_url(base_url, href),
+                )
+            )
+        except ValueError:
+            continue
+
+    return candidates
+
+
+# lxml-native extraction. These functions mirror the BeautifulSoup parsers
+# above and must return identical results; tests compare both backends.
+
+# BeautifulSoup's get_text() skips strings inside these elements.
+_LXML_HIDDEN_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+
+def _has_class(name: str) -> str:
+    """Return an XPath predicate matching one token of the class attribute."""
+    return (
+        "contains(concat(' ', normalize-space(@class), ' '), "
+        f"' {name} ')"
+    )
+
+
+def _lxml_document(html: str) -> etree._Element | None:
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+
+    try:
+        return lxml.html.document_fromstring(
+            html.encode("utf-8"),
+            parser=parser,
+        )
+    except etree.ParserError:
+        return None
+
+
+def _lxml_strings(
+    root: etree._Element,
+    skip: frozenset[etree._Element] = frozenset(),
+) -> Iterator[str]:
+    """Yield the text nodes BeautifulSoup's get_text() would see, in order."""
+    hidden_root = any(
+        ancestor.tag in _LXML_HIDDEN_TEXT_TAGS
+        for ancestor in root.iterancestors()
+    )
+    stack: list[tuple[etree._Element, bool, bool]] = [(root, hidden_root, True)]
+
+    while stack:
+        node, parent_hidden, starting = stack.pop()
+
+        if not starting:
+            if node is not root and node.tail and not parent_hidden:
+                yield node.tail
+            continue
+
+        stack.append((node, parent_hidden, False))
+
+        if not isinstance(node.tag, str) or node in skip:
+            continue
+
+        hidden = parent_hidden or node.tag in _LXML_HIDDEN_TEXT_TAGS
+
+        if node.text and not hidden:
+            yield node.text
+
+        for child in reversed(node):
+            stack.append((child, hidden, True))
+
+
+def _lxml_text(
+    root: etree._Element,
+    skip: frozenset[etree._Element] = frozenset(),
+) -> str:
+    """Match BeautifulSoup's ``get_text(" ", strip=True)``."""
+    return " ".join(
+        stripped
+        for text in _lxml_strings(root, skip)
+        if (stripped := text.strip())
+    )
+
+
+def _lxml_parse_article_html(html: str, title: str, url: str) -> Article:
+    document = _lxml_document(html)
+    found = (
+        document.xpath("(//div[@id='page-content'])[1]")
+        if document is not None
+        else []
+    )
+
+    if not found:
+        raise UpstreamContentError(
+            "Источник вернул страницу без блока #page-content. "
+            "Структура сайта могла измениться."
+        )
+
+    content = found[0]
+    removed = frozenset(
+        content.xpath(
+            ".//*[self::script or self::style or self::noscript"
+            f" or {_has_class('no-style')} or {_has_class('footnoteref')}"
+            " or @id='side-bar']"
+        )
+    )
+
+    text = re.sub(
+        r"\s+",
+        " ",
+        _lxml_text(content, removed),
+    ).strip()
+
+    if not text:
+        raise UpstreamContentError(
+            f"Страница '{title}' не содержит доступного текста. "
+            "Возможно, это служебная страница."
+        )
+
+    tags = frozenset(
+        _tag_identifier(item)
+        or _lxml_text(item).casefold()
+        for item in document.xpath(f"//div[{_has_class('page-tags')}]//a")
+        if _lxml_text(item)
+    )
+
+    return Article(
+        title=title,
+        url=url,
+        text=text,
+        tags=tags,
+    )
+
+
+def _lxml_parse_listing_html(
+    html: str,
+    base_url: str,
+    validate: bool = False,
+) -> _ListingPage:
+    document = _lxml_document(html)
+    page_content = (
+        document.xpath("(//*[@id='page-content'])[1]")
+        if document is not None
+        else []
+    )
+
+    if validate and not page_content:
+        raise UpstreamContentError(
+            "Источник вернул страницу списка без блока #page-content. "
+            "Структура сайта могла измениться."
+        )
+
+    if document is None:
+        return _ListingPage(links=[], total_pages=1)
+
+    scope = page_content[0] if page_content else document
+    boxes = scope.xpath(f".//div[{_has_class('list-pages-box')}]")
+
+    if validate and not boxes:
+        raise UpstreamContentError(
+            "Источник вернул страницу списка без блоков "
+            ".list-pages-box. Структура сайта могла измениться."
+        )
+
+    links: list[tuple[str, str]] = []
+
+    for box in boxes:
+        for anchor in box.xpath(".//a[@href]"):
+            title = _lxml_text(anchor)
+            href = anchor.get("href")
+
+            if not title or _is_edit_link(title, href):
+                continue
+
+            try:
+                links.append((title, _same_origin_url(base_url, href)))
+            except ValueError:
+                logger.debug("wiki_link_skipped reason=off_origin")
+
+    total_pages = 1
+    pager = document.xpath(f"(//span[{_has_class('pager-no')}])[1]")
+
+    if pager:
+        match = re.search(r"(\d+)\s*$", _lxml_text(pager[0]))
+        total_pages = max(1, int(match.group(1))) if match else 1
+
+    return _ListingPage(links=links, total_pages=total_pages)
+
+
+def _lxml_parse_tag_catalog_html(
+    html: str,
+    base_url: str,
+) -> dict[str, list[_TagReference]]:
+    document = _lxml_document(html)
+    catalog: dict[str, list[_TagReference]] = {}
+
+    if document is None:
+        return catalog
+
+    for anchor in document.xpath(f"//a[{_has_class('tag')}][@href]"):
+        display_name = _lxml_text(anchor).casefold()
+        identifier = _tag_identifier(anchor)
+
+        if not display_name or not identifier:
+            continue
+
+        reference = _TagReference(
+            identifier,
+            _same_origin_url(base_url, anchor.get("href")),
+        )
+
+        for key in {display_name, identifier}:
+            catalog.setdefault(key, []).append(reference)
+
+    return catalog
+
+
+def _lxml_parse_tagged_pages_html(
+    html: str,
+    base_url: str,
+) -> list[tuple[str, str]]:
+    document = _lxml_document(html)
+    scope = (
+        document.xpath("(//*[@id='tagged-pages-list'])[1]")
+        if document is not None
+        else []
+    )
+
+    if not scope:
+        raise UpstreamContentError(
+            "Источник не вернул список страниц для выбранного "
+            "тега. Структура сайта может измениться."
+        )
+
+    candidates: list[tuple[str, str]] = []
+
+    for anchor in scope[0].xpath(".//a[@href]"):
+        title = _lxml_text(anchor)
+        href = anchor.get("href")
+
+        if not title or _is_edit_link(title, href):
+            continue
+
+        try:
+            candidates.append((title, _same_origin_url(base_url, href)))
+        except ValueError:
+            continue
+
+    return candidates
+
+
+@dataclass(slots=True)
+class _StreamFrame:
+    in_content: bool = False
+    removed: bool = False
+    hidden: bool = False
+    in_tags: bool = False
+    anchor: list[str] | None = None
+
+
+class _ArticleStream:
+    """Incremental article extractor fed with raw HTML bytes as they arrive.
+
+    lxml calls back into this object for every element and text node, so no
+    document tree and no full HTML string is kept. Results and errors match
+    the article parsers above.
+    """
+
+    _REMOVED_TAGS = frozenset({"script", "style", "noscript"})
+    _REMOVED_CLASSES = frozenset({"no-style", "footnoteref"})
+
+    def __init__(self, title: str, url: str) -> None:
+        self.title = title
+        self.url = url
+        self._stack = [_StreamFrame()]
+        self._pending: list[str] = []
+        self._content_found = False
+        self._strings: list[str] = []
+        self._tags: set[str] = set()
+        self._tag_hrefs: list[str | None] = []
+        self._parser = etree.HTMLParser(target=self, encoding="utf-8")
+
+    def feed(self, chunk: bytes) -> None:
+        if chunk:
+            self._parser.feed(chunk)
+
+    def finish(self) -> Article:
+        """Flush the parser and return the article, or raise a content error."""
+        try:
+            self._parser.close()
+        except etree.LxmlError:
+            # An empty body leaves libxml2 without a document.
+            pass
+
+        if not self._content_found:
+            raise UpstreamContentError(
+                "Источник вернул страницу без блока #page-content. "
+                "Структура сайта могла измениться."
+            )
+
+        text = re.sub(r"\s+", " ", " ".join(self._strings)).strip()
+
+        if not text:
+            raise UpstreamContentError(
+                f"Страница '{self.title}' не содержит доступного текста. "
+                "Возможно, это служебная страница."
+            )
+
+        return Article(
+            title=self.title,
+            url=self.url,
+            text=text,
+            tags=frozenset(self._tags),
+        )
+
+    # lxml parser target callbacks.
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        self._flush()
+
+        parent = self._stack[-1]
+        classes = set(attrib.get("class", "").split())
+        frame = _StreamFrame(
+            in_content=parent.in_content,
+            removed=parent.removed,
+            hidden=parent.hidden or tag in _LXML_HIDDEN_TEXT_TAGS,
+            in_tags=parent.in_tags or (tag == "div" and "page-tags" in classes),
+            anchor=parent.anchor,
+        )
+
+        if frame.in_content and not frame.removed:
+            frame.removed = (
+                tag in self._REMOVED_TAGS
+                or bool(classes & self._REMOVED_CLASSES)
+                or attrib.get("id") == "side-bar"
+            )
+        elif (
+            not self._content_found
+            and tag == "div"
+            and attrib.get("id") == "page-content"
+        ):
+            self._content_found = True
+            frame.in_content = True
+
+        if frame.in_tags and tag == "a" and not frame.removed:
+            frame.anchor = []
+            self._tag_hrefs.append(attrib.get("href"))
+
+        self._stack.append(frame)
+
+    def end(self, tag: str) -> None:
+        self._flush()
+
+        frame = self._stack.pop()
+
+        if frame.anchor is not None and frame.anchor is not self._stack[-1].anchor:
+            self._add_tag(frame.anchor, self._tag_hrefs.pop())
+
+    def data(self, data: str) -> None:
+        self._pending.append(data)
+
+    def comment(self, text: str) -> None:
+        self._flush()
+
+    def pi(self, target: str, data: str | None = None) -> None:
+        self._flush()
+
+    def close(self) -> None:
+        self._flush()
+
+    def _flush(self) -> None:
+        """Emit buffered data as one text node, as lxml may split it."""
+        if not self._pending:
+            return
+
+        text = "".join(self._pending).strip()
+        self._pending.clear()
+        frame = self._stack[-1]
+
+        if not text or frame.hidden:
+            return
+
+        if frame.in_content and not frame.removed:
+            self._strings.append(text)
+
+        if frame.anchor is not None:
+            frame.anchor.append(text)
+
+    def _add_tag(self, strings: list[str], href: str | None) -> None:
+        if not strings:
+            return
+
+        tag = _tag_identifier({"href": href}) or " ".join(strings).casefold()
+        self._tags.add(tag)
+
+
+@dataclass(frozen=True, slots=True)
+class _ParserBackend:
+    """The set of extraction functions used for one parser backend."""
+
+    article: Callable[[str, str, str], Article]
+    listing: Callable[..., _ListingPage]
+    tag_catalog: Callable[[str, str], dict[str, list[_TagReference]]]
+    tagged_pages: Callable[[str, str], list[tuple[str, str]]]
+
+
+PARSER_BACKENDS = {
+    "bs4": _ParserBackend(
+        article=_parse_article_html,
+        listing=_parse_listing_html,
+        tag_catalog=_parse_tag_catalog_html,
+        tagged_pages=_parse_tagged_pages_html,
+    ),
+    "lxml": _ParserBackend(
+        article=_lxml_parse_article_html,
+        listing=_lxml_parse_listing_html,
+        tag_catalog=_lxml_parse_tag_catalog_html,
+        tagged_pages=_lxml_parse_tagged_pages_html,
+    ),
+}
+
+
 class WikiClient:
     """Fetch and parse wiki content with bounded concurrency and TTL caches."""
 
@@ -87,11 +842,25 @@ class WikiClient:
     SEARCH_CACHE_TTL = timedelta(minutes=5)
     REQUEST_ATTEMPTS = 3
     REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=12, connect=4, sock_read=8)
-    EDIT_LABELS = frozenset({"edit", "редактировать"})
-
-    MAX_PAGE_CACHE_ENTRIES = 512
-    MAX_ARTICLE_CACHE_ENTRIES = 512
-    MAX_SEARCH_CACHE_ENTRIES = 64
+    STREAM_CHUNK_SIZE = 64 * 1024
+    # The adaptive request limit starts here, within the configured bounds.
+    INITIAL_CONCURRENCY = 4
+    EDIT_LABELS = _EDIT_LABELS
+
+    # Shares of WIKI_CACHE_MEMORY_BYTES for the page, article and search caches.
+    PAGE_CACHE_SHARE = 0.6
+    ARTICLE_CACHE_SHARE = 0.3
+    SEARCH_CACHE_SHARE = 0.1
+
+    # Random articles fetched ahead so /randompage does not wait on upstream.
+    RANDOM_BUFFER_SIZE = 4
+    RANDOM_ATTEMPTS = 12
+
+    # Expired pages and articles are kept this long so they can be revalidated.
+    REVALIDATION_WINDOW = timedelta(hours=1)
+    # Expired entries restored from disk are served this long while they are
+    # revalidated in the background.
+    DISK_RESTORE_GRACE = timedelta(minutes=2)
 
     def __init__(self, config: WikiConfig) -> None:
         self.config = config
@@ -99,24 +868,87 @@ class WikiClient:
         self.all_pages_url = config.all_pages_url
         self.tags_url = config.tags_url
 
-        parsed_base_url = urlsplit(self.base_url)
-        self._origin = (parsed_base_url.scheme, parsed_base_url.netloc)
-
         self._session: aiohttp.ClientSession | None = None
-        self._semaphore = asyncio.Semaphore(config.max_concurrent_requests)
-        self._full_search_lock = asyncio.Lock()
-
-        self._page_cache: dict[str, _CacheEntry[str]] = {}
-        self._article_cache: dict[str, _CacheEntry[Article]] = {}
-        self._search_cache: dict[str, _CacheEntry[list[Article]]] = {}
-
-        self._url_locks: dict[str, _UrlLockEntry] = {}
-        self._links_cache: _CacheEntry[list[tuple[str, str]]] | None = None
+        self._limiter = AdaptiveLimiter(
+            config.min_concurrent_requests,
+            config.max_concurrent_requests,
+            self.INITIAL_CONCURRENCY,
+        )
+        self._breaker = CircuitBreaker()
+        self._retry_budget = RetryBudget()
+
+        budget = config.cache_memory_bytes
+        retention = max(
+            self.REVALIDATION_WINDOW.total_seconds(),
+            config.stale_while_revalidate,
+            config.stale_if_error,
+        )
+        self._page_cache: Cache[_CacheEntry[str]] = Cache(
+            int(budget * self.PAGE_CACHE_SHARE),
+            weigh=lambda entry: sys.getsizeof(entry.value),
+            retention=retention,
+        )
+        self._article_cache: Cache[_CacheEntry[Article]] = Cache(
+            int(budget * self.ARTICLE_CACHE_SHARE),
+            weigh=lambda entry: _article_size(entry.value),
+            retention=retention,
+        )
+        # Search results share their articles with the article cache and the
+        # search index, so only the result lists themselves are counted.
+        self._search_cache: Cache[_CacheEntry[list[Article]]] = Cache(
+            int(budget * self.SEARCH_CACHE_SHARE),
+            weigh=lambda entry: sys.getsizeof(entry.value),
+        )
+        self._search_index = SearchIndex()
+        self._tag_index = TagIndex()
+        self._random_pool = RandomPool()
+        # Listed URLs known not to qualify for /randompage.
+        self._random_ineligible: set[str] = set()
+        # Public listed URLs in listing order, sampled by /randompage.
+        self._public_urls: tuple[str, ...] = ()
+        # Public listed URLs neither in the random pool nor known ineligible.
+        self._random_unknown: set[str] = set()
+        self._random_buffer: deque[Article] = deque()
+        self._random_refill: asyncio.Task[None] | None = None
+        # Background refreshes of stale entries, one per cache key.
+        self._stale_refreshes: dict[str, asyncio.Task[None]] = {}
+        # Tag identifier -> monotonic time its tag page listing goes stale.
+        self._tag_page_expiry: dict[str, float] = {}
+        self._index_failures: dict[str, float] = {}
+
+        self._url_locks: dict[str, _KeyedLockEntry] = {}
+        # One in-flight computation per normalised full-text query.
+        self._search_locks: dict[str, _KeyedLockEntry] = {}
+        self._links_cache: _CacheEntry[tuple[tuple[str, str], ...]] | None = None
+        # Normalised public URL -> title, rebuilt with the link listing.
+        self._public_links: dict[str, str] | None = None
+        # The listing the indexes were last pruned to.
+        self._retained_links: dict[str, str] | None = None
+        self._title_index: TitleIndex | None = None
         self._tag_catalog_cache: _CacheEntry[
             dict[str, list[_TagReference]]
         ] | None = None
 
+        self._crawler = WikiCrawler(self, interval=config.crawl_interval)
+        self._disk_cache = (
+            DiskCache(config.cache_path)
+            if config.cache_path
+            else None
+        )
+        self._disk_restored = False
+        self._parser = ParseExecutor(
+            config.parse_mode,
+            config.parse_workers,
+        )
+        self._backend = PARSER_BACKENDS[config.parser_backend]
+
     async def start(self) -> None:
+        """Open the session, restore the disk cache and start the crawler."""
+        await self._open_session()
+        await self._restore_from_disk()
+        self._crawler.start()
+
+    async def _open_session(self) -> None:
         """Create the shared HTTP session if it is not already open."""
         if self._session is not None and not self._session.closed:
             return
@@ -139,132 +971,328 @@ class WikiClient:
         )
 
     async def close(self) -> None:
-        """Close the shared HTTP session."""
+        """Stop the background crawler and close the shared HTTP session."""
+        await self._crawler.stop()
+
+        tasks = [self._random_refill, *self._stale_refreshes.values()]
+        self._random_refill = None
+        self._stale_refreshes.clear()
+
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
+
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
         if self._session is not None and not self._session.closed:
             await self._session.close()
 
-    def _normalise_url(self, url: str) -> str:
-        """Return an absolute URL and reject requests outside the wiki origin."""
-        absolute = urljoin(f"{self.base_url}/", url)
-        parsed = urlsplit(absolute)
+        await self._disk_call(lambda disk: disk.close())
+        self._parser.close()
+
+    def concurrency_stats(self) -> LimiterStats:
+        """Return the current adaptive request limit and its counters."""
+        return self._limiter.stats()
+
+    def circuit_stats(self) -> CircuitStats:
+        """Return the upstream circuit breaker state and recent outcomes."""
+        return self._breaker.stats()
+
+    def retry_stats(self) -> RetryStats:
+        """Return first attempts, retries and retries denied by the budget."""
+        return self._retry_budget.stats()
+
+    async def _disk_call(
+        self,
+        operation: Callable[[DiskCache], R],
+    ) -> R | None:
+        """Run a disk-cache operation in a thread, treating failures as misses."""
+        if self._disk_cache is None:
+            return None
+
+        disk_cache = self._disk_cache
 
-        if (parsed.scheme, parsed.netloc) != self._origin:
-            raise ValueError(
-                "Refusing to request a URL outside the configured wiki origin"
+        try:
+            return await asyncio.to_thread(operation, disk_cache)
+        except (sqlite3.Error, OSError, ValueError) as error:
+            logger.warning(
+                "wiki_disk_cache_failed error=%s",
+                type(error).__name__,
             )
+            return None
 
-        return absolute
+    @staticmethod
+    def _wall_time(expires_at: float) -> float:
+        """Convert a monotonic expiry time to a wall-clock timestamp."""
+        return time() + (expires_at - monotonic())
 
     @staticmethod
-    def _is_edit_link(title: str, href: str) -> bool:
-        """Return whether a link points to an edit control rather than an article."""
-        path = urlsplit(href).path.casefold().rstrip("/")
+    def _monotonic_time(expires_at: float) -> float:
+        """Convert a wall-clock expiry timestamp to monotonic time."""
+        return monotonic() + (expires_at - time())
 
-        return (
-            title.casefold() in WikiClient.EDIT_LABELS
-            or "/edit/" in path
-            or path.endswith("/edit")
+    async def _restore_from_disk(self) -> None:
+        """Load the stored link listing and articles once per process."""
+        if self._disk_cache is None or self._disk_restored:
+            return
+
+        self._disk_restored = True
+
+        stored_links = await self._disk_call(
+            lambda disk: disk.load_links(self.all_pages_url)
         )
+        stored_articles = await self._disk_call(
+            lambda disk: disk.load_articles()
+        ) or []
 
-    @staticmethod
-    def _tag_identifier(anchor: object) -> str:
-        """Read Wikidot's full category:value tag from a tag-link href."""
-        href = getattr(anchor, "get", lambda *_: None)("href")
-        if not href:
-            return ""
+        grace_until = monotonic() + self.DISK_RESTORE_GRACE.total_seconds()
+
+        if stored_links and self._links_cache is None:
+            links, expires_at = stored_links
+            self._cache_links(
+                links,
+                max(self._monotonic_time(expires_at), grace_until),
+            )
 
-        path = urlsplit(href).path
-        marker = "/tag/"
+        for stored in stored_articles:
+            article = Article(
+                title=stored.title,
+                url=stored.url,
+                text=stored.text,
+                tags=stored.tags,
+            )
+            self._search_index.add(article)
+            self._tag_index.add(article)
+            self._update_random_pool(article)
+            self._article_cache.setdefault(
+                stored.url,
+                _CacheEntry(
+                    article,
+                    max(self._monotonic_time(stored.expires_at), grace_until),
+                ),
+            )
 
-        if marker not in path:
-            return ""
+        logger.info(
+            "wiki_disk_cache_restored links=%s articles=%s",
+            len(stored_links[0]) if stored_links else 0,
+            len(stored_articles),
+        )
 
-        return unquote(path.split(marker, 1)[1]).casefold().strip()
+    async def _load_page_from_disk(
+        self,
+        url: str,
+    ) -> _CacheEntry[str] | None:
+        """Promote a stored page, fresh or not, into the memory cache."""
+        stored = await self._disk_call(lambda disk: disk.load_page(url))
 
-    @staticmethod
-    def _prune_cache(
-        cache: dict[str, _CacheEntry[T]],
-        max_entries: int,
-    ) -> None:
-        """Drop expired entries and then oldest entries above the size cap."""
-        now = monotonic()
+        if stored is None:
+            return None
 
-        expired = [
-            key
-            for key, entry in cache.items()
-            if entry.expires_at <= now
-        ]
+        entry = _CacheEntry(
+            stored.html,
+            self._monotonic_time(stored.expires_at),
+            stored.etag,
+            stored.last_modified,
+        )
+        self._page_cache[url] = entry
 
-        for key in expired:
-            cache.pop(key, None)
+        return entry
 
-        overflow = len(cache) - max_entries
+    def _normalise_url(self, url: str) -> str:
+        """Return an absolute URL and reject requests outside the wiki origin."""
+        return _same_origin_url(self.base_url, url)
 
-        if overflow > 0:
-            for key in list(cache)[:overflow]:
-                cache.pop(key, None)
+    _is_edit_link = staticmethod(_is_edit_link)
+    _tag_identifier = staticmethod(_tag_identifier)
 
+    @staticmethod
     def _store_cache(
-        self,
-        cache: dict[str, _CacheEntry[T]],
+        cache: Cache[_CacheEntry[T]],
         key: str,
         value: T,
         ttl: timedelta,
-        max_entries: int,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
     ) -> None:
-        """Store a cache value and keep the cache bounded."""
+        """Store a cache value; the cache evicts to stay within its budget."""
         cache[key] = _CacheEntry(
             value,
             monotonic() + ttl.total_seconds(),
+            etag,
+            last_modified,
         )
-        self._prune_cache(cache, max_entries)
 
-    async def fetch_html(self, url: str) -> str:
-        """Fetch one same-origin page using a short-lived response cache."""
+    def _serve_stale(
+        self,
+        key: str,
+        entry: _CacheEntry[Any] | None,
+        refresh: Callable[[], Awaitable[object]],
+    ) -> bool:
+        """Return whether an expired entry may be served while it refreshes.
+
+        Inside the stale-while-revalidate window one background refresh per
+        key is started and the caller answers from the stale entry.
+        """
+        grace = self.config.stale_while_revalidate
+
+        if entry is None or not grace or not entry.is_fresh(grace):
+            return False
+
+        if key not in self._stale_refreshes:
+            with request_priority(Priority.BACKGROUND):
+                task = asyncio.create_task(
+                    self._refresh_stale(key, refresh),
+                    name=f"castopia-refresh-{key}",
+                )
+            self._stale_refreshes[key] = task
+            task.add_done_callback(
+                lambda _: self._stale_refreshes.pop(key, None)
+            )
+
+        return True
+
+    @staticmethod
+    async def _refresh_stale(
+        key: str,
+        refresh: Callable[[], Awaitable[object]],
+    ) -> None:
+        try:
+            await refresh()
+        except Exception as error:
+            logger.info(
+                "wiki_stale_refresh_failed kind=%s error=%s",
+                key.partition(":")[0],
+                type(error).__name__,
+            )
+
+    def _usable_after_error(self, entry: _CacheEntry[Any] | None) -> bool:
+        """Return whether an entry is inside the stale-if-error window."""
+        grace = self.config.stale_if_error
+        return entry is not None and bool(grace) and entry.is_fresh(grace)
+
+    async def fetch_html(self, url: str, *, refresh: bool = False) -> str:
+        """Fetch one same-origin page using a short-lived response cache.
+
+        ``refresh`` skips a fresh cache entry so the page is downloaded again.
+        """
         url = self._normalise_url(url)
 
-        cached = self._page_cache.get(url)
-        if cached and cached.is_fresh():
+        # Refreshes run on behalf of earlier reads or the crawler, so they do
+        # not count as uses of the entry.
+        cached = (
+            self._page_cache.peek(url) if refresh else self._page_cache.get(url)
+        )
+        if not refresh and cached and cached.is_fresh():
             logger.debug("wiki_fetch cache_hit=true")
             return cached.value
 
-        lock_entry = self._url_locks.get(url)
+        if not refresh and self._serve_stale(
+            f"page:{url}",
+            cached,
+            lambda: self.fetch_html(url, refresh=True),
+        ):
+            logger.debug("wiki_fetch cache_hit=stale")
+            return cached.value
 
-        if lock_entry is None:
-            lock_entry = _UrlLockEntry(asyncio.Lock())
-            self._url_locks[url] = lock_entry
+        async with self._url_lock(url):
+            cached = self._page_cache.peek(url)
 
-        lock_entry.users += 1
+            if cached is None:
+                cached = await self._load_page_from_disk(url)
 
-        try:
-            async with lock_entry.lock:
-                cached = self._page_cache.get(url)
+            if not refresh and cached and cached.is_fresh():
+                logger.debug("wiki_fetch cache_hit=true")
+                return cached.value
 
-                if cached and cached.is_fresh():
-                    logger.debug("wiki_fetch cache_hit=true")
-                    return cached.value
+            try:
+                response = await self._request_html(
+                    url,
+                    validators=cached.validators() if cached else None,
+                )
+            except UpstreamUnavailableError:
+                if refresh or not self._usable_after_error(cached):
+                    raise
+
+                logger.warning("wiki_fetch stale_if_error=true")
+                return cached.value
+
+            if response.not_modified and cached is not None:
+                self._extend_page(url, cached, response)
+                expires_at = self._wall_time(cached.expires_at)
+                await self._disk_call(
+                    lambda disk: disk.touch(url, expires_at)
+                )
+                logger.debug("wiki_fetch cache_hit=false revalidated=true")
+                return cached.value
 
-                html = await self._request_html(url)
+            html = response.body or ""
 
-                self._store_cache(
-                    self._page_cache,
+            self._store_cache(
+                self._page_cache,
+                url,
+                html,
+                self.PAGE_CACHE_TTL,
+                etag=response.etag,
+                last_modified=response.last_modified,
+            )
+            # The body changed, so anything parsed from the old one is stale.
+            self._article_cache.pop(url, None)
+
+            expires_at = time() + self.PAGE_CACHE_TTL.total_seconds()
+            await self._disk_call(
+                lambda disk: disk.save_page(
                     url,
                     html,
-                    self.PAGE_CACHE_TTL,
-                    self.MAX_PAGE_CACHE_ENTRIES,
+                    response.etag,
+                    response.last_modified,
+                    expires_at,
                 )
+            )
 
-                logger.debug("wiki_fetch cache_hit=false")
-                return html
-        finally:
-            lock_entry.users -= 1
+            logger.debug("wiki_fetch cache_hit=false")
+            return html
 
-            if lock_entry.users == 0:
-                self._url_locks.pop(url, None)
+    def _url_lock(self, url: str) -> contextlib.AbstractAsyncContextManager[None]:
+        """Serialise upstream work per URL."""
+        return _keyed_lock(self._url_locks, url)
 
-    async def _request_html(self, url: str) -> str:
-        """Fetch HTML with bounded concurrency, retries and structured errors."""
-        await self.start()
+    def _extend_page(
+        self,
+        url: str,
+        cached: _CacheEntry[str],
+        response: _PageResponse,
+    ) -> None:
+        """Renew a page and its parsed article after a 304 Not Modified."""
+        expires_at = monotonic() + self.PAGE_CACHE_TTL.total_seconds()
+
+        cached.expires_at = expires_at
+        cached.etag = response.etag or cached.etag
+        cached.last_modified = response.last_modified or cached.last_modified
+        self._page_cache[url] = cached
+
+        article = self._article_cache.peek(url)
+        if article is not None:
+            article.expires_at = expires_at
+
+    async def _request_html(
+        self,
+        url: str,
+        *,
+        validators: dict[str, str] | None = None,
+        reader: Callable[[aiohttp.ClientResponse], Awaitable[Any]] | None = None,
+    ) -> _PageResponse[Any]:
+        """Fetch HTML with bounded concurrency, retries and structured errors.
+
+        ``validators`` are sent as conditional request headers; a 304 reply is
+        returned as a response without a body. ``reader`` consumes a successful
+        response instead of buffering it as text and is called again on retry.
+        While the circuit breaker is open, no request is sent and
+        ``UpstreamCircuitOpenError`` is raised at once. Retries draw on a
+        budget shared by all requests; without budget the failure is final.
+        """
+        await self._open_session()
 
         if self._session is None:
             raise UpstreamUnavailableError(
@@ -274,13 +1302,44 @@ class WikiClient:
         last_error: Exception | None = None
 
         for attempt in range(1, self.REQUEST_ATTEMPTS + 1):
+            permit: Permit | None = None
+            reported = False
+            probe = self._breaker.state == HALF_OPEN
+
+            if not self._breaker.allow():
+                raise UpstreamCircuitOpenError(
+                    "Источник временно недоступен. Повторная проверка через "
+                    f"{self._breaker.retry_after():.0f} с."
+                )
+
+            if attempt == 1:
+                self._retry_budget.record_attempt()
+
+            def report(healthy: bool) -> None:
+                """Record the attempt's outcome with the limiter and breaker once."""
+                nonlocal reported
+
+                if reported:
+                    return
+
+                reported = True
+
+                if permit is not None:
+                    if healthy:
+                        permit.succeeded()
+                    else:
+                        permit.overloaded()
+
+                self._breaker.record(healthy)
+
             try:
                 started_at = monotonic()
 
-                async with self._semaphore:
+                async with self._limiter.slot() as permit:
                     async with self._session.get(
                         url,
                         allow_redirects=True,
+                        headers=validators or None,
                     ) as response:
                         elapsed_ms = round(
                             (monotonic() - started_at) * 1000
@@ -293,6 +1352,28 @@ class WikiClient:
                             attempt,
                         )
 
+                        overloaded = (
+                            response.status == 429
+                            or 500 <= response.status < 600
+                        )
+
+                        if (
+                            overloaded
+                            or response.status >= 400
+                            or (response.status == 304 and validators)
+                        ):
+                            # No body is read, so the status is the outcome.
+                            # Otherwise a stalled or truncated body still
+                            # counts as a failure below.
+                            report(not overloaded)
+
+                        if response.status == 304 and validators:
+                            return _PageResponse(
+                                None,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"),
+                            )
+
                         if response.status in {401, 403}:
                             raise UpstreamAccessError(
                                 "Источник не разрешает автоматический доступ. "
@@ -306,7 +1387,10 @@ class WikiClient:
                             )
 
                         if response.status == 429 or 500 <= response.status < 600:
-                            if attempt == self.REQUEST_ATTEMPTS:
+                            if (
+                                attempt == self.REQUEST_ATTEMPTS
+                                or not self._retry_budget.try_retry()
+                            ):
                                 raise UpstreamUnavailableError(
                                     f"Источник временно недоступен "
                                     f"(HTTP {response.status})."
@@ -321,7 +1405,18 @@ class WikiClient:
                             )
 
                         else:
-                            return await response.text(errors="replace")
+                            body = (
+                                await reader(response)
+                                if reader is not None
+                                else await response.text(errors="replace")
+                            )
+                            report(True)
+
+                            return _PageResponse(
+                                body,
+                                response.headers.get("ETag"),
+                                response.headers.get("Last-Modified"),
+                            )
 
                 await asyncio.sleep(delay)
 
@@ -334,6 +1429,7 @@ class WikiClient:
 
             except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
                 last_error = exc
+                report(False)
 
                 logger.warning(
                     "wiki_request_failed attempt=%s error=%s",
@@ -341,13 +1437,23 @@ class WikiClient:
                     type(exc).__name__,
                 )
 
-                if attempt < self.REQUEST_ATTEMPTS:
-                    delay = min(
-                        0.5 * (2 ** (attempt - 1))
-                        + random.random() / 4,
-                        10.0,
-                    )
-                    await asyncio.sleep(delay)
+                if (
+                    attempt == self.REQUEST_ATTEMPTS
+                    or not self._retry_budget.try_retry()
+                ):
+                    break
+
+                delay = min(
+                    0.5 * (2 ** (attempt - 1))
+                    + random.random() / 4,
+                    10.0,
+                )
+                await asyncio.sleep(delay)
+
+            finally:
+                if probe and not reported:
+                    # The probe ended without an outcome; let another one try.
+                    self._breaker.abandon()
 
         raise UpstreamUnavailableError(
             "Не удалось связаться с источником."
@@ -374,58 +1480,220 @@ class WikiClient:
 
     async def all_links(self) -> list[tuple[str, str]]:
         """Return de-duplicated article links from every all-pages listing page."""
-        if self._links_cache and self._links_cache.is_fresh():
-            return list(self._links_cache.value)
+        cached = self._links_cache
+
+        if cached and (
+            cached.is_fresh()
+            or self._serve_stale(
+                "links",
+                cached,
+                lambda: self._load_links(refresh=True),
+            )
+        ):
+            return list(cached.value)
+
+        try:
+            return list(await self._load_links())
+        except UpstreamUnavailableError:
+            if not self._usable_after_error(cached):
+                raise
 
-        first_page = await self.fetch_html(self.all_pages_url)
-        soup = BeautifulSoup(first_page, "lxml")
-        page_content = soup.select_one("#page-content")
+            logger.warning("wiki_links stale_if_error=true")
+            return list(cached.value)
 
-        if page_content is None:
-            raise UpstreamContentError(
-                "Источник вернул страницу списка без блока #page-content. "
-                "Структура сайта могла измениться."
+    async def _load_links(
+        self,
+        *,
+        refresh: bool = False,
+    ) -> tuple[tuple[str, str], ...]:
+        """Download and parse every all-pages listing page into the link cache.
+
+        ``refresh`` downloads the listing pages again instead of reusing
+        cached ones.
+        """
+        first_page = await self.fetch_html(self.all_pages_url, refresh=refresh)
+        first_listing = await self._parser.run(
+            self._backend.listing,
+            first_page,
+            self.base_url,
+            True,
+        )
+        listings = [first_listing]
+        page_urls = [
+            f"{self.all_pages_url}/p/{number}"
+            for number in range(2, first_listing.total_pages + 1)
+        ]
+
+        if page_urls:
+            pages = await self._fetch_in_batches(page_urls, refresh=refresh)
+            listings.extend(
+                await asyncio.gather(
+                    *(
+                        self._parser.run(
+                            self._backend.listing,
+                            html,
+                            self.base_url,
+                        )
+                        for html in pages
+                    )
+                )
             )
 
-        if not page_content.select("div.list-pages-box"):
+        seen: set[str] = set()
+        links: list[tuple[str, str]] = []
+
+        for listing in listings:
+            for title, url in listing.links:
+                if url in seen:
+                    continue
+
+                seen.add(url)
+                links.append((title, url))
+
+        if not links:
             raise UpstreamContentError(
-                "Источник вернул страницу списка без блоков "
-                ".list-pages-box. Структура сайта могла измениться."
+                "Источник вернул страницы списка со структурой "
+                ".list-pages-box, но валидных ссылок на статьи не найдено."
+            )
+
+        listing = self._cache_links(
+            links,
+            self._derived_expiry([self.all_pages_url, *page_urls]),
+        )
+
+        expires_at = self._wall_time(self._links_cache.expires_at)
+        await self._disk_call(
+            lambda disk: disk.save_links(
+                self.all_pages_url,
+                links,
+                expires_at,
             )
+        )
+
+        return listing
+
+    def _derived_expiry(self, urls: Iterable[str]) -> float:
+        """Return when data parsed from the cached pages at ``urls`` expires.
+
+        Parsed data is never fresher than its pages, so a stale page served
+        while it revalidates does not get a new ``LINK_CACHE_TTL``.
+        """
+        expires_at = monotonic() + self.LINK_CACHE_TTL.total_seconds()
+
+        for url in urls:
+            page = self._page_cache.peek(self._normalise_url(url))
+
+            if page is not None:
+                expires_at = min(expires_at, page.expires_at)
+
+        return expires_at
+
+    def _cache_links(
+        self,
+        links: Iterable[tuple[str, str]],
+        expires_at: float,
+    ) -> tuple[tuple[str, str], ...]:
+        """Store the link listing and rebuild the lookups derived from it.
+
+        The listing is a tuple and the index is immutable, so readers share
+        both without copying. Public URLs are normalised here once, so
+        searches do not repeat it for every listed article.
+        """
+        listing = tuple(links)
+        self._links_cache = _CacheEntry(listing, expires_at)
+        self._public_links = self._normalise_links(listing)
+        self._public_urls = tuple(self._public_links)
+        self._random_pool.retain(self._public_links)
+        self._random_ineligible.intersection_update(self._public_links)
+        self._random_unknown = {
+            url
+            for url in self._public_urls
+            if url not in self._random_pool
+            and url not in self._random_ineligible
+        }
+        self._title_index = TitleIndex(
+            (title, url)
+            for title, url in listing
+            if self._is_public_candidate(title, url)
+        )
+
+        return listing
+
+    def _normalise_links(
+        self,
+        links: Iterable[tuple[str, str]],
+    ) -> dict[str, str]:
+        """Map the normalised URLs of public links to their titles."""
+        return {
+            self._normalise_url(url): title
+            for title, url in links
+            if self._is_public_candidate(title, url)
+        }
+
+    async def _listed_articles(self) -> dict[str, str]:
+        """Return public listed URLs mapped to titles for a fresh listing."""
+        if (
+            self._links_cache is None
+            or self._public_links is None
+            or not self._links_cache.is_fresh()
+        ):
+            links = await self.all_links()
+
+            if self._public_links is None:
+                # all_links() did not go through the cache, e.g. in tests.
+                return self._normalise_links(links)
+
+        return self._public_links
 
-        total_pages = self._parse_total_pages(first_page)
-        pages = [first_page]
+    async def _titles(self) -> TitleIndex:
+        """Return the title index for a fresh link listing."""
+        if (
+            self._links_cache is None
+            or self._title_index is None
+            or not self._links_cache.is_fresh()
+        ):
+            links = await self.all_links()
 
-        if total_pages > 1:
-            page_urls = [
-                f"{self.all_pages_url}/p/{number}"
-                for number in range(2, total_pages + 1)
-            ]
-            pages.extend(await self._fetch_in_batches(page_urls))
+            if self._title_index is None:
+                # all_links() did not go through the cache, e.g. in tests.
+                return TitleIndex(
+                    (title, url)
+                    for title, url in links
+                    if self._is_public_candidate(title, url)
+                )
 
-        seen: set[str] = set()
-        links: list[tuple[str, str]] = []
+        return self._title_index
 
-        for html in pages:
-            for title, url in self._parse_list_links(html):
-                if url in seen:
-                    continue
+    async def crawl_targets(
+        self,
+        margin: float,
+    ) -> list[tuple[str, str]]:
+        """Return public links whose article is uncached or expires within ``margin`` seconds.
 
-                seen.add(url)
-                links.append((title, url))
+        The link listing and tag catalogue are refreshed on the way, so they
+        stay warm for interactive commands as well.
+        """
+        links = await self.all_links()
 
-        if not links:
-            raise UpstreamContentError(
-                "Источник вернул страницы списка со структурой "
-                ".list-pages-box, но валидных ссылок на статьи не найдено."
+        try:
+            await self._tag_catalog()
+        except WikiError as error:
+            logger.debug(
+                "wiki_crawl_tag_catalog_failed error=%s",
+                type(error).__name__,
             )
 
-        self._links_cache = _CacheEntry(
-            links,
-            monotonic() + self.LINK_CACHE_TTL.total_seconds(),
-        )
+        deadline = monotonic() + margin
 
-        return list(links)
+        return [
+            (title, url)
+            for title, url in links
+            if self._is_public_candidate(title, url)
+            and (
+                (cached := self._article_cache.peek(url)) is None
+                or cached.expires_at <= deadline
+            )
+        ]
 
     async def _run_bounded(
         self,
@@ -467,20 +1735,27 @@ class WikiClient:
             len(items),
         )
 
-        await asyncio.gather(
-            *(asyncio.create_task(worker()) for _ in range(worker_count))
-        )
+        # Batches queue behind single-article requests from interactive
+        # commands; workers inherit the class when their tasks are created.
+        with request_priority(Priority.BULK):
+            workers = [
+                asyncio.create_task(worker()) for _ in range(worker_count)
+            ]
+
+        await asyncio.gather(*workers)
 
         return results, failures
 
     async def _fetch_in_batches(
         self,
         urls: Iterable[str],
+        *,
+        refresh: bool = False,
     ) -> list[str]:
         """Fetch listing pages concurrently without exceeding the configured limit."""
         results, _ = await self._run_bounded(
             urls,
-            self.fetch_html,
+            lambda url: self.fetch_html(url, refresh=refresh),
             log_label="wiki_fetch_batch",
         )
 
@@ -490,115 +1765,187 @@ class WikiClient:
             if page is not None
         ]
 
-    @staticmethod
-    def _parse_total_pages(html: str) -> int:
-        soup = BeautifulSoup(html, "lxml")
-        pager = soup.find("span", class_="pager-no")
-
-        if not pager:
-            return 1
+    async def get_article(
+        self,
+        title: str,
+        url: str,
+        *,
+        refresh: bool = False,
+    ) -> Article:
+        """Fetch, clean and cache one article."""
+        url = self._normalise_url(url)
 
-        match = re.search(
-            r"(\d+)\s*$",
-            pager.get_text(" ", strip=True),
+        cached = (
+            self._article_cache.peek(url)
+            if refresh
+            else self._article_cache.get(url)
         )
+        if not refresh and cached and cached.is_fresh():
+            return cached.value
 
-        return max(1, int(match.group(1))) if match else 1
+        if not refresh and self._serve_stale(
+            f"article:{url}",
+            cached,
+            lambda: self.get_article(title, url, refresh=True),
+        ):
+            return cached.value
 
-    def _parse_list_links(
-        self,
-        html: str,
-    ) -> list[tuple[str, str]]:
-        """Parse article links from all list-page boxes and omit edit controls."""
-        soup = BeautifulSoup(html, "lxml")
-        scope = soup.select_one("#page-content") or soup
-        links: list[tuple[str, str]] = []
+        try:
+            if self.config.stream_articles:
+                return await self._stream_article(title, url, refresh=refresh)
 
-        for box in scope.select("div.list-pages-box"):
-            for anchor in box.find_all("a", href=True):
-                title = anchor.get_text(" ", strip=True)
-                href = anchor["href"]
+            html = await self.fetch_html(url, refresh=refresh)
+        except UpstreamUnavailableError:
+            if refresh or not self._usable_after_error(cached):
+                raise
 
-                if not title or self._is_edit_link(title, href):
-                    continue
+            logger.warning("wiki_article stale_if_error=true")
+            return cached.value
 
-                try:
-                    links.append(
-                        (
-                            title,
-                            self._normalise_url(href),
-                        )
-                    )
-                except ValueError:
-                    logger.debug(
-                        "wiki_link_skipped reason=off_origin"
-                    )
+        page = self._page_cache.peek(url)
+        if cached and page and not page.is_fresh():
+            # fetch_html fell back to the stale page after an upstream error,
+            # so the article parsed from it still stands.
+            return cached.value
+
+        cached = self._article_cache.peek(url)
+        if cached and cached.is_fresh():
+            # The page was revalidated with a 304, so the parsed article stands.
+            return cached.value
+
+        article = await self._parser.run(
+            self._backend.article,
+            html,
+            title,
+            url,
+        )
 
-        return links
+        await self._remember_article(article)
 
-    async def get_article(
+        return article
+
+    async def _stream_article(
         self,
         title: str,
         url: str,
+        *,
+        refresh: bool = False,
     ) -> Article:
-        """Fetch, clean and cache one article."""
-        url = self._normalise_url(url)
+        """Parse an article while its body downloads, without caching the HTML.
 
-        cached = self._article_cache.get(url)
-        if cached and cached.is_fresh():
-            return cached.value
+        The article cache entry keeps the response validators, so the next
+        refresh can still be answered with a 304.
+        """
+        async with self._url_lock(url):
+            cached = self._article_cache.peek(url)
 
-        html = await self.fetch_html(url)
-        soup = BeautifulSoup(html, "lxml")
-        content = soup.find("div", id="page-content")
+            if not refresh and cached and cached.is_fresh():
+                return cached.value
 
-        if content is None:
-            raise UpstreamContentError(
-                "Источник вернул страницу без блока #page-content. "
-                "Структура сайта могла измениться."
-            )
+            async def read_article(response: aiohttp.ClientResponse) -> Article:
+                stream = _ArticleStream(title, url)
 
-        for element in content.select(
-            "script, style, noscript, .no-style, "
-            ".footnoteref, #side-bar"
-        ):
-            element.decompose()
+                try:
+                    decoder = codecs.getincrementaldecoder(
+                        response.charset or "utf-8"
+                    )(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(
+                        errors="replace"
+                    )
 
-        text = re.sub(
-            r"\s+",
-            " ",
-            content.get_text(" ", strip=True),
-        ).strip()
+                async for chunk in response.content.iter_chunked(
+                    self.STREAM_CHUNK_SIZE
+                ):
+                    stream.feed(decoder.decode(chunk).encode())
 
-        if not text:
-            raise UpstreamContentError(
-                f"Страница '{title}' не содержит доступного текста. "
-                "Возможно, это служебная страница."
+                stream.feed(decoder.decode(b"", final=True).encode())
+                return stream.finish()
+
+            response = await self._request_html(
+                url,
+                validators=cached.validators() if cached else None,
+                reader=read_article,
             )
 
-        tags = frozenset(
-            self._tag_identifier(item)
-            or item.get_text(" ", strip=True).casefold()
-            for item in soup.select("div.page-tags a")
-            if item.get_text(strip=True)
-        )
+            if response.not_modified and cached is not None:
+                cached.expires_at = (
+                    monotonic() + self.PAGE_CACHE_TTL.total_seconds()
+                )
+                cached.etag = response.etag or cached.etag
+                cached.last_modified = (
+                    response.last_modified or cached.last_modified
+                )
+                self._article_cache[url] = cached
 
-        article = Article(
-            title=title,
-            url=url,
-            text=text,
-            tags=tags,
-        )
+                expires_at = self._wall_time(cached.expires_at)
+                await self._disk_call(
+                    lambda disk: disk.touch(url, expires_at)
+                )
+                logger.debug("wiki_stream cache_hit=false revalidated=true")
+                return cached.value
+
+            article = response.body
+            await self._remember_article(
+                article,
+                etag=response.etag,
+                last_modified=response.last_modified,
+            )
 
+            logger.debug("wiki_stream cache_hit=false")
+            return article
+
+    async def _remember_article(
+        self,
+        article: Article,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Cache, index and persist a freshly parsed article."""
         self._store_cache(
             self._article_cache,
-            url,
+            article.url,
             article,
             self.PAGE_CACHE_TTL,
-            self.MAX_ARTICLE_CACHE_ENTRIES,
+            etag=etag,
+            last_modified=last_modified,
+        )
+        self._search_index.add(article)
+        self._tag_index.add(article)
+        self._update_random_pool(article)
+
+        expires_at = time() + self.PAGE_CACHE_TTL.total_seconds()
+        await self._disk_call(
+            lambda disk: disk.save_article(
+                article.title,
+                article.url,
+                article.text,
+                article.tags,
+                expires_at,
+            )
         )
 
-        return article
+    def _update_random_pool(self, article: Article) -> None:
+        """Keep only public, non-system articles with text in the random pool."""
+        if (
+            article.text
+            and not (article.tags & SYSTEM_TAGS)
+            and self._is_public_candidate(article.title, article.url)
+        ):
+            self._random_pool.add(article)
+            self._random_ineligible.discard(article.url)
+        else:
+            self._random_pool.discard(article.url)
+            self._random_ineligible.add(article.url)
+
+        self._random_unknown.discard(article.url)
+
+    def _mark_random_ineligible(self, url: str) -> None:
+        """Record that a listed page no longer exists upstream."""
+        self._random_pool.discard(url)
+        self._random_ineligible.add(url)
+        self._random_unknown.discard(url)
 
     @staticmethod
     def _is_public_candidate(
@@ -657,42 +2004,18 @@ class WikiClient:
         self,
         query: str,
     ) -> Article | None:
-        """Find an article by exact title first, then by partial title match."""
-        normalized = query.casefold().strip()
-
-        if not normalized:
+        """Find an article by exact, partial or word-form title match."""
+        if not query.strip():
             return None
 
-        candidates = [
-            (title, url)
-            for title, url in await self.all_links()
-            if self._is_public_candidate(title, url)
-        ]
-
-        exact = next(
-            (
-                (title, url)
-                for title, url in candidates
-                if title.casefold() == normalized
-            ),
-            None,
-        )
-
-        if exact is None:
-            exact = next(
-                (
-                    (title, url)
-                    for title, url in candidates
-                    if normalized in title.casefold()
-                ),
-                None,
-            )
+        titles = await self._titles()
+        match = titles.find(query)
 
-        if exact is None:
+        if match is None:
             return None
 
         try:
-            return await self.get_article(*exact)
+            return await self.get_article(*match)
         except UpstreamNotFoundError:
             return None
 
@@ -702,73 +2025,172 @@ class WikiClient:
         *,
         limit: int = 25,
     ) -> list[str]:
-        """Return up to ``limit`` public article titles matching a query."""
-        normalized = query.casefold().strip()
+        """Return up to ``limit`` public article titles matching a query.
 
-        if not normalized:
+        Titles starting with the query come first in alphabetical order, then
+        titles with a word starting with it, then other titles containing it,
+        then titles that only resemble it, so typos still get suggestions.
+        """
+        if not query.strip():
             return []
 
-        return [
-            title
-            for title, url in await self.all_links()
-            if (
-                self._is_public_candidate(title, url)
-                and normalized in title.casefold()
-            )
-        ][: max(0, limit)]
+        titles = await self._titles()
+
+        return titles.suggestions(query, max(0, limit))
 
     async def random_article(self) -> Article | None:
-        """Return a random public article, skipping stale or system pages."""
-        candidates = [
-            item
-            for item in await self.all_links()
-            if self._is_public_candidate(*item)
-        ]
+        """Return a random public article, skipping stale or system pages.
+
+        Articles come from a buffer of samples drawn ahead of time in the
+        background; an empty buffer is sampled directly.
+        """
+        try:
+            while self._random_buffer:
+                article = self._random_buffer.popleft()
+
+                if article.url in self._random_pool:
+                    return article
 
-        random.shuffle(candidates)
+            return await self._draw_random_article()
+        finally:
+            self._schedule_random_refill()
+
+    async def _draw_random_article(self) -> Article | None:
+        """Sample an eligible article uniformly from the link listing.
+
+        The pool of eligible articles answers on its own only once it and the
+        known-ineligible URLs cover every public listed page; until then a
+        pool sample would favour the articles that happened to be fetched.
+        """
+        listed = await self._listed_articles()
+
+        if listed is self._public_links:
+            urls, unknown = self._public_urls, self._random_unknown
+        else:
+            # all_links() did not go through the cache, e.g. in tests.
+            urls = tuple(listed)
+            unknown = {
+                url
+                for url in urls
+                if url not in self._random_pool
+                and url not in self._random_ineligible
+            }
+
+        if not unknown:
+            return await self._sample_random_pool()
+
+        for url in random.sample(urls, min(self.RANDOM_ATTEMPTS, len(urls))):
+            if url in self._random_ineligible:
+                continue
 
-        for title, url in candidates[:12]:
             try:
-                article = await self.get_article(title, url)
+                article = await self.get_article(listed[url], url)
             except UpstreamNotFoundError:
+                self._mark_random_ineligible(url)
                 continue
 
-            if article.text and not (article.tags & SYSTEM_TAGS):
+            # A cached article may have been dropped from the pool while its
+            # page was briefly missing from the listing.
+            self._update_random_pool(article)
+
+            if article.url in self._random_pool:
                 return article
 
         return None
 
-    async def _tag_catalog(
-        self,
-    ) -> dict[str, list[_TagReference]]:
+    async def _sample_random_pool(self) -> Article | None:
+        """Load a random pooled article, dropping pages that have vanished."""
+        for _ in range(self.RANDOM_ATTEMPTS):
+            pooled = self._random_pool.choice()
+
+            if pooled is None:
+                return None
+
+            try:
+                article = await self.get_article(pooled.title, pooled.url)
+            except UpstreamNotFoundError:
+                self._mark_random_ineligible(pooled.url)
+                continue
+
+            # Refreshing the article may have made it ineligible.
+            if article.url in self._random_pool:
+                return article
+
+        return None
+
+    def _schedule_random_refill(self) -> None:
+        """Start topping up the random buffer unless it is full or running."""
         if (
-            self._tag_catalog_cache
-            and self._tag_catalog_cache.is_fresh()
+            len(self._random_buffer) >= self.RANDOM_BUFFER_SIZE
+            or (self._random_refill is not None and not self._random_refill.done())
         ):
-            return self._tag_catalog_cache.value
+            return
+
+        with request_priority(Priority.BACKGROUND):
+            self._random_refill = asyncio.create_task(
+                self._refill_random_buffer(),
+                name="castopia-random-refill",
+            )
 
-        html = await self.fetch_html(self.tags_url)
-        soup = BeautifulSoup(html, "lxml")
-        catalog: dict[str, list[_TagReference]] = {}
+    async def _refill_random_buffer(self) -> None:
+        attempts = 0
 
-        for anchor in soup.select("a.tag[href]"):
-            display_name = anchor.get_text(
-                " ",
-                strip=True,
-            ).casefold()
+        while (
+            len(self._random_buffer) < self.RANDOM_BUFFER_SIZE
+            and attempts < self.RANDOM_ATTEMPTS
+        ):
+            attempts += 1
 
-            identifier = self._tag_identifier(anchor)
+            try:
+                article = await self._draw_random_article()
+            except Exception as error:
+                logger.debug(
+                    "wiki_random_refill_failed error=%s",
+                    type(error).__name__,
+                )
+                return
 
-            if not display_name or not identifier:
-                continue
+            if article is None:
+                return
 
-            reference = _TagReference(
-                identifier,
-                self._normalise_url(anchor["href"]),
+            if all(item.url != article.url for item in self._random_buffer):
+                self._random_buffer.append(article)
+
+    async def _tag_catalog(
+        self,
+    ) -> dict[str, list[_TagReference]]:
+        cached = self._tag_catalog_cache
+
+        if cached and (
+            cached.is_fresh()
+            or self._serve_stale(
+                "tags",
+                cached,
+                lambda: self._load_tag_catalog(refresh=True),
             )
+        ):
+            return cached.value
+
+        try:
+            return await self._load_tag_catalog()
+        except UpstreamUnavailableError:
+            if not self._usable_after_error(cached):
+                raise
+
+            logger.warning("wiki_tag_catalog stale_if_error=true")
+            return cached.value
 
-            for key in {display_name, identifier}:
-                catalog.setdefault(key, []).append(reference)
+    async def _load_tag_catalog(
+        self,
+        *,
+        refresh: bool = False,
+    ) -> dict[str, list[_TagReference]]:
+        html = await self.fetch_html(self.tags_url, refresh=refresh)
+        catalog = await self._parser.run(
+            self._backend.tag_catalog,
+            html,
+            self.base_url,
+        )
 
         if not catalog:
             raise UpstreamContentError(
@@ -777,11 +2199,80 @@ class WikiClient:
 
         self._tag_catalog_cache = _CacheEntry(
             catalog,
-            monotonic() + self.LINK_CACHE_TTL.total_seconds(),
+            self._derived_expiry([self.tags_url]),
         )
 
         return catalog
 
+    async def tag_catalog(self) -> dict[str, list[TagFacet]]:
+        """Return catalogue tags grouped by category, most used first.
+
+        Counts come from the tag index, so they cover the articles and tag
+        pages loaded so far; the crawler keeps them complete.
+        """
+        catalog = await self._tag_catalog()
+        identifiers = sorted(
+            {
+                reference.identifier
+                for references in catalog.values()
+                for reference in references
+            }
+        )
+        grouped: dict[str, list[TagFacet]] = {}
+
+        for identifier in identifiers:
+            category, separator, name = identifier.partition(":")
+
+            if not separator:
+                category, name = "", identifier
+
+            grouped.setdefault(category, []).append(
+                TagFacet(
+                    identifier=identifier,
+                    category=category,
+                    name=name,
+                    count=self._tag_index.count(identifier),
+                )
+            )
+
+        for facets in grouped.values():
+            facets.sort(key=lambda facet: (-facet.count, facet.identifier))
+
+        return dict(sorted(grouped.items()))
+
+    async def tag_suggestions(
+        self,
+        query: str,
+        *,
+        limit: int = 25,
+    ) -> list[TagFacet]:
+        """Return catalogue tags matching a partial tag, most used first.
+
+        Tags whose identifier or value starts with the query come before tags
+        that only contain it.
+        """
+        normalized = normalise(query).strip()
+        ranked: list[tuple[int, int, str, TagFacet]] = []
+
+        for facets in (await self.tag_catalog()).values():
+            for facet in facets:
+                identifier = normalise(facet.identifier)
+
+                if not normalized or identifier.startswith(normalized) or (
+                    normalise(facet.name).startswith(normalized)
+                ):
+                    rank = 0
+                elif normalized in identifier:
+                    rank = 1
+                else:
+                    continue
+
+                ranked.append((rank, -facet.count, facet.identifier, facet))
+
+        ranked.sort(key=lambda item: item[:3])
+
+        return [facet for *_, facet in ranked[: max(0, limit)]]
+
     async def _resolve_tags(
         self,
         tags: Iterable[str],
@@ -804,7 +2295,12 @@ class WikiClient:
         self,
         tags: Iterable[str],
     ) -> list[Article]:
-        """Return public articles containing every requested tag."""
+        """Return public articles containing every requested tag.
+
+        Once every listed article is parsed, the answer comes from the tag
+        index alone. Otherwise the tag pages narrow the candidates, and only
+        articles listed on every requested tag page are loaded.
+        """
         raw_tags = [
             tag.strip()
             for tag in tags
@@ -824,43 +2320,21 @@ class WikiClient:
             for reference in references
         }
 
-        html = await self.fetch_html(
-            references[0].url
-        )
-        soup = BeautifulSoup(html, "lxml")
-        scope = soup.select_one("#tagged-pages-list")
-
-        if scope is None:
-            raise UpstreamContentError(
-                "Источник не вернул список страниц для выбранного "
-                "тега. Структура сайта может измениться."
-            )
-
-        candidates: list[tuple[str, str]] = []
-
-        for anchor in scope.select("a[href]"):
-            title = anchor.get_text(" ", strip=True)
-            href = anchor["href"]
-
-            if not title or self._is_edit_link(title, href):
-                continue
-
-            try:
-                candidates.append(
-                    (
-                        title,
-                        self._normalise_url(href),
-                    )
+        if not self._tag_index_complete():
+            await asyncio.gather(
+                *(
+                    self._load_tag_page(reference)
+                    for reference in references
                 )
-            except ValueError:
-                continue
+            )
 
-        if not candidates:
-            return []
+        articles, pending = self._tag_index.match(required)
 
-        articles = await self._get_articles_in_batches(candidates)
+        if pending:
+            await self._get_articles_in_batches(pending)
+            articles, _ = self._tag_index.match(required)
 
-        return [
+        found = [
             article
             for article in articles
             if (
@@ -868,10 +2342,120 @@ class WikiClient:
                     article.title,
                     article.url,
                 )
-                and required.issubset(article.tags)
                 and not (article.tags & SYSTEM_TAGS)
             )
         ]
+        found.sort(key=lambda article: article.title.casefold())
+
+        return found
+
+    def _tag_index_complete(self) -> bool:
+        """Return whether every public listed article is in the tag index."""
+        links = self._links_cache
+
+        return (
+            links is not None
+            and links.is_fresh()
+            and not self._tag_index.missing(
+                url
+                for title, url in links.value
+                if self._is_public_candidate(title, url)
+            )
+        )
+
+    async def _load_tag_page(self, reference: _TagReference) -> None:
+        """Record the links on a tag page unless they were loaded recently."""
+        if self._tag_page_expiry.get(reference.identifier, 0.0) > monotonic():
+            return
+
+        html = await self.fetch_html(reference.url)
+        candidates = await self._parser.run(
+            self._backend.tagged_pages,
+            html,
+            self.base_url,
+        )
+
+        self._tag_index.add_tag_page(
+            reference.identifier,
+            (
+                (title, self._normalise_url(url))
+                for title, url in candidates
+            ),
+        )
+        self._tag_page_expiry[reference.identifier] = self._derived_expiry(
+            [reference.url]
+        )
+
+    async def _index_articles(
+        self,
+        listed: dict[str, str],
+    ) -> int:
+        """Load articles missing from the search index and drop unlisted ones.
+
+        ``listed`` maps normalised public URLs to titles; the indexes are
+        pruned only when it is a different listing from the last call.
+        Loaded articles are indexed here rather than only when they are
+        parsed, because a page dropped while it was briefly unlisted is
+        still in the article cache when it comes back. Articles that failed
+        to load are not retried until the page cache TTL passes, so one
+        broken page does not cost a request on every query.
+        """
+        if listed is not self._retained_links:
+            self._search_index.retain(listed)
+            self._tag_index.retain(listed)
+
+            for url in [
+                url for url in self._index_failures if url not in listed
+            ]:
+                self._index_failures.pop(url, None)
+
+            self._retained_links = listed
+
+        now = monotonic()
+        missing = [
+            (title, url)
+            for url, title in listed.items()
+            if (
+                url not in self._search_index
+                and self._index_failures.get(url, 0.0) <= now
+            )
+        ]
+
+        if not missing:
+            return 0
+
+        async def index_article(item: tuple[str, str]) -> Article:
+            try:
+                return await self.get_article(*item)
+            except Exception:
+                self._index_failures[item[1]] = (
+                    monotonic() + self.PAGE_CACHE_TTL.total_seconds()
+                )
+                raise
+
+        results, failures = await self._run_bounded(
+            missing,
+            index_article,
+            log_label="wiki_index_batch",
+        )
+
+        for article in results:
+            if article is not None:
+                self._search_index.add(article)
+                self._tag_index.add(article)
+                self._update_random_pool(article)
+
+        if not len(self._search_index) and failures:
+            first_error = failures[0]
+
+            if isinstance(first_error, WikiError):
+                raise first_error
+
+            raise UpstreamUnavailableError(
+                "Не удалось загрузить статьи из источника."
+            ) from first_error
+
+        return sum(1 for article in results if article is not None)
 
     async def search_content(
         self,
@@ -879,8 +2463,13 @@ class WikiClient:
         *,
         limit: int = 50,
     ) -> list[Article]:
-        """Search public articles by text and return relevance-ranked results."""
-        normalized = query.casefold().strip()
+        """Search public articles by text and return relevance-ranked results.
+
+        Queries are stemmed, so every word form of a phrase shares one cache
+        entry and one index lookup.
+        """
+        terms = analyse(query)
+        normalized = " ".join(terms)
 
         if not normalized:
             return []
@@ -891,59 +2480,47 @@ class WikiClient:
         if cached and cached.is_fresh():
             return list(cached.value)[:result_limit]
 
-        async with self._full_search_lock:
-            cached = self._search_cache.get(normalized)
+        # Identical queries wait for one computation and then read its cached
+        # result; different queries run side by side and share article
+        # fetches through the per-URL locks.
+        async with _keyed_lock(self._search_locks, normalized):
+            cached = self._search_cache.peek(normalized)
 
             if cached and cached.is_fresh():
                 return list(cached.value)[:result_limit]
 
             started_at = monotonic()
 
-            candidates = [
-                item
-                for item in await self.all_links()
-                if self._is_public_candidate(*item)
-            ]
-
-            articles = await self._get_articles_in_batches(candidates)
+            listed = await self._listed_articles()
+            articles_loaded = await self._index_articles(listed)
 
-            found = [
-                article
-                for article in articles
-                if (
-                    normalized in article.text.casefold()
-                    and not (article.tags & SYSTEM_TAGS)
-                )
+            hits = [
+                hit
+                for hit in self._search_index.search_terms(terms)
+                if not (hit.article.tags & SYSTEM_TAGS)
             ]
 
-            def relevance(article: Article) -> int:
-                score = article.text.casefold().count(normalized)
-
-                if normalized in article.title.casefold():
-                    score += 10
-
-                return score
-
-            found.sort(
-                key=lambda article: (
-                    -relevance(article),
-                    article.title.casefold(),
+            hits.sort(
+                key=lambda hit: (
+                    -hit.score,
+                    hit.article.title.casefold(),
                 )
             )
 
+            found = [hit.article for hit in hits]
+
             self._store_cache(
                 self._search_cache,
                 normalized,
                 found,
                 self.SEARCH_CACHE_TTL,
-                self.MAX_SEARCH_CACHE_ENTRIES,
             )
 
             logger.info(
                 "wiki_search cache_hit=false query_length=%s "
                 "articles_loaded=%s result_count=%s duration_ms=%s",
                 len(normalized),
-                len(articles),
+                articles_loaded,
                 len(found),
                 round(
                     (monotonic() - started_at) * 1000
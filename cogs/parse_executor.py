@@ -0,0 +1,97 @@
+"""Executor abstraction that keeps CPU-bound HTML parsing off the event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+PARSE_MODES = frozenset({"process", "thread"})
+
+
+class ParseExecutor:
+    """Run parser functions inline, in a thread pool or in a process pool.
+
+    Process mode requires module-level functions with picklable arguments and
+    results. Zero workers runs parsers inline on the event loop.
+    """
+
+    def __init__(self, mode: str = "process", workers: int = 0) -> None:
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unsupported parse executor mode: {mode}")
+
+        self.mode = mode
+        self.workers = max(0, workers)
+        self._executor: Executor | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # Forking a process with running event-loop threads is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers,
+                    thread_name_prefix="castopia-parse",
+                )
+
+            logger.info(
+                "wiki_parse_executor_started mode=%s workers=%s",
+                self.mode,
+                self.workers,
+            )
+
+        return self._executor
+
+    async def run(self, function: Callable[..., R], *args: Any) -> R:
+        """Run ``function(*args)`` on the configured executor.
+
+        A process pool that broke, for example because a worker was killed,
+        is replaced and the call is retried once on the new pool.
+        """
+        if not self.workers:
+            return function(*args)
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(function, *args)
+        executor = self._get_executor()
+
+        try:
+            return await loop.run_in_executor(executor, call)
+        except BrokenProcessPool:
+            logger.warning("wiki_parse_executor_broken retry=true")
+            self._discard(executor)
+
+        executor = self._get_executor()
+
+        try:
+            return await loop.run_in_executor(executor, call)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise
+
+    def _discard(self, executor: Executor) -> None:
+        """Drop a broken pool unless another call has already replaced it."""
+        if self._executor is executor:
+            self._executor = None
+
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self) -> None:
+        """Stop the worker pool without waiting for queued parses."""
+        executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,67 @@
+"""Constant-time random sampling over articles eligible for /randompage.
+
+Articles are kept in a list with a URL → position map. Removal swaps the last
+article into the freed slot, so adding, removing and sampling never scan the
+pool. Eligibility is decided by the caller when an article is (re)parsed.
+"""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .page_parsing import Article
+
+
+class RandomPool:
+    """Unordered article set with O(1) add, discard and random choice."""
+
+    def __init__(self) -> None:
+        self._articles: list[Article] = []
+        self._positions: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._positions
+
+    def add(self, article: Article) -> None:
+        """Add an article, replacing an earlier version with the same URL."""
+        position = self._positions.get(article.url)
+
+        if position is not None:
+            self._articles[position] = article
+            return
+
+        self._positions[article.url] = len(self._articles)
+        self._articles.append(article)
+
+    def discard(self, url: str) -> None:
+        """Remove the article with ``url`` if it is in the pool."""
+        position = self._positions.pop(url, None)
+
+        if position is None:
+            return
+
+        last = self._articles.pop()
+
+        if position < len(self._articles):
+            self._articles[position] = last
+            self._positions[last.url] = position
+
+    def retain(self, urls: Iterable[str]) -> None:
+        """Remove every article whose URL is not in ``urls``."""
+        keep = set(urls)
+
+        for url in [url for url in self._positions if url not in keep]:
+            self.discard(url)
+
+    def choice(self) -> Article | None:
+        """Return a uniformly random article, or nothing if the pool is empty."""
+        if not self._articles:
+            return None
+
+        return self._articles[random.randrange(len(self._articles))]
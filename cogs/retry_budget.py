@@ -0,0 +1,69 @@
+"""Token-bucket retry budget shared by every upstream request.
+
+Each first attempt adds ``RATIO`` of a token and each retry spends one, so
+over time retries stay below that share of first attempts however many
+requests fail together. The bucket holds at most ``MAX_TOKENS``, which lets
+an otherwise quiet client retry a few isolated failures.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class RetryStats:
+    """Request counts that show how much load retries add."""
+
+    first_attempts: int
+    retries: int
+    denied_retries: int
+    tokens: float
+
+    @property
+    def amplification(self) -> float:
+        """Return all attempts per first attempt; 1.0 means no retries."""
+        if not self.first_attempts:
+            return 1.0
+
+        return (self.first_attempts + self.retries) / self.first_attempts
+
+
+class RetryBudget:
+    """Allow retries only while they stay a small share of first attempts."""
+
+    RATIO = 0.1
+    MAX_TOKENS = 10
+    # Tokens are counted in thousandths so deposits add up exactly.
+    _SCALE = 1000
+
+    def __init__(self) -> None:
+        self._deposit = round(self.RATIO * self._SCALE)
+        self._capacity = self.MAX_TOKENS * self._SCALE
+        self._tokens = self._capacity
+        self._first_attempts = 0
+        self._retries = 0
+        self._denied = 0
+
+    def stats(self) -> RetryStats:
+        return RetryStats(
+            first_attempts=self._first_attempts,
+            retries=self._retries,
+            denied_retries=self._denied,
+            tokens=self._tokens / self._SCALE,
+        )
+
+    def record_attempt(self) -> None:
+        """Record a first attempt and earn part of a retry."""
+        self._first_attempts += 1
+        self._tokens = min(self._capacity, self._tokens + self._deposit)
+
+    def try_retry(self) -> bool:
+        """Spend a token for a retry, or return ``False`` if none is left."""
+        if self._tokens < self._SCALE:
+            self._denied += 1
+            return False
+
+        self._tokens -= self._SCALE
+        self._retries += 1
+        return True
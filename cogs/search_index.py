@@ -0,0 +1,267 @@
+"""In-memory inverted full-text index over parsed wiki articles.
+
+Matches are ranked with BM25F: term frequencies from the title, tag and body
+fields are weighted and length-normalised per field, then saturated once per
+term. Document lengths and document frequencies are maintained on every add
+and remove, so a query only reads postings and stored statistics.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from .normalisation import analyse
+
+if TYPE_CHECKING:
+    from .page_parsing import Article
+
+FIELDS = ("title", "tags", "body")
+
+# How much one occurrence in each field counts compared to the body.
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "body": 1.0}
+
+# Per-field length normalisation; titles and tag lists are short and similar.
+FIELD_LENGTH_NORMALISATION = {"title": 0.3, "tags": 0.0, "body": 0.75}
+
+# Term frequency saturation.
+BM25_K1 = 1.2
+
+
+@dataclass(slots=True)
+class _Document:
+    article: Article
+    # Term frequencies of the short fields; body frequencies live in postings.
+    field_terms: dict[str, Counter[str]]
+    lengths: dict[str, int]
+    terms: frozenset[str]
+
+
+@dataclass(frozen=True, slots=True)
+class SearchHit:
+    article: Article
+    score: float
+
+
+class SearchIndex:
+    """Map terms to per-article positions so phrase queries avoid text scans."""
+
+    def __init__(self) -> None:
+        self._doc_ids: dict[str, int] = {}
+        self._documents: dict[int, _Document] = {}
+        self._postings: dict[str, dict[int, list[int]]] = {}
+        self._doc_freq: Counter[str] = Counter()
+        self._total_lengths: Counter[str] = Counter()
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._doc_ids
+
+    def urls(self) -> set[str]:
+        """Return the URLs of every indexed article."""
+        return set(self._doc_ids)
+
+    def add(self, article: Article) -> None:
+        """Index an article, replacing any previous version with the same URL.
+
+        Re-adding an unchanged article keeps its analysed terms, so refreshed
+        pages are only tokenised and stemmed when their content changes.
+        """
+        doc_id = self._doc_ids.get(article.url)
+
+        if doc_id is not None:
+            document = self._documents[doc_id]
+
+            if document.article == article:
+                document.article = article
+                return
+
+        self.remove(article.url)
+
+        doc_id = self._next_id
+        self._next_id += 1
+
+        tokens = analyse(article.text)
+        positions: dict[str, list[int]] = {}
+
+        for position, term in enumerate(tokens):
+            positions.setdefault(term, []).append(position)
+
+        for term, term_positions in positions.items():
+            self._postings.setdefault(term, {})[doc_id] = term_positions
+
+        title_tokens = analyse(article.title)
+        tag_tokens = [
+            token
+            for tag in sorted(article.tags)
+            for token in analyse(tag)
+        ]
+        lengths = {
+            "title": len(title_tokens),
+            "tags": len(tag_tokens),
+            "body": len(tokens),
+        }
+        terms = frozenset(positions).union(title_tokens, tag_tokens)
+
+        self._doc_freq.update(terms)
+        self._total_lengths.update(lengths)
+
+        self._doc_ids[article.url] = doc_id
+        self._documents[doc_id] = _Document(
+            article=article,
+            field_terms={
+                "title": Counter(title_tokens),
+                "tags": Counter(tag_tokens),
+            },
+            lengths=lengths,
+            terms=terms,
+        )
+
+    def remove(self, url: str) -> None:
+        """Drop an article and its postings from the index."""
+        doc_id = self._doc_ids.pop(url, None)
+
+        if doc_id is None:
+            return
+
+        document = self._documents.pop(doc_id)
+
+        self._doc_freq.subtract(document.terms)
+        self._total_lengths.subtract(document.lengths)
+
+        for term in document.terms:
+            if self._doc_freq[term] <= 0:
+                del self._doc_freq[term]
+
+            postings = self._postings.get(term)
+
+            if postings is None:
+                continue
+
+            postings.pop(doc_id, None)
+
+            if not postings:
+                self._postings.pop(term, None)
+
+    def retain(self, urls: Iterable[str]) -> None:
+        """Drop every indexed article whose URL is not in ``urls``."""
+        keep = set(urls)
+
+        for url in [url for url in self._doc_ids if url not in keep]:
+            self.remove(url)
+
+    def search(self, query: str) -> list[SearchHit]:
+        """Return articles whose text contains the query phrase, BM25F-ranked."""
+        return self.search_terms(analyse(query))
+
+    def search_terms(self, terms: list[str]) -> list[SearchHit]:
+        """Search for an already analysed query phrase."""
+        if not terms:
+            return []
+
+        term_postings = []
+
+        for term in terms:
+            postings = self._postings.get(term)
+
+            if not postings:
+                return []
+
+            term_postings.append(postings)
+
+        # Intersect starting from the rarest term to keep the candidate set small.
+        candidates = set(min(term_postings, key=len))
+
+        for postings in term_postings:
+            candidates.intersection_update(postings)
+
+            if not candidates:
+                return []
+
+        hits: list[SearchHit] = []
+        query_terms = Counter(terms)
+        idf = {term: self._idf(term) for term in query_terms}
+        average_lengths = self._average_lengths()
+
+        for doc_id in candidates:
+            if not self._phrase_count(term_postings, doc_id):
+                continue
+
+            document = self._documents[doc_id]
+            norms = {
+                field: 1.0
+                - FIELD_LENGTH_NORMALISATION[field]
+                + FIELD_LENGTH_NORMALISATION[field]
+                * document.lengths[field]
+                / average_lengths[field]
+                for field in FIELDS
+            }
+            score = 0.0
+
+            for term, count in query_terms.items():
+                weighted = sum(
+                    FIELD_WEIGHTS[field]
+                    * self._term_frequency(document, doc_id, field, term)
+                    / norms[field]
+                    for field in FIELDS
+                )
+                score += count * idf[term] * weighted / (BM25_K1 + weighted)
+
+            hits.append(SearchHit(document.article, score))
+
+        return hits
+
+    def _idf(self, term: str) -> float:
+        documents = len(self._documents)
+        frequency = self._doc_freq[term]
+
+        return math.log(1.0 + (documents - frequency + 0.5) / (frequency + 0.5))
+
+    def _average_lengths(self) -> dict[str, float]:
+        documents = len(self._documents) or 1
+
+        # Empty fields fall back to 1 so the normalisation never divides by 0.
+        return {
+            field: (self._total_lengths[field] / documents) or 1.0
+            for field in FIELDS
+        }
+
+    def _term_frequency(
+        self,
+        document: _Document,
+        doc_id: int,
+        field: str,
+        term: str,
+    ) -> int:
+        if field == "body":
+            return len(self._postings.get(term, {}).get(doc_id, ()))
+
+        return document.field_terms[field][term]
+
+    @staticmethod
+    def _phrase_count(
+        term_postings: list[dict[int, list[int]]],
+        doc_id: int,
+    ) -> int:
+        """Count positions where every query term follows the previous one."""
+        first, *rest = term_postings
+
+        if not rest:
+            return len(first[doc_id])
+
+        following = [set(postings[doc_id]) for postings in rest]
+
+        return sum(
+            1
+            for start in first[doc_id]
+            if all(
+                start + offset in positions
+                for offset, positions in enumerate(following, start=1)
+            )
+        )
@@ -0,0 +1,183 @@
+"""Tag → article index with integer bitsets for multi-tag queries.
+
+Every known URL gets a small, reused integer id, and each tag maps to a
+Python ``int`` whose set bits are the ids carrying that tag. A multi-tag query
+is then a bitwise AND of a few integers instead of a fetch per candidate.
+
+Tags come from two sources. Parsed articles are authoritative for their own
+URL. Wikidot tag pages list URLs whose articles have not been parsed yet;
+those bits only count until the article itself is indexed.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .page_parsing import Article
+
+
+def _ids(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class TagIndex:
+    """Map tag identifiers to bitsets of article ids."""
+
+    def __init__(self) -> None:
+        self._ids: dict[str, int] = {}
+        self._urls: list[str | None] = []
+        self._titles: list[str] = []
+        self._articles: list[Article | None] = []
+        self._free: list[int] = []
+
+        self._article_bits: dict[str, int] = {}
+        self._page_bits: dict[str, int] = {}
+        # Ids whose article is parsed, so only article tags count for them.
+        self._known = 0
+
+    def __len__(self) -> int:
+        """Return how many parsed articles are indexed."""
+        return self._known.bit_count()
+
+    def _id(self, title: str, url: str) -> int:
+        doc_id = self._ids.get(url)
+
+        if doc_id is not None:
+            return doc_id
+
+        if self._free:
+            doc_id = self._free.pop()
+            self._urls[doc_id] = url
+            self._titles[doc_id] = title
+        else:
+            doc_id = len(self._urls)
+            self._urls.append(url)
+            self._titles.append(title)
+            self._articles.append(None)
+
+        self._ids[url] = doc_id
+        return doc_id
+
+    def add(self, article: Article) -> None:
+        """Index a parsed article, replacing the tags of an earlier version."""
+        doc_id = self._id(article.title, article.url)
+        bit = 1 << doc_id
+        previous = self._articles[doc_id]
+
+        if previous is not None:
+            _clear(self._article_bits, previous.tags, bit)
+
+        for tag in article.tags:
+            self._article_bits[tag] = self._article_bits.get(tag, 0) | bit
+
+        self._articles[doc_id] = article
+        self._titles[doc_id] = article.title
+        self._known |= bit
+
+    def add_tag_page(
+        self,
+        tag: str,
+        candidates: Iterable[tuple[str, str]],
+    ) -> None:
+        """Record the URLs a tag page lists, replacing the previous listing."""
+        bits = 0
+
+        for title, url in candidates:
+            bits |= 1 << self._id(title, url)
+
+        self._page_bits[tag] = bits
+
+    def remove(self, url: str) -> None:
+        """Forget a URL, its article and every tag bit it carries."""
+        doc_id = self._ids.pop(url, None)
+
+        if doc_id is None:
+            return
+
+        bit = 1 << doc_id
+        article = self._articles[doc_id]
+
+        if article is not None:
+            _clear(self._article_bits, article.tags, bit)
+
+        _clear(self._page_bits, list(self._page_bits), bit)
+
+        self._known &= ~bit
+        self._urls[doc_id] = None
+        self._titles[doc_id] = ""
+        self._articles[doc_id] = None
+        self._free.append(doc_id)
+
+    def retain(self, urls: Iterable[str]) -> None:
+        """Forget every URL that is not in ``urls``."""
+        keep = set(urls)
+
+        for url in [url for url in self._ids if url not in keep]:
+            self.remove(url)
+
+    def count(self, tag: str) -> int:
+        """Return how many indexed or tag-page-listed URLs carry ``tag``."""
+        return (
+            self._article_bits.get(tag, 0)
+            | (self._page_bits.get(tag, 0) & ~self._known)
+        ).bit_count()
+
+    def missing(self, urls: Iterable[str]) -> bool:
+        """Return whether any of ``urls`` has no parsed article yet."""
+        return any(
+            (doc_id := self._ids.get(url)) is None
+            or not self._known >> doc_id & 1
+            for url in urls
+        )
+
+    def match(
+        self,
+        tags: Iterable[str],
+    ) -> tuple[list[Article], list[tuple[str, str]]]:
+        """Return parsed articles with every tag and unparsed candidate links.
+
+        Unparsed candidates come from tag pages only; their articles still
+        have to be loaded to confirm the remaining tags.
+        """
+        bits = -1
+
+        for tag in tags:
+            bits &= self._article_bits.get(tag, 0) | (
+                self._page_bits.get(tag, 0) & ~self._known
+            )
+
+            if not bits:
+                return [], []
+
+        if bits == -1:
+            return [], []
+
+        articles: list[Article] = []
+        pending: list[tuple[str, str]] = []
+
+        for doc_id in _ids(bits):
+            article = self._articles[doc_id]
+            url = self._urls[doc_id]
+
+            if article is not None:
+                articles.append(article)
+            elif url is not None:
+                pending.append((self._titles[doc_id], url))
+
+        return articles, pending
+
+
+def _clear(bitsets: dict[str, int], tags: Iterable[str], bit: int) -> None:
+    for tag in tags:
+        bits = bitsets.get(tag, 0) & ~bit
+
+        if bits:
+            bitsets[tag] = bits
+        else:
+            bitsets.pop(tag, None)
@@ -5,23 +5,27 @@ from __future__ import annotations
 import html
 import logging
 import secrets
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from time import monotonic
+from typing import Any
 
 from aiogram import F, Router, types
 from aiogram.filters import Command
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
+from .limiter import requester
 from .page_parsing import (
     Article,
+    TagFacet,
     UpstreamAccessError,
     UpstreamContentError,
     UpstreamNotFoundError,
     UpstreamUnavailableError,
-    WikiClient,
     WikiError,
 )
 from .txt_processing import excerpt, highlight_html
+from .wiki_service import WikiBackend
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +36,7 @@ MAX_QUERY_LENGTH = 160
 MAX_TAGS = 5
 MAX_TAG_RESULTS = 30
 MAX_MESSAGE_LENGTH = 4096
+MAX_PICKER_TAGS = 24
 
 
 @dataclass(slots=True)
@@ -103,6 +108,65 @@ class _SearchStore:
             self._items.pop(token, None)
 
 
+@dataclass(slots=True)
+class _TagPickerState:
+    owner_id: int
+    categories: list[tuple[str, list[TagFacet]]]
+    expires_at: float
+
+    def is_expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+
+class _TagPickerStore:
+    """Tag catalogue snapshots behind picker buttons.
+
+    Callback data is limited to 64 bytes, so buttons carry indexes into the
+    snapshot instead of Cyrillic tag identifiers.
+    """
+
+    def __init__(self) -> None:
+        self._items: dict[str, _TagPickerState] = {}
+
+    def save(
+        self,
+        owner_id: int,
+        catalog: dict[str, list[TagFacet]],
+    ) -> str:
+        self._prune()
+
+        token = secrets.token_urlsafe(6)
+        self._items[token] = _TagPickerState(
+            owner_id=owner_id,
+            categories=list(catalog.items()),
+            expires_at=monotonic() + PENDING_INPUT_TTL_SECONDS,
+        )
+        return token
+
+    def get(self, token: str) -> _TagPickerState | None:
+        state = self._items.get(token)
+
+        if state is None:
+            return None
+
+        if state.is_expired(monotonic()):
+            self._items.pop(token, None)
+            return None
+
+        return state
+
+    def _prune(self) -> None:
+        now = monotonic()
+        expired_tokens = [
+            token
+            for token, state in self._items.items()
+            if state.is_expired(now)
+        ]
+
+        for token in expired_tokens:
+            self._items.pop(token, None)
+
+
 class _PendingInputStore:
     """Per-user, per-chat short-lived state for interactive commands."""
 
@@ -268,6 +332,59 @@ def _render_search_page(
     return "\n\n".join(lines)[:MAX_MESSAGE_LENGTH]
 
 
+def _category_keyboard(
+    token: str,
+    state: _TagPickerState,
+) -> InlineKeyboardMarkup:
+    """Build one button per tag category with its article count."""
+    buttons = [
+        InlineKeyboardButton(
+            text=(
+                f"{category or 'без категории'} "
+                f"({sum(facet.count for facet in facets)})"
+            ),
+            callback_data=f"t:{token}:c:{index}",
+        )
+        for index, (category, facets) in enumerate(state.categories)
+    ]
+
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            buttons[start : start + 2]
+            for start in range(0, len(buttons), 2)
+        ]
+    )
+
+
+def _tag_keyboard(
+    token: str,
+    category_index: int,
+    facets: list[TagFacet],
+) -> InlineKeyboardMarkup:
+    """Build buttons for the most used tags of one category."""
+    buttons = [
+        InlineKeyboardButton(
+            text=f"{facet.name} ({facet.count})",
+            callback_data=f"t:{token}:t:{category_index}:{index}",
+        )
+        for index, facet in enumerate(facets[:MAX_PICKER_TAGS])
+    ]
+    rows = [
+        buttons[start : start + 2]
+        for start in range(0, len(buttons), 2)
+    ]
+    rows.append(
+        [
+            InlineKeyboardButton(
+                text="← Категории",
+                callback_data=f"t:{token}:b",
+            )
+        ]
+    )
+
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
 def _wiki_error_text(error: Exception) -> str:
     """Map WikiClient exceptions to user-facing Telegram text."""
     if isinstance(error, UpstreamAccessError):
@@ -360,16 +477,33 @@ async def _safe_edit_message(
     )
 
 
-def create_router(wiki: WikiClient) -> Router:
-    """Create a router bound to one shared, long-lived WikiClient."""
+def create_router(wiki: WikiBackend) -> Router:
+    """Create a router bound to one shared, long-lived wiki client."""
     router = Router(name="castopia")
+
+    async def attribute_requester(
+        handler: Callable[[Any, dict[str, Any]], Awaitable[Any]],
+        event: types.Message | types.CallbackQuery,
+        data: dict[str, Any],
+    ) -> Any:
+        """Queue the update's upstream fetches fairly per Telegram user."""
+        user = event.from_user
+
+        with requester(f"telegram:{user.id}" if user is not None else None):
+            return await handler(event, data)
+
+    router.message.middleware(attribute_requester)
+    router.callback_query.middleware(attribute_requester)
+
     searches = _SearchStore()
     pending_inputs = _PendingInputStore()
+    tag_pickers = _TagPickerStore()
 
     async def request_pending_input(
         message: types.Message,
         action: str,
         prompt: str,
+        reply_markup: InlineKeyboardMarkup | None = None,
     ) -> None:
         """Enter interactive input mode for the current user and chat."""
         if message.from_user is None:
@@ -383,9 +517,35 @@ def create_router(wiki: WikiClient) -> Router:
 
         await message.answer(
             f"{prompt}\n\n"
-            "Для отмены используйте /cancel."
+            "Для отмены используйте /cancel.",
+            reply_markup=reply_markup,
         )
 
+    async def tag_picker(
+        message: types.Message,
+    ) -> InlineKeyboardMarkup | None:
+        """Return a category picker, or nothing when the catalogue fails."""
+        if message.from_user is None:
+            return None
+
+        try:
+            catalog = await wiki.tag_catalog()
+        except Exception as error:
+            logger.warning(
+                "telegram_tag_catalog_failed error=%s",
+                type(error).__name__,
+            )
+            return None
+
+        if not catalog:
+            return None
+
+        token = tag_pickers.save(message.from_user.id, catalog)
+        state = tag_pickers.get(token)
+        assert state is not None
+
+        return _category_keyboard(token, state)
+
     async def execute_search(
         message: types.Message,
         query: str,
@@ -715,7 +875,8 @@ def create_router(wiki: WikiClient) -> Router:
             await request_pending_input(
                 message,
                 "tags",
-                "Введите теги через пробел:",
+                "Введите теги через пробел или выберите тег:",
+                await tag_picker(message),
             )
             return
 
@@ -808,6 +969,78 @@ def create_router(wiki: WikiClient) -> Router:
             state.action,
         )
 
+    @router.callback_query(F.data.startswith("t:"))
+    async def pick_tag(
+        callback: types.CallbackQuery,
+    ) -> None:
+        parts = (callback.data or "").split(":")
+        state = tag_pickers.get(parts[1]) if len(parts) >= 3 else None
+
+        if state is None:
+            await callback.answer(
+                "Список тегов устарел. Отправьте /tags заново.",
+                show_alert=True,
+            )
+            return
+
+        if callback.from_user.id != state.owner_id:
+            await callback.answer(
+                "Этот список тегов открыт другим пользователем.",
+                show_alert=True,
+            )
+            return
+
+        if callback.message is None:
+            await callback.answer(
+                "Сообщение со списком тегов недоступно.",
+                show_alert=True,
+            )
+            return
+
+        token, action = parts[1], parts[2]
+
+        try:
+            indexes = [int(part) for part in parts[3:]]
+
+            if action == "b" and not indexes:
+                await callback.message.edit_reply_markup(
+                    reply_markup=_category_keyboard(token, state),
+                )
+                await callback.answer()
+                return
+
+            if action == "c" and len(indexes) == 1:
+                category, facets = state.categories[indexes[0]]
+                await callback.message.edit_reply_markup(
+                    reply_markup=_tag_keyboard(token, indexes[0], facets),
+                )
+                await callback.answer(category or None)
+                return
+
+            if action == "t" and len(indexes) == 2:
+                facet = state.categories[indexes[0]][1][indexes[1]]
+            else:
+                raise ValueError(action)
+        except (ValueError, IndexError):
+            await callback.answer(
+                "Некорректная кнопка.",
+                show_alert=True,
+            )
+            return
+        except Exception:
+            logger.exception("telegram_tag_picker_failed")
+            return
+
+        pending_inputs.clear(
+            callback.from_user.id,
+            callback.message.chat.id,
+        )
+        await callback.answer()
+        await execute_tags(
+            callback.message,
+            facet.identifier,
+        )
+
     @router.callback_query(F.data.startswith("s:"))
     async def paginate(
         callback: types.CallbackQuery,
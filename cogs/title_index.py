@@ -0,0 +1,227 @@
+"""Immutable lookup structures over the public article titles.
+
+``TitleIndex`` is built once per link-listing refresh and never mutated, so
+concurrent lookups share it without copying. Titles are normalised once.
+Title and word prefixes are answered by binary search over sorted keys,
+other substrings are narrowed with a trigram index and word forms are
+matched through stemmed title words. Typos are ranked by trigram overlap for
+suggestions only, since a similar title is a guess rather than a match.
+"""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Iterator
+
+from .normalisation import analyse, normalise
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the padded word trigrams of normalised text, as pg_trgm does."""
+    grams: set[str] = set()
+
+    for word in _WORD_RE.findall(text):
+        padded = f"  {word} "
+        grams.update(padded[index : index + 3] for index in range(len(word) + 1))
+
+    return frozenset(grams)
+
+
+class TitleIndex:
+    """Exact, substring, word-form and typo-tolerant title lookups."""
+
+    # Share of the query's trigrams a title must contain to count as similar.
+    MIN_SIMILARITY = 0.4
+
+    def __init__(self, links: Iterable[tuple[str, str]]) -> None:
+        self._links = tuple(links)
+        self._folded = tuple(normalise(title).strip() for title, _ in self._links)
+
+        exact: dict[str, int] = {}
+        word_starts: list[tuple[str, int]] = []
+        postings: dict[str, list[int]] = {}
+        stems: dict[str, list[int]] = {}
+        sizes: list[int] = []
+
+        for doc_id, folded in enumerate(self._folded):
+            exact.setdefault(folded, doc_id)
+            word_starts.extend(
+                (folded[match.start() :], doc_id)
+                for match in _WORD_RE.finditer(folded)
+                if match.start() > 0
+            )
+
+            grams = trigrams(folded)
+            sizes.append(len(grams))
+
+            for gram in grams:
+                postings.setdefault(gram, []).append(doc_id)
+
+            for word in set(analyse(folded)):
+                stems.setdefault(word, []).append(doc_id)
+
+        self._exact = exact
+        titles = sorted(
+            (folded, doc_id) for doc_id, folded in enumerate(self._folded)
+        )
+        self._title_keys = tuple(key for key, _ in titles)
+        self._title_ids = tuple(doc_id for _, doc_id in titles)
+        word_starts.sort()
+        self._word_keys = tuple(key for key, _ in word_starts)
+        self._word_ids = tuple(doc_id for _, doc_id in word_starts)
+        self._trigrams = {gram: tuple(ids) for gram, ids in postings.items()}
+        self._trigram_sizes = tuple(sizes)
+        self._stems = {word: frozenset(ids) for word, ids in stems.items()}
+
+    def __len__(self) -> int:
+        return len(self._links)
+
+    def find(self, query: str) -> tuple[str, str] | None:
+        """Return the best title for a query, trying stricter matches first.
+
+        Titles that only resemble the query are left to ``suggestions``.
+        """
+        normalized = normalise(query).strip()
+
+        if not normalized:
+            return None
+
+        doc_id = self._exact.get(normalized)
+
+        if doc_id is None:
+            doc_id = next(self._matching(normalized), None)
+
+        if doc_id is None:
+            doc_id = next(iter(self._word_forms(normalized)), None)
+
+        return self._links[doc_id] if doc_id is not None else None
+
+    def suggestions(self, query: str, limit: int) -> list[str]:
+        """Return titles starting with the query, then titles with a word
+        starting with it, then other substring matches, then similar titles.
+        """
+        normalized = normalise(query).strip()
+
+        if not normalized or limit <= 0:
+            return []
+
+        found: list[int] = []
+        seen: set[int] = set()
+
+        for source in (self._matching, self._similar):
+            for doc_id in source(normalized):
+                if doc_id in seen:
+                    continue
+
+                seen.add(doc_id)
+                found.append(doc_id)
+
+                if len(found) >= limit:
+                    return [self._links[doc_id][0] for doc_id in found]
+
+        return [self._links[doc_id][0] for doc_id in found]
+
+    def _matching(self, normalized: str) -> Iterator[int]:
+        """Yield ids of titles containing the query, best placed match first.
+
+        Prefix matches come out of the sorted keys in alphabetical order, so
+        a caller that needs a few suggestions stops after a few steps.
+        """
+        seen: set[int] = set()
+
+        for keys, ids in (
+            (self._title_keys, self._title_ids),
+            (self._word_keys, self._word_ids),
+        ):
+            for doc_id in _prefixed(keys, ids, normalized):
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    yield doc_id
+
+        for doc_id in self._containing(normalized):
+            if doc_id not in seen:
+                seen.add(doc_id)
+                yield doc_id
+
+    def _containing(self, normalized: str) -> list[int]:
+        """Return ids of titles containing the query, in listing order."""
+        grams = trigrams(normalized)
+        # Padding makes the first and last trigrams word boundaries, which a
+        # substring in the middle of a word would not satisfy.
+        inner = {gram for gram in grams if " " not in gram}
+
+        if not inner:
+            candidates: Iterable[int] = range(len(self._folded))
+        else:
+            smallest = min(
+                (self._trigrams.get(gram, ()) for gram in inner),
+                key=len,
+            )
+            candidates = smallest
+
+        return [
+            doc_id
+            for doc_id in candidates
+            if normalized in self._folded[doc_id]
+        ]
+
+    def _word_forms(self, normalized: str) -> list[int]:
+        """Return ids of titles containing every stemmed query word."""
+        words = set(analyse(normalized))
+
+        if not words:
+            return []
+
+        matches: frozenset[int] | None = None
+
+        for word in words:
+            ids = self._stems.get(word, frozenset())
+            matches = ids if matches is None else matches & ids
+
+            if not matches:
+                return []
+
+        return sorted(matches or ())
+
+    def _similar(self, normalized: str) -> list[int]:
+        """Return ids of titles sharing most query trigrams, best first."""
+        grams = trigrams(normalized)
+
+        if not grams:
+            return []
+
+        shared: Counter[int] = Counter()
+
+        for gram in grams:
+            shared.update(self._trigrams.get(gram, ()))
+
+        required = self.MIN_SIMILARITY * len(grams)
+        ranked = [
+            (
+                -count,
+                -count / (len(grams) + self._trigram_sizes[doc_id] - count),
+                doc_id,
+            )
+            for doc_id, count in shared.items()
+            if count >= required
+        ]
+        ranked.sort()
+
+        return [doc_id for *_, doc_id in ranked]
+
+
+def _prefixed(
+    keys: tuple[str, ...],
+    ids: tuple[int, ...],
+    prefix: str,
+) -> Iterator[int]:
+    """Yield ids whose sorted key starts with ``prefix``."""
+    index = bisect_left(keys, prefix)
+
+    while index < len(keys) and keys[index].startswith(prefix):
+        yield ids[index]
+        index += 1
@@ -5,6 +5,8 @@ from __future__ import annotations
 import html
 import re
 
+from .normalisation import analyse
+
 _SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?…])\s+")
 _WHITESPACE_RE = re.compile(r"\s+")
 _DISCORD_MARKDOWN_RE = re.compile(r"([\\`*_{}\[\]<>])")
@@ -27,9 +29,21 @@ def excerpt(text: str, query: str, *, limit: int = 280) -> str:
             for sentence in sentences
             if needle and needle in sentence.casefold()
         ),
-        sentences[0],
+        None,
     )
 
+    if selected is None:
+        # Full-text search matches word forms, so fall back to stems.
+        stems = set(analyse(query))
+        selected = next(
+            (
+                sentence
+                for sentence in sentences
+                if stems and stems.issubset(analyse(sentence))
+            ),
+            sentences[0],
+        )
+
     if len(selected) <= limit:
         return selected
 
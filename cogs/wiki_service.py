@@ -0,0 +1,335 @@
+"""Local Unix-socket service that lets both bots share one WikiClient.
+
+The service process owns the only WikiClient, so pages are crawled, parsed and
+cached once and all upstream requests share one concurrency budget. Adapters
+talk to it through ``RemoteWikiClient``, which mirrors the public WikiClient
+methods they use. Each call opens one connection and exchanges one JSON line.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from .constants import WikiConfig
+from .limiter import current_requester, requester
+from .page_parsing import (
+    Article,
+    TagFacet,
+    UpstreamAccessError,
+    UpstreamCircuitOpenError,
+    UpstreamContentError,
+    UpstreamNotFoundError,
+    UpstreamUnavailableError,
+    WikiClient,
+    WikiError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Full-text results carry whole article texts, so allow large JSON lines.
+MAX_MESSAGE_BYTES = 32 * 1024 * 1024
+
+_ERRORS: dict[str, type[WikiError]] = {
+    error.__name__: error
+    for error in (
+        WikiError,
+        UpstreamAccessError,
+        UpstreamCircuitOpenError,
+        UpstreamContentError,
+        UpstreamNotFoundError,
+        UpstreamUnavailableError,
+    )
+}
+
+_METHODS = frozenset(
+    {
+        "find_by_title",
+        "title_suggestions",
+        "random_article",
+        "find_by_tags",
+        "search_content",
+        "tag_catalog",
+        "tag_suggestions",
+    }
+)
+
+
+def _encode(value: object) -> object:
+    if isinstance(value, Article):
+        return {
+            "title": value.title,
+            "url": value.url,
+            "text": value.text,
+            "tags": sorted(value.tags),
+        }
+
+    if isinstance(value, TagFacet):
+        return {
+            "identifier": value.identifier,
+            "category": value.category,
+            "name": value.name,
+            "count": value.count,
+        }
+
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _encode(item) for key, item in value.items()}
+
+    return value
+
+
+def _decode_article(value: dict[str, Any]) -> Article:
+    return Article(
+        title=value["title"],
+        url=value["url"],
+        text=value["text"],
+        tags=frozenset(value["tags"]),
+    )
+
+
+def _decode_tag(value: dict[str, Any]) -> TagFacet:
+    return TagFacet(
+        identifier=value["identifier"],
+        category=value["category"],
+        name=value["name"],
+        count=value["count"],
+    )
+
+
+class WikiService:
+    """Serve one WikiClient to local adapters over a Unix socket."""
+
+    def __init__(self, client: WikiClient, socket_path: str | Path) -> None:
+        self.client = client
+        self.socket_path = Path(socket_path)
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """Start the client and listen on the socket, replacing a stale file."""
+        await self.client.start()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+        self._server = await asyncio.start_unix_server(
+            self._handle,
+            path=str(self.socket_path),
+            limit=MAX_MESSAGE_BYTES,
+        )
+        os.chmod(self.socket_path, 0o600)
+
+        logger.info("wiki_service_listening path=%s", self.socket_path)
+
+    async def serve_forever(self) -> None:
+        if self._server is None:
+            await self.start()
+
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+        await self.client.close()
+
+    async def _handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        try:
+            line = await reader.readline()
+
+            if not line:
+                return
+
+            response = await self._dispatch(line)
+            writer.write(
+                json.dumps(response, ensure_ascii=False).encode() + b"\n"
+            )
+            await writer.drain()
+        except (ConnectionError, ValueError) as error:
+            logger.debug(
+                "wiki_service_connection_failed error=%s",
+                type(error).__name__,
+            )
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _dispatch(self, line: bytes) -> dict[str, object]:
+        try:
+            request = json.loads(line)
+            method = request["method"]
+            args = list(request.get("args", []))
+            kwargs = dict(request.get("kwargs", {}))
+            owner = str(request.get("requester") or "")
+        except (ValueError, KeyError, TypeError):
+            return {
+                "ok": False,
+                "error": WikiError.__name__,
+                "message": "Malformed wiki service request.",
+            }
+
+        if method not in _METHODS:
+            return {
+                "ok": False,
+                "error": WikiError.__name__,
+                "message": f"Unsupported wiki service method: {method}",
+            }
+
+        try:
+            # Upstream fetches are queued fairly per user across both bots.
+            with requester(owner):
+                result = await getattr(self.client, method)(*args, **kwargs)
+        except WikiError as error:
+            return {
+                "ok": False,
+                "error": type(error).__name__,
+                "message": str(error),
+            }
+        except Exception as error:
+            logger.exception(
+                "wiki_service_method_failed method=%s error=%s",
+                method,
+                type(error).__name__,
+            )
+            return {
+                "ok": False,
+                "error": WikiError.__name__,
+                "message": "Не удалось получить данные из источника.",
+            }
+
+        return {"ok": True, "result": _encode(result)}
+
+
+class RemoteWikiClient:
+    """WikiClient stand-in that forwards adapter calls to a WikiService."""
+
+    def __init__(self, socket_path: str | Path) -> None:
+        self.socket_path = Path(socket_path)
+
+    async def start(self) -> None:
+        """The service owns the HTTP session, so there is nothing to open."""
+
+    async def close(self) -> None:
+        """Connections are per call, so there is nothing to close."""
+
+    async def _call(self, method: str, *args: object, **kwargs: object) -> Any:
+        payload = json.dumps(
+            {
+                "method": method,
+                "args": args,
+                "kwargs": kwargs,
+                "requester": current_requester(),
+            },
+            ensure_ascii=False,
+        ).encode()
+
+        try:
+            reader, writer = await asyncio.open_unix_connection(
+                str(self.socket_path),
+                limit=MAX_MESSAGE_BYTES,
+            )
+        except OSError as exc:
+            raise UpstreamUnavailableError(
+                "Сервис кэша вики недоступен."
+            ) from exc
+
+        try:
+            writer.write(payload + b"\n")
+            await writer.drain()
+            line = await reader.readline()
+        except (OSError, ValueError) as exc:
+            raise UpstreamUnavailableError(
+                "Сервис кэша вики прервал соединение."
+            ) from exc
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+        if not line:
+            raise UpstreamUnavailableError(
+                "Сервис кэша вики не ответил."
+            )
+
+        response = json.loads(line)
+
+        if response.get("ok"):
+            return response.get("result")
+
+        error = _ERRORS.get(response.get("error", ""), WikiError)
+        raise error(response.get("message", ""))
+
+    async def find_by_title(self, query: str) -> Article | None:
+        result = await self._call("find_by_title", query)
+        return _decode_article(result) if result else None
+
+    async def title_suggestions(
+        self,
+        query: str,
+        *,
+        limit: int = 25,
+    ) -> list[str]:
+        return list(await self._call("title_suggestions", query, limit=limit))
+
+    async def random_article(self) -> Article | None:
+        result = await self._call("random_article")
+        return _decode_article(result) if result else None
+
+    async def find_by_tags(self, tags: list[str]) -> list[Article]:
+        result = await self._call("find_by_tags", list(tags))
+        return [_decode_article(item) for item in result]
+
+    async def search_content(
+        self,
+        query: str,
+        *,
+        limit: int = 50,
+    ) -> list[Article]:
+        result = await self._call("search_content", query, limit=limit)
+        return [_decode_article(item) for item in result]
+
+    async def tag_catalog(self) -> dict[str, list[TagFacet]]:
+        result = await self._call("tag_catalog")
+        return {
+            category: [_decode_tag(item) for item in facets]
+            for category, facets in result.items()
+        }
+
+    async def tag_suggestions(
+        self,
+        query: str,
+        *,
+        limit: int = 25,
+    ) -> list[TagFacet]:
+        result = await self._call("tag_suggestions", query, limit=limit)
+        return [_decode_tag(item) for item in result]
+
+
+WikiBackend = WikiClient | RemoteWikiClient
+
+
+def create_wiki_client(config: WikiConfig) -> WikiBackend:
+    """Return a service-backed client when WIKI_SERVICE_SOCKET is configured."""
+    if config.service_socket:
+        return RemoteWikiClient(config.service_socket)
+
+    return WikiClient(config)
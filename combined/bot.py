@@ -0,0 +1,97 @@
+"""Entrypoint that runs the Discord and Telegram bots in one event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import sys
+from pathlib import Path
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from cogs.constants import ConfigurationError, load_wiki_config  # noqa: E402
+from cogs.tg import create_router  # noqa: E402
+from cogs.wiki_service import create_wiki_client  # noqa: E402
+from dsc.bot import create_bot  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def _required_env(name: str) -> str:
+    value = os.getenv(name, "").strip()
+    if not value:
+        raise RuntimeError(f"{name} is missing in .env")
+    return value
+
+
+async def main() -> None:
+    load_dotenv(PROJECT_ROOT / ".env")
+    discord_token = _required_env("DISCORD_BOT_TOKEN")
+    telegram_token = _required_env("TELEGRAM_BOT_TOKEN")
+    config = load_wiki_config()
+
+    # One client serves both adapters, so caches, locks and limits are shared.
+    wiki = create_wiki_client(config)
+    discord_bot = create_bot(wiki)
+    telegram_bot = Bot(
+        token=telegram_token,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    dispatcher = Dispatcher()
+    dispatcher.include_router(create_router(wiki))
+
+    await wiki.start()
+    try:
+        async with discord_bot:
+            tasks = {
+                asyncio.create_task(
+                    discord_bot.start(discord_token),
+                    name="discord",
+                ),
+                asyncio.create_task(
+                    dispatcher.start_polling(
+                        telegram_bot,
+                        allowed_updates=dispatcher.resolve_used_update_types(),
+                    ),
+                    name="telegram",
+                ),
+            }
+            done, pending = await asyncio.wait(
+                tasks,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            # When either bot stops, stop the other so the supervisor restarts both.
+            logger.info(
+                "combined_bot_stopping finished=%s",
+                ",".join(task.get_name() for task in done),
+            )
+            await discord_bot.close()
+            with contextlib.suppress(RuntimeError):
+                await dispatcher.stop_polling()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+            for task in done:
+                task.result()
+    finally:
+        await wiki.close()
+        await telegram_bot.session.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        asyncio.run(main())
+    except (ConfigurationError, RuntimeError) as error:
+        raise SystemExit(f"Configuration error: {error}") from error
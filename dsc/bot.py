@@ -6,16 +6,25 @@ import logging
 import os
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from cogs.wiki_service import WikiBackend
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 
 class CastopiaBot(commands.Bot):
+    def __init__(self, *args: Any, wiki: WikiBackend | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Optional shared wiki client picked up by cogs.dsc.setup().
+        self.wiki = wiki
+
     async def setup_hook(self) -> None:
         """Load hybrid commands and publish them to Discord."""
         await self.load_extension("cogs.dsc")
@@ -45,18 +54,23 @@ def _required_env(name: str) -> str:
     return value
 
 
-def main() -> None:
-    load_dotenv(PROJECT_ROOT / ".env")
-    token = _required_env("DISCORD_BOT_TOKEN")
+def create_bot(wiki: WikiBackend | None = None) -> CastopiaBot:
     intents = discord.Intents.default()
     # Prefix commands require Message Content Intent to be enabled in the Discord portal.
     intents.message_content = True
-    bot = CastopiaBot(
+    return CastopiaBot(
         command_prefix=".",
         intents=intents,
         help_command=None,
         allowed_mentions=discord.AllowedMentions.none(),
+        wiki=wiki,
     )
+
+
+def main() -> None:
+    load_dotenv(PROJECT_ROOT / ".env")
+    token = _required_env("DISCORD_BOT_TOKEN")
+    bot = create_bot()
     bot.run(token, log_handler=None)
 
 
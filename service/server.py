@@ -0,0 +1,43 @@
+"""Entrypoint for the shared wiki cache service used by both bots."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from cogs.constants import ConfigurationError, load_wiki_config  # noqa: E402
+from cogs.page_parsing import WikiClient  # noqa: E402
+from cogs.wiki_service import WikiService  # noqa: E402
+
+
+async def main() -> None:
+    load_dotenv(PROJECT_ROOT / ".env")
+    config = load_wiki_config()
+    if not config.service_socket:
+        raise RuntimeError("WIKI_SERVICE_SOCKET is missing in .env")
+
+    service = WikiService(WikiClient(config), config.service_socket)
+    await service.start()
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    try:
+        asyncio.run(main())
+    except (ConfigurationError, RuntimeError) as error:
+        raise SystemExit(f"Configuration error: {error}") from error
@@ -6,12 +6,32 @@ cd /app
 
 DISCORD_PID=""
 TELEGRAM_PID=""
+SERVICE_PID=""
+COMBINED_PID=""
+SERVICE_SOCKET="${WIKI_SERVICE_SOCKET:-}"
 SHUTTING_DOWN=0
 
 log() {
     printf '[start] %s\n' "$*"
 }
 
+start_service() {
+    log "Starting wiki cache service on $SERVICE_SOCKET"
+    rm -f "$SERVICE_SOCKET"
+    python -u /app/service/server.py &
+    SERVICE_PID=$!
+    log "Wiki cache service started (PID: $SERVICE_PID)"
+
+    for _ in $(seq 1 50); do
+        if [[ -S "$SERVICE_SOCKET" ]]; then
+            return
+        fi
+        sleep 0.2
+    done
+
+    log "Wiki cache service socket did not appear; bots will retry on demand"
+}
+
 start_discord() {
     log "Starting Discord bot"
     python -u /app/dsc/bot.py &
@@ -34,7 +54,7 @@ stop_process() {
         return
     fi
 
-    log "Stopping $name bot (PID: $pid)"
+    log "Stopping $name (PID: $pid)"
     kill "$pid" 2>/dev/null || true
 }
 
@@ -46,11 +66,19 @@ stop_bots() {
     SHUTTING_DOWN=1
     log "Stopping Castopia bots"
 
-    stop_process "$DISCORD_PID" "Discord"
-    stop_process "$TELEGRAM_PID" "Telegram"
+    stop_process "$DISCORD_PID" "Discord bot"
+    stop_process "$TELEGRAM_PID" "Telegram bot"
+    stop_process "$SERVICE_PID" "wiki cache service"
+    stop_process "$COMBINED_PID" "combined bot"
 
     wait "$DISCORD_PID" 2>/dev/null || true
     wait "$TELEGRAM_PID" 2>/dev/null || true
+    if [[ -n "$SERVICE_PID" ]]; then
+        wait "$SERVICE_PID" 2>/dev/null || true
+    fi
+    if [[ -n "$COMBINED_PID" ]]; then
+        wait "$COMBINED_PID" 2>/dev/null || true
+    fi
 
     log "Castopia bots stopped"
 }
@@ -65,6 +93,16 @@ restart_discord() {
     start_discord
 }
 
+restart_service() {
+    if (( SHUTTING_DOWN )); then
+        return
+    fi
+
+    log "Wiki cache service stopped. Restarting"
+    wait "$SERVICE_PID" 2>/dev/null || true
+    start_service
+}
+
 restart_telegram() {
     if (( SHUTTING_DOWN )); then
         return
@@ -81,6 +119,28 @@ log "Starting Castopia Bot"
 log "Python: $(python --version)"
 log "Working directory: $(pwd)"
 
+if [[ -n "$SERVICE_SOCKET" ]]; then
+    start_service
+fi
+
+if [[ "${CASTOPIA_PROCESS_MODE:-separate}" == "single" ]]; then
+    log "Running both bots in one process"
+
+    while (( ! SHUTTING_DOWN )); do
+        python -u /app/combined/bot.py &
+        COMBINED_PID=$!
+        log "Combined bot started (PID: $COMBINED_PID)"
+        wait "$COMBINED_PID" 2>/dev/null || true
+
+        if (( ! SHUTTING_DOWN )); then
+            log "Combined bot stopped. Restarting"
+            sleep 2
+        fi
+    done
+
+    exit 0
+fi
+
 start_discord
 start_telegram
 
@@ -88,6 +148,10 @@ log "Discord PID: $DISCORD_PID"
 log "Telegram PID: $TELEGRAM_PID"
 
 while (( ! SHUTTING_DOWN )); do
+    if [[ -n "$SERVICE_PID" ]] && ! kill -0 "$SERVICE_PID" 2>/dev/null; then
+        restart_service
+    fi
+
     if ! kill -0 "$DISCORD_PID" 2>/dev/null; then
         restart_discord
     fi
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import unittest
+from dataclasses import dataclass
+from time import monotonic
+
+from cogs.cache import Cache
+
+
+@dataclass
+class Entry:
+    value: str
+    expires_at: float
+
+
+def make_cache(max_bytes: int, *, retention: float = 0.0) -> Cache[Entry]:
+    return Cache(max_bytes, weigh=lambda entry: len(entry.value), retention=retention)
+
+
+def fresh(value: str) -> Entry:
+    return Entry(value, monotonic() + 60)
+
+
+class CacheTests(unittest.TestCase):
+    def test_frequently_read_entry_survives_a_scan_of_one_off_keys(self) -> None:
+        cache = make_cache(1000)
+        cache["hot"] = fresh("x" * 100)
+        for _ in range(5):
+            self.assertIsNotNone(cache.get("hot"))
+
+        for index in range(200):
+            key = f"page-{index}"
+            self.assertIsNone(cache.get(key))
+            cache[key] = fresh("y" * 100)
+
+        self.assertIn("hot", cache)
+        self.assertLessEqual(cache.weight, 1000)
+
+    def test_values_larger_than_the_budget_are_not_stored(self) -> None:
+        cache = make_cache(100)
+        cache["small"] = fresh("a" * 10)
+        cache["huge"] = fresh("b" * 500)
+
+        self.assertNotIn("huge", cache)
+        self.assertEqual(cache.weight, 10)
+
+    def test_expired_entries_are_kept_only_for_the_retention_window(self) -> None:
+        cache = make_cache(1000, retention=30)
+        cache["recent"] = Entry("a", monotonic() - 10)
+        cache["old"] = Entry("b", monotonic() - 60)
+
+        self.assertEqual(cache.get("recent").value, "a")
+        self.assertNotIn("old", cache)
+
+        cache["recent"].expires_at = monotonic() - 60
+        self.assertIsNone(cache.get("recent"))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.weight, 0)
+
+    def test_peeks_do_not_change_which_entry_is_admitted(self) -> None:
+        cache = make_cache(1000)
+        cache["crawled"] = fresh("c" * 600)
+
+        # A crawler pass checks the entry without anybody reading it.
+        for _ in range(5):
+            self.assertIsNotNone(cache.peek("crawled"))
+
+        for _ in range(2):
+            self.assertIsNone(cache.get("requested"))
+        cache["requested"] = fresh("r" * 600)
+
+        self.assertIn("requested", cache)
+        self.assertNotIn("crawled", cache)
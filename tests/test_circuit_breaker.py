@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def failing_breaker() -> CircuitBreaker:
+    breaker = CircuitBreaker()
+    for healthy in [True] * 5 + [False] * 5:
+        breaker.allow()
+        breaker.record(healthy)
+    return breaker
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def test_opens_when_half_of_recent_requests_fail(self) -> None:
+        breaker = CircuitBreaker()
+        for _ in range(9):
+            breaker.record(False)
+        self.assertEqual(breaker.state, CLOSED)
+
+        breaker = failing_breaker()
+
+        self.assertEqual(breaker.state, OPEN)
+        self.assertFalse(breaker.allow())
+        self.assertEqual(breaker.stats().rejected, 1)
+        self.assertGreater(breaker.retry_after(), 0)
+
+    def test_half_open_lets_one_probe_decide(self) -> None:
+        breaker = failing_breaker()
+        breaker.OPEN_SECONDS = 0
+
+        self.assertEqual(breaker.state, HALF_OPEN)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.record(False)
+        self.assertTrue(breaker.allow())
+        breaker.abandon()
+        self.assertTrue(breaker.allow())
+
+        breaker.record(True)
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.stats().recent_calls, 0)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import AsyncMock, MagicMock
 
 from discord.ext import commands
 
 from cogs.dsc import DscCog, SearchResultsView, _RateLimit, _RateLimiter
-from cogs.page_parsing import Article
+from cogs.page_parsing import Article, TagFacet
 
 
 class DiscordUiTests(unittest.IsolatedAsyncioTestCase):
@@ -62,3 +63,39 @@ class DiscordUiTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(await limiter.retry_after(user, "randompage"), 0)
         self.assertEqual(await limiter.retry_after(user, "randompage"), 0)
         self.assertGreater(await limiter.retry_after(user, "randompage"), 0)
+
+    async def test_injected_wiki_client_is_shared_and_not_closed_by_cog(self) -> None:
+        wiki = MagicMock()
+        wiki.start = AsyncMock()
+        wiki.close = AsyncMock()
+        cog = DscCog(MagicMock(), wiki)
+
+        self.assertIs(cog.wiki, wiki)
+        await cog.cog_unload()
+        wiki.close.assert_not_awaited()
+
+    async def test_tag_autocomplete_completes_the_last_tag(self) -> None:
+        wiki = MagicMock()
+        wiki.tag_suggestions = AsyncMock(
+            return_value=[
+                TagFacet("класс:кетер", "класс", "кетер", 12),
+                TagFacet("статус:основное", "статус", "основное", 40),
+            ]
+        )
+        cog = DscCog(MagicMock(), wiki)
+
+        choices = await cog.search_tags_autocomplete(
+            MagicMock(),
+            "статус:основное кет",
+        )
+
+        wiki.tag_suggestions.assert_awaited_once_with("кет", limit=26)
+        self.assertEqual(
+            [(choice.name, choice.value) for choice in choices],
+            [
+                (
+                    "статус:основное класс:кетер (12)",
+                    "статус:основное класс:кетер",
+                ),
+            ],
+        )
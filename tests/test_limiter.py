@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from cogs.limiter import (
+    AdaptiveLimiter,
+    Priority,
+    current_priority,
+    request_priority,
+    requester,
+)
+
+
+class AdaptiveLimiterTests(unittest.IsolatedAsyncioTestCase):
+    async def test_limit_grows_additively_and_halves_once_per_window(self) -> None:
+        limiter = AdaptiveLimiter(1, 8, 2)
+
+        for _ in range(6):
+            async with limiter.slot() as first, limiter.slot() as second:
+                first.succeeded()
+                second.succeeded()
+
+        # Two concurrent requests only ever fill a window of three.
+        self.assertEqual(limiter.limit, 3)
+
+        async with limiter.slot() as first, limiter.slot() as second:
+            first.overloaded()
+            second.overloaded()
+
+        self.assertEqual(limiter.limit, 1)
+        self.assertEqual(limiter.stats().overloads, 2)
+
+        for _ in range(3):
+            async with limiter.slot() as permit:
+                permit.overloaded()
+
+        self.assertEqual(limiter.stats().limit, 1)
+
+    async def test_unsaturated_successes_do_not_raise_the_limit(self) -> None:
+        limiter = AdaptiveLimiter(1, 8, 4)
+
+        for _ in range(20):
+            async with limiter.slot() as permit:
+                permit.succeeded()
+
+        self.assertEqual(limiter.limit, 4)
+
+    async def test_waiters_get_slots_in_order_and_cancellation_frees_them(self) -> None:
+        limiter = AdaptiveLimiter(1, 1, 1)
+        order: list[int] = []
+
+        async def worker(number: int) -> None:
+            async with limiter.slot():
+                order.append(number)
+                await asyncio.sleep(0)
+
+        async with limiter.slot():
+            tasks = [asyncio.create_task(worker(number)) for number in range(3)]
+            await asyncio.sleep(0)
+            tasks[1].cancel()
+            self.assertEqual(limiter.stats().waiting, 3)
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertEqual(order, [0, 2])
+        self.assertEqual(limiter.stats().in_flight, 0)
+        self.assertEqual(limiter.stats().waiting, 0)
+
+    async def test_interactive_requests_jump_ahead_of_queued_bulk_work(self) -> None:
+        limiter = AdaptiveLimiter(1, 3, 3)
+        order: list[str] = []
+        release = asyncio.Event()
+
+        async def request(name: str) -> None:
+            async with limiter.slot():
+                order.append(name)
+                await release.wait()
+
+        with request_priority(Priority.BACKGROUND):
+            background = [asyncio.create_task(request(f"bg{i}")) for i in range(3)]
+        with request_priority(Priority.BULK):
+            bulk = asyncio.create_task(request("bulk"))
+        await asyncio.sleep(0)
+
+        # Lower classes leave the last slot to interactive requests.
+        self.assertEqual(order, ["bg0", "bg1"])
+        interactive = asyncio.create_task(request("user"))
+        await asyncio.sleep(0)
+        self.assertEqual(order, ["bg0", "bg1", "user"])
+
+        release.set()
+        await asyncio.gather(*background, bulk, interactive)
+        self.assertEqual(order[3], "bulk")
+
+    async def test_nested_priority_never_raises_the_class(self) -> None:
+        with request_priority(Priority.BACKGROUND):
+            with request_priority(Priority.BULK):
+                self.assertIs(current_priority(), Priority.BACKGROUND)
+
+        self.assertIs(current_priority(), Priority.INTERACTIVE)
+
+    async def test_requesters_take_turns_for_free_slots(self) -> None:
+        limiter = AdaptiveLimiter(1, 1, 1)
+        order: list[str] = []
+
+        async def request(name: str) -> None:
+            async with limiter.slot():
+                order.append(name)
+                await asyncio.sleep(0)
+
+        async with limiter.slot():
+            with requester("discord:1"):
+                burst = [asyncio.create_task(request(f"heavy{i}")) for i in range(4)]
+            with requester("telegram:2"):
+                quiet = asyncio.create_task(request("quiet"))
+            await asyncio.sleep(0)
+
+        await asyncio.gather(*burst, quiet)
+        self.assertEqual(order[:3], ["heavy0", "quiet", "heavy1"])
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.page_parsing import Article
+from cogs.random_pool import RandomPool
+
+
+def make_article(name: str) -> Article:
+    return Article(
+        title=name,
+        url=f"https://castopia.site/{name}",
+        text="text",
+        tags=frozenset(),
+    )
+
+
+class RandomPoolTests(unittest.TestCase):
+    def test_discard_moves_the_last_article_into_the_gap(self) -> None:
+        pool = RandomPool()
+        for name in "abc":
+            pool.add(make_article(name))
+
+        pool.discard("https://castopia.site/a")
+        pool.discard("https://castopia.site/missing")
+
+        self.assertEqual(len(pool), 2)
+        self.assertEqual(
+            {url: pool._articles[position].url for url, position in pool._positions.items()},
+            {url: url for url in pool._positions},
+        )
+        self.assertIn(pool.choice().title, {"b", "c"})
+
+    def test_add_replaces_and_retain_drops_unlisted_articles(self) -> None:
+        pool = RandomPool()
+        pool.add(make_article("a"))
+        pool.add(make_article("b"))
+        updated = Article("A2", "https://castopia.site/a", "new", frozenset())
+        pool.add(updated)
+
+        pool.retain({"https://castopia.site/a"})
+
+        self.assertEqual(len(pool), 1)
+        self.assertIs(pool.choice(), updated)
+
+        pool.discard("https://castopia.site/a")
+        self.assertIsNone(pool.choice())
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.retry_budget import RetryBudget
+
+
+class RetryBudgetTests(unittest.TestCase):
+    def test_retries_are_limited_to_a_share_of_first_attempts(self) -> None:
+        budget = RetryBudget()
+        allowed = 0
+
+        for _ in range(200):
+            budget.record_attempt()
+            allowed += budget.try_retry()
+
+        stats = budget.stats()
+        # The full initial bucket plus 10 % of the 199 later first attempts.
+        self.assertEqual(allowed, 29)
+        self.assertEqual(stats.retries, 29)
+        self.assertEqual(stats.denied_retries, 171)
+        self.assertAlmostEqual(stats.amplification, 1.145)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.normalisation import analyse, normalise, stem
+from cogs.page_parsing import Article
+from cogs.search_index import SearchIndex
+
+
+def make_article(title: str, text: str, url: str | None = None) -> Article:
+    return Article(
+        title=title,
+        url=url or f"https://castopia.site/{title.casefold()}",
+        text=text,
+        tags=frozenset(),
+    )
+
+
+class SearchIndexTests(unittest.TestCase):
+    def test_phrase_query_requires_adjacent_terms(self) -> None:
+        index = SearchIndex()
+        index.add(make_article("Alpha", "красный объект в подвале"))
+        index.add(make_article("Beta", "объект красный, но в другом месте"))
+
+        hits = index.search("Красный объект")
+
+        self.assertEqual([hit.article.title for hit in hits], ["Alpha"])
+
+    def test_title_match_and_frequency_raise_score(self) -> None:
+        index = SearchIndex()
+        index.add(make_article("Подвал", "подвал и ещё раз подвал"))
+        index.add(make_article("Чердак", "подвал подвал подвал"))
+        index.add(make_article("Сад", "подвал"))
+
+        ranked = sorted(index.search("подвал"), key=lambda hit: -hit.score)
+
+        self.assertEqual(
+            [hit.article.title for hit in ranked],
+            ["Подвал", "Чердак", "Сад"],
+        )
+
+    def test_long_articles_do_not_win_on_raw_counts(self) -> None:
+        index = SearchIndex()
+        filler = " ".join(["слово"] * 400)
+        index.add(make_article("Short", "аномалия в подвале"))
+        index.add(make_article("Long", f"аномалия {filler} аномалия"))
+        index.add(make_article("Other", "пустая комната"))
+
+        ranked = sorted(index.search("аномалия"), key=lambda hit: -hit.score)
+
+        self.assertEqual(
+            [hit.article.title for hit in ranked],
+            ["Short", "Long"],
+        )
+
+    def test_tags_are_weighted_and_statistics_follow_removals(self) -> None:
+        index = SearchIndex()
+        tagged = Article(
+            title="Alpha",
+            url="https://castopia.site/alpha",
+            text="объект класса кетер",
+            tags=frozenset({"класс:кетер"}),
+        )
+        index.add(tagged)
+        index.add(make_article("Beta", "объект класса кетер"))
+
+        ranked = sorted(index.search("кетер"), key=lambda hit: -hit.score)
+        self.assertEqual(ranked[0].article.title, "Alpha")
+
+        index.remove(tagged.url)
+        index.remove("https://castopia.site/beta")
+
+        self.assertEqual(index._doc_freq, {})
+        self.assertFalse(+index._total_lengths)
+
+    def test_reindexing_and_retain_replace_stale_postings(self) -> None:
+        index = SearchIndex()
+        index.add(make_article("Alpha", "old text"))
+        index.add(make_article("Alpha", "new text"))
+        index.add(make_article("Gone", "new text"))
+
+        index.retain({"https://castopia.site/alpha"})
+
+        self.assertEqual(index.search("old"), [])
+        self.assertEqual(
+            [hit.article.text for hit in index.search("new")],
+            ["new text"],
+        )
+        self.assertEqual(len(index), 1)
+
+    def test_word_forms_share_one_index_term(self) -> None:
+        index = SearchIndex()
+        index.add(make_article("Alpha", "Ещё один объект класса Кетер."))
+        index.add(make_article("Beta", "Про объекты и их ёмкости."))
+
+        self.assertEqual(
+            sorted(hit.article.title for hit in index.search("объектами")),
+            ["Alpha", "Beta"],
+        )
+        self.assertEqual(
+            [hit.article.title for hit in index.search("ЕМКОСТЬ")],
+            ["Beta"],
+        )
+        self.assertEqual(
+            [hit.article.title for hit in index.search("объекта класса")],
+            ["Alpha"],
+        )
+
+    def test_normalisation_pipeline(self) -> None:
+        self.assertEqual(normalise("Ёлка ﬁ"), "елка fi")
+        self.assertEqual(
+            [stem(word) for word in ("красный", "красного", "красная")],
+            ["красн", "красн", "красн"],
+        )
+        self.assertEqual(stem("важнейший"), "важн")
+        self.assertEqual(analyse("SCP-173 объектов"), ["scp", "173", "объект"])
+
+    def test_unchanged_article_is_not_reanalysed(self) -> None:
+        index = SearchIndex()
+        article = make_article("Alpha", "текст статьи")
+        index.add(article)
+        document = index._documents[index._doc_ids[article.url]]
+
+        index.add(make_article("Alpha", "текст статьи"))
+
+        self.assertIs(index._documents[index._doc_ids[article.url]], document)
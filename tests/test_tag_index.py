@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.page_parsing import Article
+from cogs.tag_index import TagIndex
+
+
+def make_article(name: str, *tags: str) -> Article:
+    return Article(
+        title=name,
+        url=f"https://castopia.site/{name}",
+        text="text",
+        tags=frozenset(tags),
+    )
+
+
+class TagIndexTests(unittest.TestCase):
+    def test_match_intersects_article_tags(self) -> None:
+        index = TagIndex()
+        index.add(make_article("a", "класс:кетер", "статус:основное"))
+        index.add(make_article("b", "класс:кетер"))
+        index.add(make_article("c", "статус:основное"))
+
+        articles, pending = index.match({"класс:кетер", "статус:основное"})
+
+        self.assertEqual([article.title for article in articles], ["a"])
+        self.assertEqual(pending, [])
+        self.assertEqual(index.match({"класс:кетер", "unknown"}), ([], []))
+
+    def test_tag_pages_only_count_until_the_article_is_parsed(self) -> None:
+        index = TagIndex()
+        index.add_tag_page(
+            "класс:кетер",
+            [("A", "https://castopia.site/a"), ("B", "https://castopia.site/b")],
+        )
+        index.add_tag_page("статус:основное", [("B", "https://castopia.site/b")])
+
+        self.assertEqual(
+            index.match({"класс:кетер", "статус:основное"}),
+            ([], [("B", "https://castopia.site/b")]),
+        )
+
+        # The parsed article no longer carries the tag the stale page listed.
+        index.add(make_article("b", "класс:кетер"))
+
+        self.assertEqual(index.match({"класс:кетер", "статус:основное"}), ([], []))
+        self.assertTrue(index.missing(["https://castopia.site/a"]))
+        self.assertFalse(index.missing(["https://castopia.site/b"]))
+
+    def test_removed_ids_are_cleared_and_reused(self) -> None:
+        index = TagIndex()
+        index.add(make_article("a", "x"))
+        index.add(make_article("b", "x"))
+
+        index.retain({"https://castopia.site/b"})
+        index.add(make_article("c", "y"))
+
+        self.assertEqual([a.title for a in index.match({"x"})[0]], ["b"])
+        self.assertEqual([a.title for a in index.match({"y"})[0]], ["c"])
+        self.assertEqual(len(index), 2)
+        self.assertEqual(len(index._urls), 2)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import unittest
+
+from cogs.title_index import TitleIndex, trigrams
+
+
+def make_index(*titles: str) -> TitleIndex:
+    return TitleIndex(
+        (title, f"https://castopia.site/{number}")
+        for number, title in enumerate(titles)
+    )
+
+
+class TitleIndexTests(unittest.TestCase):
+    def test_find_prefers_exact_then_substring_then_word_forms(self) -> None:
+        index = make_index(
+            "Объект класса Кетер",
+            "Кетер",
+            "Протокол Ёлка",
+        )
+
+        self.assertEqual(index.find("КЕТЕР"), ("Кетер", "https://castopia.site/1"))
+        self.assertEqual(index.find("класса"), ("Объект класса Кетер", "https://castopia.site/0"))
+        self.assertEqual(index.find("объекты кетера"), ("Объект класса Кетер", "https://castopia.site/0"))
+        self.assertEqual(index.find("протокол елка")[0], "Протокол Ёлка")
+
+    def test_typos_are_only_suggested(self) -> None:
+        index = make_index("Кетер", "Евклид", "Безопасный")
+
+        self.assertIsNone(index.find("Евкилд"))
+        self.assertEqual(index.suggestions("Евкилд", 5)[0], "Евклид")
+        self.assertEqual(index.suggestions("кетр", 5), ["Кетер"])
+        self.assertIsNone(index.find("zzzz"))
+
+    def test_find_does_not_guess_similar_titles(self) -> None:
+        index = make_index("Объект 173", "Протокол эвакуации")
+
+        self.assertIsNone(index.find("Объект 999"))
+        self.assertIsNone(index.find("Протокол 5"))
+        self.assertEqual(index.suggestions("Объект 999", 5), ["Объект 173"])
+
+    def test_suggestions_rank_prefixes_then_word_starts_then_substrings(self) -> None:
+        index = make_index(
+            "Альфа отчёт",
+            "Бета",
+            "Отчёт Гамма",
+            "Отчт",
+            "Подотчётный",
+            "Отчёт Бета",
+        )
+
+        self.assertEqual(
+            index.suggestions("отчёт", 10),
+            ["Отчёт Бета", "Отчёт Гамма", "Альфа отчёт", "Подотчётный", "Отчт"],
+        )
+        self.assertEqual(index.suggestions("отчет", 2), ["Отчёт Бета", "Отчёт Гамма"])
+        self.assertEqual(
+            index.suggestions("бе", 10),
+            ["Бета", "Отчёт Бета"],
+        )
+        self.assertEqual(index.suggestions("ет", 10), ["Альфа отчёт", "Бета", "Отчёт Гамма", "Подотчётный", "Отчёт Бета"])
+
+    def test_trigrams_pad_each_word(self) -> None:
+        self.assertEqual(trigrams("ab"), {"  a", " ab", "ab "})
@@ -1,33 +1,117 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import tempfile
 import unittest
-from unittest.mock import AsyncMock
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from time import monotonic
+from unittest.mock import AsyncMock, patch
 
+import aiohttp
+
+from cogs import page_parsing
 from cogs.constants import WikiConfig
+from cogs.crawler import WikiCrawler
+from cogs.parse_executor import ParseExecutor
 from cogs.page_parsing import (
     Article,
     UpstreamAccessError,
     UpstreamContentError,
     UpstreamNotFoundError,
+    UpstreamUnavailableError,
     WikiClient,
 )
 
 
-def make_client() -> WikiClient:
+PARITY_ARTICLE = """
+<html><head><title>Ignored</title><script>var x = 1;</script></head>
+<body>
+  <div id="side-bar"><a href="/nav">Навигация</a></div>
+  <div id="page-content">
+    <p>Первый&nbsp;абзац <b>объекта</b>,<!-- скрыто --> текст&amp;ещё.</p>
+    <div class="no-style footer">Не показывать</div>
+    <span class="footnoteref"><a href="#f1">1</a></span> хвост сноски
+    <script>alert("x")</script><style>.x{}</style><noscript>нет js</noscript>
+    <template><p>шаблон</p></template>
+    <ruby>漢<rp>(</rp><rt>kan</rt><rp>)</rp></ruby>
+    <table><tr><td>ячейка\n  один</td><td> два </td></tr></table>
+    <div id="side-bar">вложенный сайдбар</div>
+  </div>
+  <div class="page-tags">
+    <span>
+      <a href="/system:page-tags/tag/%D1%81%D1%82%D0%B0%D1%82%D1%83%D1%81%3A%D0%BE%D1%81%D0%BD%D0%BE%D0%B2%D0%BD%D0%BE%D0%B5">основное</a>
+      <a href="/other">Без Идентификатора</a>
+      <a href="/empty"> </a>
+    </span>
+  </div>
+</body></html>
+"""
+
+PARITY_LISTING = """
+<div id="page-content">
+  <div class="list-pages-box w-list-pages"></div>
+  <div class="list-pages-box w-list-pages">
+    <a href="/alpha">Alpha <i>one</i></a>
+    <a href="/alpha/edit/true">Редактировать</a>
+    <a href="https://example.org/off">Off origin</a>
+    <a href="/beta"><!-- c -->Beta</a>
+    <a name="anchor">No href</a>
+  </div>
+</div>
+<div class="pager"><span class="pager-no">страница 1 из 7</span></div>
+"""
+
+PARITY_TAG_CATALOG = """
+<div class="pages-tag-cloud-box">
+  <a class="tag" href="/system:page-tags/tag/%D1%81%D1%82%D0%B0%D1%82%D1%83%D1%81%3A%D0%BE%D1%81%D0%BD%D0%BE%D0%B2%D0%BD%D0%BE%D0%B5">основное</a>
+  <a class="tag big" href="/system:page-tags/tag/scp">SCP</a>
+  <a class="tag" href="/not-a-tag">Broken</a>
+  <a class="tagged" href="/system:page-tags/tag/x">x</a>
+</div>
+"""
+
+PARITY_TAGGED_PAGES = """
+<div id="tagged-pages-list">
+  <div class="pages-list-item"><a href="/alpha">Alpha</a></div>
+  <div class="pages-list-item"><a href="/alpha/edit">edit</a></div>
+  <div class="pages-list-item"><a href="https://example.org/x">Off</a></div>
+</div>
+"""
+
+
+def make_client(**config: object) -> WikiClient:
     return WikiClient(
         WikiConfig(
             base_url="https://castopia.site",
             user_agent="CastopiaBot test",
             max_concurrent_requests=2,
+            **config,
         )
     )
 
 
+class FakeStream:
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+        self.chunk_sizes: list[int] = []
+
+    async def iter_chunked(self, size: int):  # type: ignore[no-untyped-def]
+        self.chunk_sizes.append(size)
+
+        for start in range(0, len(self._body), size):
+            yield self._body[start : start + size]
+
+
 class FakeResponse:
+    charset = "utf-8"
+
     def __init__(self, status: int, body: str = "", headers: dict[str, str] | None = None) -> None:
         self.status = status
         self._body = body
         self.headers = headers or {}
+        self.content = FakeStream(body.encode())
 
     async def __aenter__(self) -> "FakeResponse":
         return self
@@ -45,9 +129,14 @@ class FakeSession:
     def __init__(self, responses: list[FakeResponse]) -> None:
         self.responses = iter(responses)
         self.calls = 0
+        self.request_headers: list[dict[str, str] | None] = []
 
-    def get(self, *_: object, **__: object) -> FakeResponse:
+    async def close(self) -> None:
+        self.closed = True
+
+    def get(self, *_: object, headers: dict[str, str] | None = None, **__: object) -> FakeResponse:
         self.calls += 1
+        self.request_headers.append(headers)
         return next(self.responses)
 
 
@@ -66,7 +155,7 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
         </div>
         """
         self.assertEqual(
-            client._parse_list_links(html),
+            page_parsing._parse_listing_html(html, client.base_url).links,
             [
                 ("Alpha", "https://castopia.site/alpha"),
                 ("Beta", "https://castopia.site/beta"),
@@ -75,7 +164,11 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
 
     def test_pagination_parser_uses_last_number(self) -> None:
         self.assertEqual(
-            WikiClient._parse_total_pages('<span class="pager-no">page 1 of 5</span>'), 5
+            page_parsing._parse_listing_html(
+                '<span class="pager-no">page 1 of 5</span>',
+                "https://castopia.site",
+            ).total_pages,
+            5,
         )
 
     async def test_empty_article_listing_is_diagnostic_error(self) -> None:
@@ -94,9 +187,11 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
         )
         client._session = retry_session  # type: ignore[assignment]
         self.assertEqual(
-            await client._request_html("https://castopia.site/example"), "<html>ok</html>"
+            (await client._request_html("https://castopia.site/example")).body, "<html>ok</html>"
         )
         self.assertEqual(retry_session.calls, 2)
+        self.assertEqual(client.concurrency_stats().overloads, 1)
+        self.assertEqual(client.concurrency_stats().successes, 1)
 
         blocked_client = make_client()
         blocked_session = FakeSession([FakeResponse(403)])
@@ -105,6 +200,64 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
             await blocked_client._request_html("https://castopia.site/example")
         self.assertEqual(blocked_session.calls, 1)
 
+    async def test_open_circuit_fails_fast_without_requests(self) -> None:
+        client = make_client()
+        client.REQUEST_ATTEMPTS = 1
+        session = FakeSession([FakeResponse(503) for _ in range(10)])
+        client._session = session  # type: ignore[assignment]
+
+        for _ in range(10):
+            with self.assertRaises(UpstreamUnavailableError):
+                await client._request_html("https://castopia.site/down")
+
+        with self.assertRaises(page_parsing.UpstreamCircuitOpenError):
+            await client._request_html("https://castopia.site/down")
+        self.assertEqual(session.calls, 10)
+        self.assertEqual(client.circuit_stats().state, "open")
+
+    async def test_body_read_failure_is_reported_as_one_failure(self) -> None:
+        client = make_client()
+        client.REQUEST_ATTEMPTS = 1
+        response = FakeResponse(200)
+        response.text = AsyncMock(  # type: ignore[method-assign]
+            side_effect=aiohttp.ClientPayloadError("truncated")
+        )
+        client._session = FakeSession([response])  # type: ignore[assignment]
+
+        with self.assertRaises(UpstreamUnavailableError):
+            await client._request_html("https://castopia.site/truncated")
+
+        stats = client.circuit_stats()
+        self.assertEqual((stats.recent_calls, stats.recent_failures), (1, 1))
+
+    async def test_body_read_timeout_cuts_the_concurrency_limit(self) -> None:
+        client = make_client()
+        client.REQUEST_ATTEMPTS = 1
+        response = FakeResponse(200)
+        response.text = AsyncMock(  # type: ignore[method-assign]
+            side_effect=asyncio.TimeoutError()
+        )
+        client._session = FakeSession([response])  # type: ignore[assignment]
+
+        with self.assertRaises(UpstreamUnavailableError):
+            await client._request_html("https://castopia.site/stalled")
+
+        stats = client.concurrency_stats()
+        self.assertEqual((stats.successes, stats.overloads), (0, 1))
+        self.assertEqual(stats.limit, 1)
+
+    async def test_exhausted_retry_budget_fails_without_retrying(self) -> None:
+        client = make_client()
+        client._retry_budget._tokens = 0
+        session = FakeSession([FakeResponse(503), FakeResponse(200, "ok")])
+        client._session = session  # type: ignore[assignment]
+
+        with self.assertRaises(UpstreamUnavailableError):
+            await client._request_html("https://castopia.site/busy")
+
+        self.assertEqual(session.calls, 1)
+        self.assertEqual(client.retry_stats().denied_retries, 1)
+
     async def test_page_response_is_cached(self) -> None:
         client = make_client()
         session = FakeSession([FakeResponse(200, "<html>ok</html>")])
@@ -113,6 +266,178 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(await client.fetch_html("/cached"), "<html>ok</html>")
         self.assertEqual(session.calls, 1)
 
+    async def test_expired_page_is_revalidated_with_conditional_get(self) -> None:
+        client = make_client()
+        session = FakeSession(
+            [
+                FakeResponse(
+                    200,
+                    '<div id="page-content">Article text</div>',
+                    headers={"ETag": '"v1"', "Last-Modified": "Mon, 05 Oct 2026 10:00:00 GMT"},
+                ),
+                FakeResponse(304),
+            ]
+        )
+        client._session = session  # type: ignore[assignment]
+        article = await client.get_article("Article", "/article")
+
+        url = "https://castopia.site/article"
+        client._page_cache[url].expires_at = monotonic() - 1
+        client._article_cache[url].expires_at = monotonic() - 1
+
+        self.assertIs(await client.get_article("Article", "/article"), article)
+        self.assertEqual(
+            session.request_headers[1],
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Mon, 05 Oct 2026 10:00:00 GMT",
+            },
+        )
+        self.assertTrue(client._page_cache[url].is_fresh())
+        self.assertTrue(client._article_cache[url].is_fresh())
+
+    async def test_stale_page_is_served_while_one_refresh_runs(self) -> None:
+        client = make_client(stale_while_revalidate=60)
+        session = FakeSession(
+            [FakeResponse(200, "<html>old</html>"), FakeResponse(200, "<html>new</html>")]
+        )
+        client._session = session  # type: ignore[assignment]
+        await client.fetch_html("/page")
+
+        url = "https://castopia.site/page"
+        client._page_cache[url].expires_at = monotonic() - 1
+
+        self.assertEqual(await client.fetch_html("/page"), "<html>old</html>")
+        self.assertEqual(await client.fetch_html("/page"), "<html>old</html>")
+        self.assertEqual(list(client._stale_refreshes), [f"page:{url}"])
+
+        await client._stale_refreshes[f"page:{url}"]
+        self.assertEqual(session.calls, 2)
+        self.assertEqual(await client.fetch_html("/page"), "<html>new</html>")
+
+    async def test_stale_links_refresh_downloads_the_listing_again(self) -> None:
+        client = make_client(stale_while_revalidate=60)
+        listing = """
+        <div id="page-content">
+          <div class="list-pages-box"><a href="/{0}">{0}</a></div>
+        </div>
+        """
+        client._session = FakeSession(  # type: ignore[assignment]
+            [
+                FakeResponse(200, listing.format("old")),
+                FakeResponse(200, listing.format("new")),
+            ]
+        )
+        self.assertEqual(
+            await client.all_links(),
+            [("old", "https://castopia.site/old")],
+        )
+
+        client._page_cache[client.all_pages_url].expires_at = monotonic() - 1
+        client._links_cache.expires_at = monotonic() - 1
+
+        self.assertEqual(
+            await client.all_links(),
+            [("old", "https://castopia.site/old")],
+        )
+        await client._stale_refreshes["links"]
+
+        self.assertTrue(client._links_cache.is_fresh())
+        self.assertEqual(
+            await client.all_links(),
+            [("new", "https://castopia.site/new")],
+        )
+
+    async def test_links_parsed_from_a_stale_page_stay_stale(self) -> None:
+        client = make_client(stale_while_revalidate=60)
+        listing = (
+            '<div id="page-content">'
+            '<div class="list-pages-box"><a href="/old">old</a></div></div>'
+        )
+        client._session = FakeSession(  # type: ignore[assignment]
+            [FakeResponse(200, listing)]
+        )
+        client._store_cache(
+            client._page_cache,
+            client.all_pages_url,
+            listing,
+            client.PAGE_CACHE_TTL,
+        )
+        client._page_cache[client.all_pages_url].expires_at = monotonic() - 1
+
+        await client._load_links()
+
+        self.assertFalse(client._links_cache.is_fresh())
+        await client.close()
+
+    async def test_stale_article_is_served_when_upstream_is_unavailable(self) -> None:
+        client = make_client(stale_if_error=600)
+        client._session = FakeSession(  # type: ignore[assignment]
+            [FakeResponse(200, '<div id="page-content">Article text</div>')]
+        )
+        article = await client.get_article("Article", "/article")
+
+        url = "https://castopia.site/article"
+        client._page_cache[url].expires_at = monotonic() - 60
+        client._article_cache[url].expires_at = monotonic() - 60
+        client._request_html = AsyncMock(  # type: ignore[method-assign]
+            side_effect=UpstreamUnavailableError("down")
+        )
+
+        self.assertIs(await client.get_article("Article", "/article"), article)
+        self.assertFalse(client._article_cache[url].is_fresh())
+
+        client._article_cache[url].expires_at = monotonic() - 3600
+        with self.assertRaises(UpstreamUnavailableError):
+            await client.get_article("Article", "/article", refresh=True)
+
+    async def test_streamed_article_is_parsed_in_chunks_and_revalidated(self) -> None:
+        client = make_client(stream_articles=True)
+        client.STREAM_CHUNK_SIZE = 5
+        first = FakeResponse(200, PARITY_ARTICLE, headers={"ETag": '"v1"'})
+        session = FakeSession([first, FakeResponse(304)])
+        client._session = session  # type: ignore[assignment]
+
+        article = await client.get_article("Title", "/article")
+
+        self.assertEqual(
+            article,
+            page_parsing._parse_article_html(
+                PARITY_ARTICLE,
+                "Title",
+                "https://castopia.site/article",
+            ),
+        )
+        self.assertEqual(first.content.chunk_sizes, [5])
+        url = "https://castopia.site/article"
+        self.assertNotIn(url, client._page_cache)
+
+        client._article_cache[url].expires_at = monotonic() - 1
+
+        self.assertIs(await client.get_article("Title", "/article"), article)
+        self.assertEqual(session.request_headers[1], {"If-None-Match": '"v1"'})
+        self.assertTrue(client._article_cache[url].is_fresh())
+
+    async def test_title_lookups_share_the_cached_title_index(self) -> None:
+        client = make_client()
+        client._cache_links(
+            [
+                ("Объект класса Кетер", "https://castopia.site/keter"),
+                ("Кетер: протокол", "https://castopia.site/protocol"),
+                ("Draft:Кетер", "https://castopia.site/draft"),
+            ],
+            monotonic() + 60,
+        )
+        client.all_links = AsyncMock(side_effect=AssertionError("copied links"))
+        index = client._title_index
+
+        self.assertEqual(
+            await client.title_suggestions("кет", limit=25),
+            ["Кетер: протокол", "Объект класса Кетер"],
+        )
+        self.assertIs(await client._titles(), index)
+        client.all_links.assert_not_awaited()
+
     async def test_random_article_skips_stale_listing_link(self) -> None:
         client = make_client()
         client.all_links = AsyncMock(
@@ -130,6 +455,97 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
         client.get_article = AsyncMock(side_effect=[UpstreamNotFoundError(), present])
         self.assertEqual((await client.random_article()).title, "Present")
 
+    async def test_random_article_samples_eligible_pool_and_refills_buffer(self) -> None:
+        client = make_client()
+        public = Article("Public", "https://castopia.site/public", "text", frozenset())
+        for article in (
+            public,
+            Article("Empty", "https://castopia.site/empty", "", frozenset()),
+            Article(
+                "Nav",
+                "https://castopia.site/nav",
+                "text",
+                frozenset({"структура:навигация"}),
+            ),
+        ):
+            await client._remember_article(article)
+        client.all_links = AsyncMock(
+            return_value=[
+                ("Public", "https://castopia.site/public"),
+                ("Empty", "https://castopia.site/empty"),
+                ("Nav", "https://castopia.site/nav"),
+            ]
+        )
+        client.fetch_html = AsyncMock(side_effect=AssertionError("fetched"))
+
+        self.assertEqual(len(client._random_pool), 1)
+        self.assertEqual(await client.random_article(), public)
+
+        await client._random_refill
+        self.assertEqual(list(client._random_buffer), [public])
+        self.assertEqual(await client.random_article(), public)
+        await client.close()
+
+    async def test_random_article_samples_listing_while_pool_is_partial(self) -> None:
+        client = make_client()
+        articles = {
+            f"https://castopia.site/page-{number}": Article(
+                f"Page {number}",
+                f"https://castopia.site/page-{number}",
+                "text",
+                frozenset(),
+            )
+            for number in range(100)
+        }
+        await client._remember_article(articles["https://castopia.site/page-0"])
+        client.all_links = AsyncMock(
+            return_value=[(article.title, url) for url, article in articles.items()]
+        )
+        client.get_article = AsyncMock(
+            side_effect=lambda title, url: articles[url]
+        )
+
+        seen = {(await client.random_article()).url for _ in range(50)}
+
+        self.assertGreater(len(seen), 1)
+        self.assertGreater(len(client._random_pool), 1)
+        await client.close()
+
+    async def test_random_article_draws_from_the_cached_listing(self) -> None:
+        client = make_client()
+        articles = {
+            f"https://castopia.site/page-{number}": Article(
+                f"Page {number}",
+                f"https://castopia.site/page-{number}",
+                "text" if number else "",
+                frozenset(),
+            )
+            for number in range(3)
+        }
+        client._cache_links(
+            [(article.title, url) for url, article in articles.items()],
+            monotonic() + 60,
+        )
+        client.get_article = AsyncMock(
+            side_effect=lambda title, url: articles[url]
+        )
+        client.all_links = AsyncMock(side_effect=AssertionError("listed"))
+
+        self.assertEqual(len(client._random_unknown), 3)
+
+        with patch.object(
+            client,
+            "_normalise_url",
+            side_effect=AssertionError("normalised"),
+        ):
+            for _ in range(20):
+                self.assertTrue((await client.random_article()).text)
+
+        self.assertEqual(client._random_unknown, set())
+        self.assertEqual(client._random_ineligible, {"https://castopia.site/page-0"})
+        self.assertEqual(len(client._random_pool), 2)
+        await client.close()
+
     async def test_article_uses_full_tag_identifier_from_tag_link(self) -> None:
         client = make_client()
         client.fetch_html = AsyncMock(
@@ -158,7 +574,7 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
           </div>
         </div>
         """
-        links = client._parse_list_links(html)
+        links = page_parsing._parse_listing_html(html, client.base_url).links
         self.assertEqual(len(links), 3)
         self.assertIn(("Article 1", "https://castopia.site/article1"), links)
         self.assertIn(("Article 2", "https://castopia.site/article2"), links)
@@ -177,7 +593,7 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
           </div>
         </div>
         """
-        links = client._parse_list_links(html)
+        links = page_parsing._parse_listing_html(html, client.base_url).links
         self.assertEqual(len(links), 1)
         self.assertEqual(links[0], ("Article", "https://castopia.site/article"))
 
@@ -215,8 +631,7 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
             await client.get_article("Title", "/article")
         self.assertIn("доступного текста", str(ctx.exception))
 
-    async def test_search_content_uses_full_search_lock(self) -> None:
-        """Only one fulltext search should execute at a time."""
+    async def test_search_content_caches_results_per_query(self) -> None:
         client = make_client()
         all_links_calls = 0
 
@@ -227,14 +642,107 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
 
         client.all_links = counting_all_links  # type: ignore[assignment]
         client.get_article = AsyncMock(
-            return_value=Article("Article", "https://castopia.site/article", "Query text", frozenset())
+            return_value=Article(
+                "Article",
+                "https://castopia.site/article",
+                "Текст запроса и другие слова",
+                frozenset(),
+            )
         )
 
-        # Sequential searches should both use cache or run one at a time
-        await client.search_content("query1")
-        await client.search_content("query1")  # Same query, should use cache
+        self.assertEqual(len(await client.search_content("запрос")), 1)
+        # Word forms of the same query share its cache entry.
+        self.assertEqual(len(await client.search_content("Запросы")), 1)
         self.assertEqual(all_links_calls, 1)
 
+        self.assertEqual(len(await client.search_content("другие слова")), 1)
+        self.assertEqual(all_links_calls, 2)
+        client.get_article.assert_awaited_once()
+
+    async def test_unchanged_listing_is_not_retained_on_every_search(self) -> None:
+        client = make_client()
+        client._cache_links(
+            [("Article", "https://castopia.site/article")],
+            monotonic() + 60,
+        )
+        await client._remember_article(
+            Article(
+                "Article",
+                "https://castopia.site/article",
+                "Текст запроса",
+                frozenset(),
+            )
+        )
+
+        with patch.object(
+            client._search_index,
+            "retain",
+            wraps=client._search_index.retain,
+        ) as retain:
+            self.assertEqual(len(await client.search_content("запрос")), 1)
+            self.assertEqual(len(await client.search_content("текст")), 1)
+            self.assertEqual(retain.call_count, 1)
+
+            client._cache_links(
+                [("Article", "https://castopia.site/article")],
+                monotonic() + 60,
+            )
+            await client.search_content("текст запроса")
+            self.assertEqual(retain.call_count, 2)
+
+    async def test_relisted_cached_article_is_indexed_again(self) -> None:
+        client = make_client()
+        article = Article(
+            "Alpha",
+            "https://castopia.site/alpha",
+            "Alpha text",
+            frozenset({"тег"}),
+        )
+        await client._remember_article(article)
+
+        await client._index_articles({})
+        self.assertNotIn(article.url, client._search_index)
+
+        client.fetch_html = AsyncMock(side_effect=AssertionError("fetched"))
+        await client._index_articles({article.url: "Alpha"})
+
+        self.assertIn(article.url, client._search_index)
+        self.assertIn(article.url, client._random_pool)
+        self.assertEqual(client._tag_index.match(["тег"]), ([article], []))
+
+    async def test_search_content_runs_one_flight_per_query(self) -> None:
+        client = make_client()
+        release = asyncio.Event()
+        calls: list[str] = []
+
+        async def blocking_all_links() -> list[tuple[str, str]]:
+            calls.append("listing")
+            if len(calls) == 1:
+                await release.wait()
+            return [("Article", "/article")]
+
+        client.all_links = blocking_all_links  # type: ignore[assignment]
+        await client._remember_article(
+            Article(
+                "Article",
+                "https://castopia.site/article",
+                "Query text and other words",
+                frozenset(),
+            )
+        )
+
+        first = asyncio.create_task(client.search_content("query"))
+        same = asyncio.create_task(client.search_content("Query"))
+        await asyncio.sleep(0)
+
+        # A different query is not held up by the blocked one.
+        self.assertEqual(len(await client.search_content("other words")), 1)
+
+        release.set()
+        self.assertEqual(await first, await same)
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(client._search_locks, {})
+
     async def test_find_by_tags_handles_empty_candidates(self) -> None:
         """Should return empty list if tag pages have no candidates."""
         client = make_client()
@@ -246,3 +754,324 @@ class WikiClientTests(unittest.IsolatedAsyncioTestCase):
         )
         result = await client.find_by_tags(["tag1"])
         self.assertEqual(result, [])
+
+    async def test_find_by_tags_uses_tag_index_without_fetching_articles(self) -> None:
+        client = make_client()
+        tagged = Article(
+            "Alpha",
+            "https://castopia.site/alpha",
+            "text",
+            frozenset({"класс:кетер", "статус:основное"}),
+        )
+        other = Article(
+            "Beta",
+            "https://castopia.site/beta",
+            "text",
+            frozenset({"класс:кетер"}),
+        )
+        for article in (tagged, other):
+            await client._remember_article(article)
+        client._cache_links(
+            [(tagged.title, tagged.url), (other.title, other.url)],
+            monotonic() + 60,
+        )
+        client._resolve_tags = AsyncMock(
+            return_value=[
+                page_parsing._TagReference("класс:кетер", "https://castopia.site/t1"),
+                page_parsing._TagReference("статус:основное", "https://castopia.site/t2"),
+            ]
+        )
+        client.fetch_html = AsyncMock(side_effect=AssertionError("fetched"))
+
+        self.assertEqual(
+            await client.find_by_tags(["кетер", "основное"]),
+            [tagged],
+        )
+
+    async def test_tag_catalog_groups_tags_with_counts(self) -> None:
+        client = make_client()
+        for name, tags in (
+            ("a", {"класс:кетер", "статус:основное"}),
+            ("b", {"класс:кетер"}),
+            ("c", {"класс:евклид"}),
+        ):
+            await client._remember_article(
+                Article(name, f"https://castopia.site/{name}", "text", frozenset(tags))
+            )
+        client._tag_catalog = AsyncMock(
+            return_value={
+                key: [page_parsing._TagReference(key, f"https://castopia.site/t/{key}")]
+                for key in ("класс:евклид", "класс:кетер", "статус:основное", "архив")
+            }
+        )
+
+        catalog = await client.tag_catalog()
+
+        self.assertEqual(list(catalog), ["", "класс", "статус"])
+        self.assertEqual(
+            [(facet.name, facet.count) for facet in catalog["класс"]],
+            [("кетер", 2), ("евклид", 1)],
+        )
+        self.assertEqual(catalog[""][0].count, 0)
+        self.assertEqual(
+            [facet.identifier for facet in await client.tag_suggestions("КЕ")],
+            ["класс:кетер"],
+        )
+        self.assertEqual(
+            [facet.identifier for facet in await client.tag_suggestions("класс")],
+            ["класс:кетер", "класс:евклид"],
+        )
+
+    async def test_find_by_tags_loads_only_articles_on_every_tag_page(self) -> None:
+        client = make_client()
+        pages = {
+            "https://castopia.site/t1": """
+                <div id="tagged-pages-list">
+                  <a href="/alpha">Alpha</a><a href="/beta">Beta</a>
+                </div>""",
+            "https://castopia.site/t2": """
+                <div id="tagged-pages-list"><a href="/beta">Beta</a></div>""",
+            "https://castopia.site/beta": """
+                <div id="page-content">Beta text</div>
+                <div class="page-tags">
+                  <a href="/system:page-tags/tag/t1">t1</a>
+                  <a href="/system:page-tags/tag/t2">t2</a>
+                </div>""",
+        }
+        client.fetch_html = AsyncMock(side_effect=lambda url, **_: pages[url])
+        client._resolve_tags = AsyncMock(
+            return_value=[
+                page_parsing._TagReference("t1", "https://castopia.site/t1"),
+                page_parsing._TagReference("t2", "https://castopia.site/t2"),
+            ]
+        )
+
+        articles = await client.find_by_tags(["t1", "t2"])
+
+        self.assertEqual([article.title for article in articles], ["Beta"])
+        self.assertNotIn(
+            "https://castopia.site/alpha",
+            [call.args[0] for call in client.fetch_html.await_args_list],
+        )
+
+    async def test_search_content_queries_index_without_refetching_articles(self) -> None:
+        client = make_client()
+        client.all_links = AsyncMock(
+            return_value=[
+                ("Alpha", "https://castopia.site/alpha"),
+                ("Beta", "https://castopia.site/beta"),
+            ]
+        )
+        pages = {
+            "https://castopia.site/alpha": '<div id="page-content">Красный объект в подвале</div>',
+            "https://castopia.site/beta": '<div id="page-content">Синий объект на чердаке</div>',
+        }
+        client.fetch_html = AsyncMock(side_effect=lambda url, **_: pages[url])
+
+        first = await client.search_content("объект")
+        second = await client.search_content("чердаке")
+
+        self.assertEqual([article.title for article in first], ["Alpha", "Beta"])
+        self.assertEqual([article.title for article in second], ["Beta"])
+        self.assertEqual(client.fetch_html.await_count, 2)
+
+    async def test_crawler_refreshes_only_missing_or_expiring_articles(self) -> None:
+        client = make_client()
+        client.all_links = AsyncMock(
+            return_value=[
+                ("Fresh", "https://castopia.site/fresh"),
+                ("Cold", "https://castopia.site/cold"),
+                ("Draft", "https://castopia.site/draft:cold"),
+            ]
+        )
+        client._tag_catalog = AsyncMock(return_value={})
+        client._store_cache(
+            client._article_cache,
+            "https://castopia.site/fresh",
+            Article("Fresh", "https://castopia.site/fresh", "Text", frozenset()),
+            client.PAGE_CACHE_TTL,
+        )
+        client.get_article = AsyncMock()
+
+        refreshed = await WikiCrawler(client, interval=0).crawl_once()
+
+        self.assertEqual(refreshed, 1)
+        client.get_article.assert_awaited_once_with(
+            "Cold", "https://castopia.site/cold", refresh=True
+        )
+
+    async def test_disk_cache_restores_articles_and_page_validators(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache_path = str(Path(directory) / "wiki.sqlite3")
+
+            first = make_client(cache_path=cache_path)
+            first._session = FakeSession(  # type: ignore[assignment]
+                [
+                    FakeResponse(
+                        200,
+                        '<div id="page-content">Stored text</div>',
+                        headers={"ETag": '"v1"'},
+                    )
+                ]
+            )
+            await first.get_article("Stored", "/stored")
+            await first.close()
+
+            restarted = make_client(cache_path=cache_path)
+            session = FakeSession([FakeResponse(304)])
+            restarted._session = session  # type: ignore[assignment]
+            await restarted._restore_from_disk()
+
+            article = await restarted.get_article("Stored", "/stored")
+            self.assertEqual(article.text, "Stored text")
+            self.assertEqual(session.calls, 0)
+
+            self.assertEqual(
+                await restarted.fetch_html("/stored", refresh=True),
+                '<div id="page-content">Stored text</div>',
+            )
+            self.assertEqual(session.request_headers, [{"If-None-Match": '"v1"'}])
+            await restarted.close()
+
+    async def test_crawler_pass_does_not_count_as_article_reads(self) -> None:
+        client = make_client()
+        url = "https://castopia.site/article"
+        await client._remember_article(
+            Article("Article", url, "Article text", frozenset())
+        )
+        client._article_cache.peek(url).expires_at = monotonic() + 1
+        client.all_links = AsyncMock(return_value=[("Article", url)])
+        client._tag_catalog = AsyncMock(return_value={})
+        client.fetch_html = AsyncMock(
+            return_value='<div id="page-content">Article text</div>'
+        )
+        sketch = client._article_cache._sketch
+
+        crawler = WikiCrawler(client, interval=0)
+        self.assertEqual(await crawler.crawl_once(), 1)
+
+        self.assertEqual(sketch.estimate(url), 0)
+
+    async def test_parse_executor_returns_articles_and_errors_from_workers(self) -> None:
+        for mode in ("thread", "process"):
+            with self.subTest(mode=mode):
+                client = make_client(parse_mode=mode, parse_workers=1)
+                client.fetch_html = AsyncMock(
+                    side_effect=[
+                        '<div id="page-content">Worker text</div>',
+                        "<html><body>Deleted</body></html>",
+                    ]
+                )
+                try:
+                    article = await client.get_article("Worker", "/worker")
+                    self.assertEqual(article.text, "Worker text")
+
+                    with self.assertRaises(UpstreamContentError):
+                        await client.get_article("Deleted", "/deleted")
+                finally:
+                    await client.close()
+
+    async def test_parse_executor_replaces_a_broken_process_pool(self) -> None:
+        parser = ParseExecutor("process", 1)
+        broken = parser._get_executor()
+
+        try:
+            with self.assertRaises(BrokenProcessPool):
+                await asyncio.wrap_future(broken.submit(os._exit, 1))
+
+            self.assertEqual(await parser.run(len, "worker"), 6)
+            self.assertIsNot(parser._executor, broken)
+        finally:
+            parser.close()
+
+    async def test_all_links_parses_each_listing_page_once(self) -> None:
+        client = make_client()
+        pages = {
+            "https://castopia.site/system:all-pages": """
+            <div id="page-content">
+              <div class="list-pages-box"><a href="/alpha">Alpha</a></div>
+              <span class="pager-no">page 1 of 2</span>
+            </div>
+            """,
+            "https://castopia.site/system:all-pages/p/2": """
+            <div id="page-content">
+              <div class="list-pages-box"><a href="/beta">Beta</a></div>
+            </div>
+            """,
+        }
+        client.fetch_html = AsyncMock(side_effect=lambda url, **_: pages[url])
+
+        with patch.object(
+            page_parsing,
+            "BeautifulSoup",
+            wraps=page_parsing.BeautifulSoup,
+        ) as soup:
+            links = await client.all_links()
+
+        self.assertEqual(
+            links,
+            [
+                ("Alpha", "https://castopia.site/alpha"),
+                ("Beta", "https://castopia.site/beta"),
+            ],
+        )
+        self.assertEqual(soup.call_count, 2)
+
+    def test_lxml_backend_matches_beautifulsoup_backend(self) -> None:
+        bs4 = page_parsing.PARSER_BACKENDS["bs4"]
+        lxml = page_parsing.PARSER_BACKENDS["lxml"]
+        base_url = "https://castopia.site"
+        article_pages = [
+            PARITY_ARTICLE,
+            '<div id="page-content">Article text</div>',
+            '''<div id="page-content">Article text</div>
+            <div class="page-tags">
+              <a href="/system:page-tags/tag/%D1%81%D1%82%D0%B0%D1%82%D1%83%D1%81%3A%D0%BE%D1%81%D0%BD%D0%BE%D0%B2%D0%BD%D0%BE%D0%B5">основное</a>
+            </div>''',
+        ]
+
+        for html in article_pages:
+            self.assertEqual(
+                lxml.article(html, "Title", "https://castopia.site/a"),
+                bs4.article(html, "Title", "https://castopia.site/a"),
+            )
+
+        for html in (
+            PARITY_LISTING,
+            '<span class="pager-no">page 1 of 5</span>',
+            '<div id="page-content"><div class="list-pages-box"><a href="/x">X</a></div></div>',
+        ):
+            self.assertEqual(
+                lxml.listing(html, base_url),
+                bs4.listing(html, base_url),
+            )
+
+        self.assertEqual(
+            lxml.tag_catalog(PARITY_TAG_CATALOG, base_url),
+            bs4.tag_catalog(PARITY_TAG_CATALOG, base_url),
+        )
+        self.assertEqual(
+            lxml.tagged_pages(PARITY_TAGGED_PAGES, base_url),
+            bs4.tagged_pages(PARITY_TAGGED_PAGES, base_url),
+        )
+
+    def test_lxml_backend_raises_the_same_content_errors(self) -> None:
+        cases = [
+            ("article", ("<html><body>Article deleted</body></html>", "T", "u")),
+            ("article", ('<div id="page-content"><script>js</script></div>', "T", "u")),
+            ("article", ("", "T", "u")),
+            ("listing", ("<html><body>No page content</body></html>", "https://castopia.site", True)),
+            ("listing", ('<div id="page-content"><p>Only text</p></div>', "https://castopia.site", True)),
+            ("tagged_pages", ("<div>No list</div>", "https://castopia.site")),
+        ]
+
+        for name, args in cases:
+            with self.subTest(name=name, html=args[0]):
+                messages = []
+
+                for backend in ("bs4", "lxml"):
+                    with self.assertRaises(UpstreamContentError) as ctx:
+                        getattr(page_parsing.PARSER_BACKENDS[backend], name)(*args)
+                    messages.append(str(ctx.exception))
+
+                self.assertEqual(messages[0], messages[1])
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+from cogs.page_parsing import Article, UpstreamNotFoundError, UpstreamUnavailableError
+from cogs.limiter import current_requester, requester
+from cogs.wiki_service import RemoteWikiClient, WikiService
+
+
+class WikiServiceTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.socket_path = Path(self.directory.name) / "wiki.sock"
+        self.client = MagicMock()
+        self.client.start = AsyncMock()
+        self.client.close = AsyncMock()
+        self.service = WikiService(self.client, self.socket_path)
+        await self.service.start()
+        self.remote = RemoteWikiClient(self.socket_path)
+
+    async def asyncTearDown(self) -> None:
+        await self.service.close()
+        self.directory.cleanup()
+
+    async def test_remote_client_round_trips_articles(self) -> None:
+        article = Article("Alpha", "https://castopia.site/alpha", "Текст", frozenset({"тег"}))
+        self.client.search_content = AsyncMock(return_value=[article])
+
+        self.assertEqual(await self.remote.search_content("текст", limit=5), [article])
+        self.client.search_content.assert_awaited_once_with("текст", limit=5)
+
+    async def test_remote_client_forwards_the_requester(self) -> None:
+        self.client.title_suggestions = AsyncMock(
+            side_effect=lambda *_, **__: [current_requester()]
+        )
+
+        with requester("discord:42"):
+            self.assertEqual(await self.remote.title_suggestions("a"), ["discord:42"])
+
+    async def test_remote_client_reraises_wiki_errors(self) -> None:
+        self.client.find_by_title = AsyncMock(side_effect=UpstreamNotFoundError("gone"))
+
+        with self.assertRaises(UpstreamNotFoundError):
+            await self.remote.find_by_title("Alpha")
+
+    async def test_unreachable_service_is_reported_as_unavailable(self) -> None:
+        remote = RemoteWikiClient(Path(self.directory.name) / "missing.sock")
+
+        with self.assertRaises(UpstreamUnavailableError):
+            await remote.random_article()
@@ -17,8 +17,8 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from cogs.constants import ConfigurationError, load_wiki_config  # noqa: E402
-from cogs.page_parsing import WikiClient  # noqa: E402
 from cogs.tg import create_router  # noqa: E402
+from cogs.wiki_service import create_wiki_client  # noqa: E402
 
 
 def _required_env(name: str) -> str:
@@ -32,7 +32,7 @@ async def main() -> None:
     load_dotenv(PROJECT_ROOT / ".env")
     token = _required_env("TELEGRAM_BOT_TOKEN")
     config = load_wiki_config()
-    wiki = WikiClient(config)
+    wiki = create_wiki_client(config)
     bot = Bot(token=token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
     dispatcher = Dispatcher()
     dispatcher.include_router(create_router(wiki))